@@ -1,9 +1,33 @@
+from contextlib import contextmanager
 from copy import deepcopy
+from collections import OrderedDict, deque
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+from io import BytesIO
+from itertools import chain, islice
+import base64
+import binascii
+import datetime
+import decimal
+import errno
+import hashlib
+import json
+import multiprocessing
+import os
+import posixpath
+import socket
+import sys
+import threading
+import time
 import warnings
 from lxml.etree import Element
 from lxml import etree
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
 import shlex
+import struct
+import tarfile
 import re
 
 
@@ -11,6 +35,14 @@ NAMESPACES = {
     'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
     'mc': 'http://schemas.openxmlformats.org/markup-compatibility/2006',
     'ct': 'http://schemas.openxmlformats.org/package/2006/content-types',
+    'w14': 'http://schemas.microsoft.com/office/word/2010/wordml',
+    'mm': 'urn:docx-mailmerge:template',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'pr': 'http://schemas.openxmlformats.org/package/2006/relationships',
+    'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'pic': 'http://schemas.openxmlformats.org/drawingml/2006/picture',
+    'pkg': 'http://schemas.microsoft.com/office/2006/xmlPackage',
 }
 
 CONTENT_TYPES_PARTS = (
@@ -20,18 +52,377 @@ CONTENT_TYPES_PARTS = (
 )
 
 CONTENT_TYPE_SETTINGS = 'application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml'
+CONTENT_TYPE_STYLES = 'application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml'
+CONTENT_TYPE_NUMBERING = 'application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml'
+CONTENT_TYPE_HEADER = CONTENT_TYPES_PARTS[1]
+CONTENT_TYPE_FOOTER = CONTENT_TYPES_PARTS[2]
+
+CONTENT_TYPES_NAME = '[Content_Types].xml'
+
+# Elements and attributes dropped by the minify option: proofing marks,
+# revision save IDs and paragraph IDs carry no content
+MINIFY_REMOVE_TAGS = {
+    '{%(w)s}proofErr' % NAMESPACES,
+    '{%(w)s}lastRenderedPageBreak' % NAMESPACES,
+}
+MINIFY_REMOVE_ATTRIBUTES = {
+    '{%(w14)s}paraId' % NAMESPACES,
+    '{%(w14)s}textId' % NAMESPACES,
+}
+MINIFY_RSID_PREFIX = '{%(w)s}rsid' % NAMESPACES
+
+try:
+    string_types = (basestring,)  # noqa: F821
+except NameError:
+    string_types = (str, bytes)
+text_type = type(u'')
+
+# Characters XML 1.0 cannot hold: control characters other than tab and
+# line breaks, non-characters, and (on wide builds) lone surrogates
+INVALID_XML_CODEPOINTS = list(chain(range(0x00, 0x09), [0x0b, 0x0c], range(0x0e, 0x20), [0xfffe, 0xffff]))
+if sys.maxunicode > 0xffff:
+    INVALID_XML_CODEPOINTS.extend(range(0xd800, 0xe000))
+INVALID_XML_CHARACTERS = re.compile(u'[\\x00-\\x08\\x0b\\x0c\\x0e-\\x1f\\ufffe\\uffff%s]' % (
+    u'\\ud800-\\udfff' if sys.maxunicode > 0xffff else u''))
+INVALID_XML_TRANSLATIONS = {
+    'strip': dict.fromkeys(INVALID_XML_CODEPOINTS),
+    'replace': dict.fromkeys(INVALID_XML_CODEPOINTS, u'\ufffd'),
+}
+INVALID_CHARACTER_POLICIES = ('raise', 'strip', 'replace')
+
+SEPARATORS = {
+    'page_break', 'column_break', 'textWrapping_break', 'continuous_section', 'evenPage_section',
+    'nextColumn_section', 'nextPage_section', 'oddPage_section',
+}
+
+# Names of the MergeFields marking the start and end of a repeated region
+REGION_START = 'RegionStart:'
+REGION_END = 'RegionEnd:'
+PARAGRAPH_TAG = '{%(w)s}p' % NAMESPACES
+
+# Names of the MergeFields marking the start and end of a conditional region
+CONDITION_START = 'IfStart:'
+CONDITION_END = 'IfEnd:'
+
+# Package member holding the template body of a merge_templates document
+TEMPLATE_PART = 'mailmerge/template.xml'
+
+# IDs that must be unique within a document and are renumbered in every copy
+# made by merge_templates: annotations (bookmarks, revisions), drawings, and
+# references to notes and comments, whose targets are copied along
+ANNOTATION_ID = '{%(w)s}id' % NAMESPACES
+DRAWING_TAG = '{%(wp)s}docPr' % NAMESPACES
+NOTE_REFERENCES = {
+    '{%(w)s}footnoteReference' % NAMESPACES: 'footnote',
+    '{%(w)s}endnoteReference' % NAMESPACES: 'endnote',
+    '{%(w)s}commentRangeStart' % NAMESPACES: 'comment',
+    '{%(w)s}commentRangeEnd' % NAMESPACES: 'comment',
+    '{%(w)s}commentReference' % NAMESPACES: 'comment',
+}
+NOTE_PARTS = {
+    'footnote': ('application/vnd.openxmlformats-officedocument.wordprocessingml.footnotes+xml',
+                 '{%(w)s}footnote' % NAMESPACES),
+    'endnote': ('application/vnd.openxmlformats-officedocument.wordprocessingml.endnotes+xml',
+                '{%(w)s}endnote' % NAMESPACES),
+    'comment': ('application/vnd.openxmlformats-officedocument.wordprocessingml.comments+xml',
+                '{%(w)s}comment' % NAMESPACES),
+}
+
+# Root elements of header and footer parts
+SECTION_PART_TAGS = ('{%(w)s}hdr' % NAMESPACES, '{%(w)s}ftr' % NAMESPACES)
+
+# References from a section to its header and footer parts
+SECTION_REFERENCES = (
+    '{%(w)s}headerReference' % NAMESPACES,
+    '{%(w)s}footerReference' % NAMESPACES,
+)
+
+RELATIONSHIP_TYPE_IMAGE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/image'
+RELATIONSHIP_TYPE_HYPERLINK = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink'
+
+# Children of w:rPr, in the order the schema requires
+RUN_PROPERTIES = [
+    '{%s}%s' % (NAMESPACES['w'], name) for name in (
+        'rStyle', 'rFonts', 'b', 'bCs', 'i', 'iCs', 'caps', 'smallCaps', 'strike', 'dstrike', 'outline',
+        'shadow', 'emboss', 'imprint', 'noProof', 'snapToGrid', 'vanish', 'webHidden', 'color', 'spacing',
+        'w', 'kern', 'position', 'sz', 'szCs', 'highlight', 'u', 'effect', 'bdr', 'shd', 'fitText',
+        'vertAlign', 'rtl', 'cs', 'em', 'lang', 'eastAsianLayout', 'specVanish', 'oMath',
+    )
+]
+# Formatting of hyperlinks in rich text, unless a segment sets its own
+HYPERLINK_UNDERLINE = 'single'
+HYPERLINK_COLOR = '0563C1'
+
+# Elements referring to a style by its ID, in content and in other styles
+STYLE_REFERENCES = set('{%s}%s' % (NAMESPACES['w'], name) for name in (
+    'pStyle', 'rStyle', 'tblStyle', 'basedOn', 'next', 'link',
+))
+
+# Image sizes are given in EMU, English Metric Units
+EMU_PER_INCH = 914400
+EMU_PER_CM = 360000
+EMU_PER_PIXEL = 9525  # at 96 dpi
+
+IMAGE_CONTENT_TYPES = {
+    'png': 'image/png',
+    'jpeg': 'image/jpeg',
+    'gif': 'image/gif',
+}
+
+# Content type in Flat OPC output of members [Content_Types].xml does not cover
+FLAT_OPC_DEFAULT_TYPES = {
+    'rels': 'application/vnd.openxmlformats-package.relationships+xml',
+    'xml': 'application/xml',
+}
+
+# Fixed timestamp for output members, the earliest date a zip header can hold
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Estimated resident bytes of a parsed element and of each of its attributes,
+# on top of their text; measured for lxml on 64-bit CPython
+ELEMENT_SIZE = 200
+ATTRIBUTE_SIZE = 80
+
+# base64 with 76 character lines; encodestring is the Python 2 name
+_encode_base64 = getattr(base64, 'encodebytes', None) or base64.encodestring
+
+# os.replace overwrites atomically on all platforms, but is Python 3.3+ only
+_replace_file = getattr(os, 'replace', os.rename)
+
+
+class Image(object):
+    """
+    Merge value that inserts a picture instead of text. ``image`` is a path,
+    a file object or the image data as bytes, in PNG, JPEG or GIF format.
+    Without a size the image is inserted at 96 dpi; with only ``width`` or
+    ``height`` (in EMU, see ``EMU_PER_CM``) the other is scaled to keep the
+    aspect ratio.
+
+    Identical images are stored only once per output package, however many
+    fields or records refer to them.
+    """
+
+    def __init__(self, image, width=None, height=None, description=''):
+        if hasattr(image, 'read'):
+            data = image.read()
+        elif isinstance(image, bytes):
+            data = image
+        else:
+            with open(image, 'rb') as f:
+                data = f.read()
+        self.data = data
+        self.digest = hashlib.sha256(data).hexdigest()
+        self.format, pixel_width, pixel_height = _image_info(data)
+        if not pixel_width or not pixel_height:
+            raise ValueError("Image has no size (%dx%d pixels)" % (pixel_width, pixel_height))
+        if (width is not None and width <= 0) or (height is not None and height <= 0):
+            raise ValueError("Image width and height must be positive")
+        if width is None and height is None:
+            width, height = pixel_width * EMU_PER_PIXEL, pixel_height * EMU_PER_PIXEL
+        elif height is None:
+            height = width * pixel_height // pixel_width
+        elif width is None:
+            width = height * pixel_width // pixel_height
+        self.width = int(width)
+        self.height = int(height)
+        self.description = description
+
+    def _cache_key(self):
+        return [self.digest, self.width, self.height, self.description]
+
+
+def _image_info(data):
+    """
+    Returns (format, width, height) of PNG, JPEG and GIF images, read from
+    their headers.
+    """
+    if data[:8] == b'\x89PNG\r\n\x1a\n':
+        width, height = struct.unpack('>II', data[16:24])
+        return 'png', width, height
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        width, height = struct.unpack('<HH', data[6:10])
+        return 'gif', width, height
+    if data[:2] == b'\xff\xd8':
+        offset = 2
+        while offset + 9 <= len(data):
+            marker, length = struct.unpack('>HH', data[offset:offset + 4])
+            # start of frame markers, except DHT, JPG and DAC
+            if 0xFFC0 <= marker <= 0xFFCF and marker not in (0xFFC4, 0xFFC8, 0xFFCC):
+                height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+                return 'jpeg', width, height
+            offset += 2 + length
+    raise ValueError("Unsupported image format, expected PNG, JPEG or GIF")
+
+
+class RichText(object):
+    """
+    A merge value made of formatted text segments. Every segment becomes a
+    run with the formatting of the merge field, changed where the segment
+    sets ``bold``, ``italic``, ``underline`` (True, False or a Word
+    underline style such as ``'double'``) or ``color`` (hex RGB). A segment
+    with a ``hyperlink`` URL links to it.
+    ::
+
+        RichText('Total: ').add('EUR 12.00', bold=True, color='C00000')
+    """
+
+    def __init__(self, text=None, **formatting):
+        self.segments = []
+        if text is not None:
+            self.add(text, **formatting)
+
+    def add(self, text, bold=None, italic=None, underline=None, color=None, hyperlink=None):
+        """
+        Adds a segment and returns the RichText, so that calls can be chained.
+        """
+        self.segments.append((text, bold, italic, underline, color, hyperlink))
+        return self
+
+    def _translate(self, table):
+        rich_text = RichText()
+        rich_text.segments = [
+            (segment[0].translate(table) if isinstance(segment[0], text_type) else segment[0],) + segment[1:]
+            for segment in self.segments
+        ]
+        return rich_text
+
+    def _cache_key(self):
+        return [list(segment) for segment in self.segments]
+
+    def __str__(self):
+        return ''.join(str(segment[0]) for segment in self.segments)
+
+
+class MergeCancelled(Exception):
+    """
+    Raised when a progress callback cancels a merge or write. The document
+    is left partly merged and should be discarded.
+    """
+
+
+class DeadlineExceeded(MergeCancelled):
+    """
+    Raised when a merge or write runs past its deadline.
+    """
+
+
+class LimitExceeded(ValueError):
+    """
+    Raised when a template exceeds one of the resource limits of ``Limits``,
+    or a merge would exceed the ``memory_budget`` of the document.
+    """
+
+
+class InvalidCharacterError(ValueError):
+    """
+    A merge value contains a character XML cannot hold, such as a control
+    character. ``field`` is the name of the field and ``record`` the index
+    of the record or table row, if any.
+    """
+
+    def __init__(self, field, record=None):
+        message = "Value of field %r contains characters not allowed in XML" % field
+        if record is not None:
+            message += " (record %d)" % record
+        super(InvalidCharacterError, self).__init__(message)
+        self.field = field
+        self.record = record
+
+
+class Limits(object):
+    """
+    Resource limits for loading untrusted templates, checked by ``MailMerge``
+    before and while parsing the package. Any limit can be set to None to
+    disable it.
+
+    ``max_members``, ``max_member_size`` and ``max_total_size`` bound the
+    number of package members and their uncompressed sizes, as declared in
+    the zip directory, which the zip reader enforces when decompressing.
+    ``max_compression_ratio`` applies to members larger than
+    ``ratio_threshold`` bytes. ``max_depth`` and ``max_nodes`` bound the
+    nesting and element count of each XML part, ``max_fields`` the number
+    of merge fields, and ``max_seconds`` the time to load the template.
+    """
+
+    def __init__(self, max_members=1000, max_member_size=64 * 1024 * 1024, max_total_size=256 * 1024 * 1024,
+                 max_compression_ratio=100, ratio_threshold=1024 * 1024, max_depth=256, max_nodes=2000000,
+                 max_fields=10000, max_seconds=30):
+        self.max_members = max_members
+        self.max_member_size = max_member_size
+        self.max_total_size = max_total_size
+        self.max_compression_ratio = max_compression_ratio
+        self.ratio_threshold = ratio_threshold
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_fields = max_fields
+        self.max_seconds = max_seconds
+
+    def check_package(self, zip):
+        members = zip.infolist()
+        if self.max_members is not None and len(members) > self.max_members:
+            raise LimitExceeded("Package has %d members, more than %d" % (len(members), self.max_members))
+        total = 0
+        for zi in members:
+            if self.max_member_size is not None and zi.file_size > self.max_member_size:
+                raise LimitExceeded("Member %s is %d bytes, more than %d" %
+                                    (zi.filename, zi.file_size, self.max_member_size))
+            if self.max_compression_ratio is not None and zi.file_size > self.ratio_threshold and \
+                    zi.file_size > self.max_compression_ratio * max(zi.compress_size, 1):
+                raise LimitExceeded("Member %s is compressed more than %d:1" %
+                                    (zi.filename, self.max_compression_ratio))
+            total += zi.file_size
+        if self.max_total_size is not None and total > self.max_total_size:
+            raise LimitExceeded("Package is %d bytes uncompressed, more than %d" % (total, self.max_total_size))
+
+    def deadline(self):
+        return time.time() + self.max_seconds if self.max_seconds is not None else None
+
+    def parse(self, source, name, deadline):
+        """
+        Parses an XML part, counting depth and elements as they are read, so
+        an oversized part is rejected without building its whole tree.
+        """
+        depth = nodes = 0
+        context = etree.iterparse(source, events=('start', 'end'), resolve_entities=False, no_network=True,
+                                  load_dtd=False, huge_tree=False, remove_comments=False)
+        for event, _ in context:
+            if event == 'end':
+                depth -= 1
+                continue
+            depth += 1
+            nodes += 1
+            if self.max_depth is not None and depth > self.max_depth:
+                raise LimitExceeded("Part %s is nested deeper than %d elements" % (name, self.max_depth))
+            if self.max_nodes is not None and nodes > self.max_nodes:
+                raise LimitExceeded("Part %s has more than %d elements" % (name, self.max_nodes))
+            if deadline is not None and nodes % 4096 == 0 and time.time() > deadline:
+                raise LimitExceeded("Loading the template took longer than %s seconds" % self.max_seconds)
+        return etree.ElementTree(context.root)
+
+    def check_fields(self, count):
+        if self.max_fields is not None and count > self.max_fields:
+            raise LimitExceeded("Template has %d merge fields, more than %d" % (count, self.max_fields))
+
+    def check_deadline(self, deadline):
+        if deadline is not None and time.time() > deadline:
+            raise LimitExceeded("Loading the template took longer than %s seconds" % self.max_seconds)
 
 
 class MailMerge(object):
-    def __init__(self, file, remove_empty_tables=False):
-        self.zip = ZipFile(file)
-        self.parts = {}
-        self.settings = None
-        self._settings_info = None
-        self.remove_empty_tables = remove_empty_tables
+    def __init__(self, file, remove_empty_tables=False, minify=False, limits=None, invalid_characters='raise',
+                 memory_budget=None):
+        if invalid_characters not in INVALID_CHARACTER_POLICIES:
+            raise ValueError("Invalid invalid_characters argument")
+        self.__setup(ZipFile(file), remove_empty_tables)
+        self.invalid_characters = invalid_characters
+        self.memory_budget = memory_budget
+        self._limits = limits
+        self._deadline = limits.deadline() if limits is not None else None
 
         try:
-            content_types = etree.parse(self.zip.open('[Content_Types].xml'))
+            if limits is not None:
+                limits.check_package(self.zip)
+            content_types = self._content_types = self.__parse(CONTENT_TYPES_NAME)
             for file in content_types.findall('{%(ct)s}Override' % NAMESPACES):
                 type = file.attrib['ContentType' % NAMESPACES]
                 if type in CONTENT_TYPES_PARTS:
@@ -49,10 +440,10 @@ class MailMerge(object):
                             continue
                         instr = child.attrib['{%(w)s}instr' % NAMESPACES]
 
-                        name = self.__parse_instr(instr)
-                        if name is None:
+                        element = self.__field_element(instr)
+                        if element is None:
                             continue
-                        parent[idx] = Element('MergeField', name=name)
+                        parent[idx] = element
 
                 for parent in part.findall('.//{%(w)s}instrText/../..' % NAMESPACES):
                     children = list(parent)
@@ -81,11 +472,11 @@ class MailMerge(object):
                         for instr in instr_elements[1:]:
                             instr.getparent().remove(instr)
 
-                        name = self.__parse_instr(instr_text)
-                        if name is None:
+                        element = self.__field_element(instr_text)
+                        if element is None:
                             continue
 
-                        parent[idx_begin] = Element('MergeField', name=name)
+                        parent[idx_begin] = element
 
                         # use this so we know *where* to put the replacement
                         instr_elements[0].tag = 'MergeText'
@@ -99,16 +490,141 @@ class MailMerge(object):
             for parent, child in to_delete:
                 parent.remove(child)
 
+            if limits is not None:
+                limits.check_fields(sum(1 for part in self.parts.values() for _ in part.iter('MergeField')))
+                limits.check_deadline(self._deadline)
+
+            if minify:
+                for part in self.parts.values():
+                    self.__minify(part)
+
+            if TEMPLATE_PART in self.zip.namelist():
+                self._xml_parts[TEMPLATE_PART] = self.__parse(TEMPLATE_PART)
+                self.__load_template()
+            self._conditional = self.__has_conditions()
+
             # Remove mail merge settings to avoid error messages when opening document in Winword
             if self.settings:
                 settings_root = self.settings.getroot()
                 mail_merge = settings_root.find('{%(w)s}mailMerge' % NAMESPACES)
                 if mail_merge is not None:
                     settings_root.remove(mail_merge)
+
+            self.template_size = self.peak_size = self.__estimate_size()
+            if memory_budget is not None and self.template_size > memory_budget:
+                raise LimitExceeded("Template takes about %d bytes, more than the budget of %d" %
+                                    (self.template_size, memory_budget))
+
+            # the time limit covers loading; parts parsed later are only bounded in size
+            self._deadline = None
         except:
             self.zip.close()
             raise
 
+    def __setup(self, zip, remove_empty_tables):
+        self.zip = zip
+        self.parts = {}
+        self.settings = None
+        self._settings_info = None
+        self.remove_empty_tables = remove_empty_tables
+        self.invalid_characters = 'raise'
+        self.memory_budget = None
+        self.template_size = 0
+        self.peak_size = 0
+        self._content_types = None
+        self._xml_parts = OrderedDict()
+        self._binary_parts = OrderedDict()
+        self._part_names = {}
+        self._media_relationships = OrderedDict()
+        self._hyperlink_relationships = OrderedDict()
+        self._run_properties = {}
+        self._drawings = []
+        self._conditional = False
+        self._merged_template = None
+        self._template_part = None
+        self._section_templates = {}
+        self._limits = None
+        self._deadline = None
+        self._watch_state = None
+
+    def _snapshot(self):
+        """
+        Picklable state of the document: the template package and its parts
+        serialized as loaded, with the merge fields already located. Worker
+        processes restore it with ``_from_snapshot`` instead of loading the
+        template again.
+        """
+        # parts added to the package, by _append_document, are in both parts and _xml_parts
+        part_names = set(zi.filename for zi in self.parts)
+        fp = self.zip.fp
+        position = fp.tell()
+        fp.seek(0)
+        package = fp.read()
+        fp.seek(position)
+        return {
+            'package': package,
+            'remove_empty_tables': self.remove_empty_tables,
+            'invalid_characters': self.invalid_characters,
+            'memory_budget': self.memory_budget,
+            'template_size': self.__estimate_size(),
+            'parts': [(zi.filename, etree.tostring(part)) for zi, part in self.parts.items()],
+            'settings': (self._settings_info.filename, etree.tostring(self.settings))
+            if self.settings is not None else None,
+            'xml_parts': [(name, etree.tostring(part)) for name, part in self._xml_parts.items()
+                          if name not in part_names],
+            'binary_parts': list(self._binary_parts.items()),
+            'media_relationships': dict(self._media_relationships),
+            'hyperlink_relationships': list(self._hyperlink_relationships.items()),
+        }
+
+    @classmethod
+    def _from_snapshot(cls, snapshot):
+        document = cls.__new__(cls)
+        document.__setup(ZipFile(BytesIO(snapshot['package'])), snapshot['remove_empty_tables'])
+        document.invalid_characters = snapshot['invalid_characters']
+        document.memory_budget = snapshot['memory_budget']
+        document.template_size = document.peak_size = snapshot['template_size']
+        zip = document.zip
+        for name, xml in snapshot['parts']:
+            tree = etree.ElementTree(etree.fromstring(xml))
+            if name in zip.NameToInfo:
+                document.parts[zip.getinfo(name)] = tree
+            else:
+                document.parts[ZipInfo(name)] = document._xml_parts[name] = tree
+        if snapshot['settings'] is not None:
+            name, xml = snapshot['settings']
+            document._settings_info = zip.getinfo(name)
+            document.settings = etree.ElementTree(etree.fromstring(xml))
+        for name, xml in snapshot['xml_parts']:
+            document._xml_parts[name] = etree.ElementTree(etree.fromstring(xml))
+        document._content_types = document._xml_parts.get(CONTENT_TYPES_NAME) or \
+            etree.parse(zip.open(CONTENT_TYPES_NAME))
+        document._binary_parts.update(snapshot['binary_parts'])
+        document._media_relationships.update(snapshot['media_relationships'])
+        document._hyperlink_relationships.update(snapshot['hyperlink_relationships'])
+        if TEMPLATE_PART in document._xml_parts:
+            document.__load_template()
+        document._conditional = document.__has_conditions()
+        return document
+
+    @classmethod
+    def __field_element(cls, instr):
+        """
+        The element standing in for a field until it is merged: MergeField
+        for merge fields, and NextRecord for the NEXT and NEXTIF fields of
+        label sheets, with the condition of NEXTIF. None for other fields.
+        """
+        args = shlex.split(instr, posix=False)
+        if args and args[0] in ('NEXT', 'NEXTIF'):
+            element = Element('NextRecord')
+            if args[0] == 'NEXTIF' and len(args) >= 4:
+                element.set('field', args[1].strip('"'))
+                element.set('operator', args[2])
+                element.set('value', args[3].strip('"'))
+            return element
+        name = cls.__parse_instr(instr)
+        return Element('MergeField', name=name) if name is not None else None
+
     @classmethod
     def __parse_instr(cls, instr):
         args = shlex.split(instr, posix=False)
@@ -119,10 +635,70 @@ class MailMerge(object):
             name = name[1:-1]
         return name
 
+    @staticmethod
+    def __minify(part):
+        """
+        Strips proofing marks, revision IDs and paragraph IDs, then joins
+        adjacent plain text runs with identical formatting. MergeFields are
+        not runs, so they are never joined with their neighbours.
+        """
+        noise = []
+        for element in part.iter():
+            if element.tag in MINIFY_REMOVE_TAGS:
+                noise.append(element)
+                continue
+            attrib = element.attrib
+            for name in [name for name in attrib
+                         if name in MINIFY_REMOVE_ATTRIBUTES or name.startswith(MINIFY_RSID_PREFIX)]:
+                del attrib[name]
+        for element in noise:
+            element.getparent().remove(element)
+
+        run_tag = '{%(w)s}r' % NAMESPACES
+        text_tag = '{%(w)s}t' % NAMESPACES
+        rpr_tag = '{%(w)s}rPr' % NAMESPACES
+
+        def text_run(run):
+            # returns (formatting, text node) for runs holding nothing but text
+            if len(run.attrib) or not 1 <= len(run) <= 2 or run[-1].tag != text_tag:
+                return None
+            if len(run) == 2:
+                if run[0].tag != rpr_tag:
+                    return None
+                return etree.tostring(run[0]), run[-1]
+            return b'', run[-1]
+
+        for run in list(part.iter(run_tag)):
+            previous = run.getprevious()
+            if previous is None or previous.tag != run_tag:
+                continue
+            current, merged = text_run(run), text_run(previous)
+            if current is None or merged is None or current[0] != merged[0]:
+                continue
+            text = (merged[1].text or '') + (current[1].text or '')
+            merged[1].text = text
+            if text != text.strip():
+                merged[1].set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
+            run.getparent().remove(run)
+
     def __get_tree_of_file(self, file):
         fn = file.attrib['PartName' % NAMESPACES].split('/', 1)[1]
         zi = self.zip.getinfo(fn)
-        return zi, etree.parse(self.zip.open(zi))
+        return zi, self.__parse(zi)
+
+    def __parse(self, member):
+        """
+        Parses an XML member of the package, within the limits if given.
+        Entities are never resolved and nothing is loaded from the network.
+        """
+        name = getattr(member, 'filename', member)
+        with self.zip.open(member) as source:
+            if self._limits is not None:
+                tree = self._limits.parse(source, name, self._deadline)
+                self._limits.check_deadline(self._deadline)
+                return tree
+            parser = etree.XMLParser(resolve_entities=False, no_network=True, load_dtd=False)
+            return etree.parse(source, parser)
 
     # def write(self, file):
     #     # Replace all remaining merge fields with empty values
@@ -140,166 +716,406 @@ class MailMerge(object):
     #             else:
     #                 output.writestr(zi.filename, self.zip.read(zi))
 
-    def write(self, file, is_vernacular):
+    def write(self, file, is_vernacular=False, flat=False, progress=None, deadline=None):
+        """
+        Writes the merged document to a path or file object. With
+        ``flat=True`` the output is a Flat OPC document, a single XML file
+        that Word and XSLT pipelines read directly (see ``iter_flat_opc``).
+
+        ``progress`` and ``deadline`` are described in ``merge_templates``;
+        progress is reported as ``('bytes', written)`` after every member.
+        """
+        with self.__watch(progress, deadline):
+            self.__write(file, is_vernacular, flat)
+
+    def __write(self, file, is_vernacular, flat):
+        if flat:
+            if hasattr(file, 'write'):
+                for chunk in self.iter_flat_opc(is_vernacular):
+                    file.write(chunk)
+            else:
+                with open(file, 'wb') as output:
+                    for chunk in self.iter_flat_opc(is_vernacular):
+                        output.write(chunk)
+            return
+
+        self.__merge_remaining()
+
+        with ZipFile(file, 'w', ZIP_DEFLATED) as output:
+            for filename, data in self._iter_members(is_vernacular, raw=True):
+                if isinstance(data, ZipInfo):
+                    _copy_member(self.zip, data, output, self._zip_info(filename))
+                else:
+                    output.writestr(self._zip_info(filename), data)
+                self.__tick('bytes', output.fp.tell())
+
+    def iter_bytes(self, chunk_size=65536, is_vernacular=False, progress=None, deadline=None):
+        """
+        Yields the output package as a sequence of byte strings, compressing
+        one member at a time. Nothing has to be seekable: members are written
+        with data descriptors, so the chunks can be sent to a client while
+        later members are still being produced.
+
+        Python versions before 3.6 cannot write zip members incrementally;
+        there the package is written in memory first and then yielded.
+        Progress is reported as ``('bytes', yielded)`` for every chunk.
+        """
+        with self.__watch(progress, deadline):
+            written = 0
+            for chunk in self.__iter_bytes(chunk_size, is_vernacular):
+                yield chunk
+                written += len(chunk)
+                self.__tick('bytes', written)
+
+    def __iter_bytes(self, chunk_size, is_vernacular):
+        if sys.version_info < (3, 6):
+            output = BytesIO()
+            self.__write(output, is_vernacular, False)
+            data = output.getvalue()
+            for offset in range(0, len(data), chunk_size):
+                yield data[offset:offset + chunk_size]
+            return
+
+        self.__merge_remaining()
+
+        buffer = _ChunkBuffer()
+        with ZipFile(buffer, 'w', ZIP_DEFLATED) as output:
+            for filename, data in self._iter_members(is_vernacular, raw=True):
+                if isinstance(data, ZipInfo):
+                    _copy_member(self.zip, data, output, self._zip_info(filename))
+                    if buffer.size >= chunk_size:
+                        yield buffer.drain()
+                    continue
+                with output.open(self._zip_info(filename), 'w') as dest:
+                    for offset in range(0, len(data), chunk_size):
+                        dest.write(data[offset:offset + chunk_size])
+                        if buffer.size >= chunk_size:
+                            yield buffer.drain()
+                if buffer.size:
+                    yield buffer.drain()
+        if buffer.size:
+            yield buffer.drain()
+
+    def iter_flat_opc(self, is_vernacular=False, progress=None, deadline=None):
+        """
+        Yields the document in the Flat OPC format: every part of the package
+        in one XML stream, with binary parts base64 encoded. Nothing is
+        compressed, parts are written straight from their trees or the
+        template's members, one part at a time. Progress is reported as
+        ``('bytes', yielded)`` for every chunk.
+        """
+        with self.__watch(progress, deadline):
+            written = 0
+            for chunk in self.__iter_flat_opc(is_vernacular):
+                yield chunk
+                written += len(chunk)
+                self.__tick('bytes', written)
+
+    def __iter_flat_opc(self, is_vernacular):
+        self.__merge_remaining()
+
+        yield (b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+               b'<?mso-application progid="Word.Document"?>\n'
+               b'<pkg:package xmlns:pkg="' + NAMESPACES['pkg'].encode('ascii') + b'">')
+        content_types = self.__content_type_map()
+        for filename, data in self._iter_members(is_vernacular):
+            if filename == CONTENT_TYPES_NAME:
+                continue
+            name = '/' + filename
+            content_type = content_types['override'].get(name.lower())
+            if content_type is None:
+                # by extension; splitext would take all of '.rels' as the name
+                extension = posixpath.basename(name).rpartition('.')[2].lower()
+                content_type = content_types['default'].get(extension) or \
+                    FLAT_OPC_DEFAULT_TYPES.get(extension, 'application/octet-stream')
+            head = '<pkg:part pkg:name="%s" pkg:contentType="%s"' % (_xml_attribute(name), _xml_attribute(content_type))
+            if content_type.endswith('xml'):
+                yield head.encode('utf-8') + b'><pkg:xmlData>'
+                yield _strip_xml_declaration(data)
+                yield b'</pkg:xmlData></pkg:part>'
+            else:
+                yield head.encode('utf-8') + b' pkg:compression="store"><pkg:binaryData>'
+                # 57 bytes make a full 76 character line, so chunks encode independently
+                step = 57 * 1024
+                for offset in range(0, len(data), step):
+                    yield _encode_base64(data[offset:offset + step])
+                yield b'</pkg:binaryData></pkg:part>'
+        yield b'</pkg:package>'
+
+    def __content_type_map(self):
+        overrides, defaults = {}, {}
+        root = self._content_types.getroot()
+        for override in root.iterfind('{%(ct)s}Override' % NAMESPACES):
+            overrides[override.get('PartName', '').lower()] = override.get('ContentType')
+        for default in root.iterfind('{%(ct)s}Default' % NAMESPACES):
+            defaults[default.get('Extension', '').lower()] = default.get('ContentType')
+        return {'override': overrides, 'default': defaults}
+
+    @contextmanager
+    def __watch(self, progress, deadline):
+        """
+        Makes ``progress`` and ``deadline`` apply to the operations run in
+        this context, including nested ones: merge_rows called by merge
+        within merge_templates reports to the same callback.
+        """
+        previous = self._watch_state
+        if progress is not None or deadline is not None:
+            self._watch_state = (progress, deadline)
+        try:
+            self.__tick(None, 0)
+            yield
+        finally:
+            self._watch_state = previous
+
+    def __tick(self, kind, count):
+        if self._watch_state is None:
+            return
+        progress, deadline = self._watch_state
+        if deadline is not None and time.time() > deadline:
+            raise DeadlineExceeded("Deadline passed after %d %s" % (count, kind or 'items'))
+        if kind is not None and progress is not None and progress(kind, count) is False:
+            raise MergeCancelled("Cancelled after %d %s" % (count, kind))
+
+    def __estimate_size(self):
+        """
+        Estimated resident size in bytes of the parsed parts and the binary
+        parts added to the package.
+        """
+        trees = list(self.parts.values()) + [tree for tree in self._xml_parts.values()
+                                             if tree not in self.parts.values()]
+        if self.settings is not None:
+            trees.append(self.settings)
+        return _tree_size(tree.getroot() for tree in trees) + sum(len(data) for data in self._binary_parts.values())
+
+    def __grow(self, size):
+        """
+        Accounts for ``size`` bytes added to the document, such as a copy of
+        a table row or of the template body, raising LimitExceeded before
+        the copy is made if it would take the document past
+        ``memory_budget``. Nothing is subtracted for removed elements, so
+        ``peak_size`` is an upper bound of the document's size.
+        """
+        projected = self.peak_size + size
+        if self.memory_budget is not None and projected > self.memory_budget:
+            raise LimitExceeded("Merge would grow the document to about %d bytes, more than the budget of %d" %
+                                (projected, self.memory_budget))
+        self.peak_size = projected
+
+    def __reserve(self, size, items):
+        """
+        Checks that a copy of ``size`` bytes for every item of ``items``
+        fits the memory budget, if the number of items is known up front.
+        """
+        if self.memory_budget is not None and hasattr(items, '__len__'):
+            projected = self.peak_size + size * len(items)
+            if projected > self.memory_budget:
+                raise LimitExceeded("Merging %d items would grow the document to about %d bytes, "
+                                    "more than the budget of %d" % (len(items), projected, self.memory_budget))
+
+    def __merge_remaining(self):
+        # Conditions on fields that were not merged are false
+        if self._conditional:
+            self.__resolve_conditions(self.parts.values(), {}, final=True)
+        # NEXT fields only have a meaning in merge_templates
+        for part in self.parts.values():
+            for element in list(part.iter('NextRecord')):
+                element.getparent().remove(element)
         # Replace all remaining merge fields with empty values
         for field in self.get_merge_fields():
             self.merge(**{field: ''})
 
-        
-        with ZipFile(file, 'w', ZIP_DEFLATED) as output:
-            for zi in self.zip.filelist:
-                if zi in self.parts:
-                    xml = etree.tostring(self.parts[zi].getroot())
-                    # if str(zi) == "<ZipInfo filename='word/document.xml' compress_type=deflate file_size=2070956 compress_size=56133>":
-                    if 'word/document.xml' in str(zi):
-                        # print('true')
-                        xml = xml.decode('utf-8')
-                        all_table_tags = re.findall('<w:tbl>',xml)
-                        # print(all_table_tags)
-                        table_start,table_end = 0,len(xml)
-                        for i in range(len(all_table_tags)):
-                            start_t_index = xml.find('<w:tbl>',table_start,table_end)
-                            end_t_index = xml.find('</w:tbl>',start_t_index,table_end)
-                            end_t_index += len('</w:tbl>')
-                            # print(f"*******\n\n{xml[start_t_index:end_t_index]}\n\n*******")
-                            table_xml = xml[start_t_index:end_t_index]
-                            all_w_t_tags = re.findall('<w:t>',table_xml)
-                            all_empty_w_t_tags = re.findall('<w:t></w:t>',table_xml)
-                            # print(f"******\n\n{len(all_w_t_tags), len(all_empty_w_t_tags)}\n\n*********")
-                            if len(all_w_t_tags) == len(all_empty_w_t_tags):
-                                xml = xml[:start_t_index] + xml[end_t_index:]
-                                table_end = len(xml)
-                            else:
-                                table_start = end_t_index
-                        all_empty_tags = re.findall('<w:t></w:t>',xml)
-                        total_empty_tags = len(all_empty_tags)
-                        # print(total_empty_tags)
-                        total_empty_tags_handled = 0
-                        start_index=0
-                        end_index = len(xml)
-                        # print(end_index)
-                        if_table_found = False
-                        while( total_empty_tags > 0 ):
-                            if not if_table_found :
-                                start_index = 0
-                                end_index = len(xml)
-                            table_start_index, table_end_index = 0,len(xml)
-                            n = len(xml)
-                            all_table_tags_indexses = []
-                            for i in range(len(all_table_tags)):
-                                # print('finding table tags')
-                                table_start_index = xml.find('<w:tbl>',table_start_index,table_end_index)
-                                table_end_index = xml.find('</w:tbl>',table_start_index,table_end_index)
-                                if table_start_index > -1 and table_end_index > -1:
-                                    table_end_index += len('</w:tbl>')
-                                    all_table_tags_indexses.append((table_start_index, table_end_index))
-                                    # print(xml[table_start_index:table_end_index])
-                                    table_start_index = table_end_index
-                                    table_end_index = n
-                                else:
-                                    break
+    @staticmethod
+    def _zip_info(filename):
+        """
+        Member header with fixed timestamp and attributes, so that writing
+        the same merge twice produces byte-identical archives.
+        """
+        zi = ZipInfo(filename, date_time=ZIP_DATE_TIME)
+        zi.compress_type = ZIP_DEFLATED
+        zi.create_system = 0
+        zi.external_attr = 0
+        return zi
+
+    def _iter_members(self, is_vernacular=False, raw=False):
+        """
+        Yields (filename, data) for every member of the output package, in the
+        order of the template archive followed by the parts added to it. With
+        ``raw``, members copied unchanged from the template are yielded as
+        their ZipInfo instead, so they can be copied without recompressing.
+        """
+        self.__number_drawings()
+        for zi in self.zip.filelist:
+            if zi in self.parts:
+                xml = etree.tostring(self.parts[zi].getroot())
+                # if str(zi) == "<ZipInfo filename='word/document.xml' compress_type=deflate file_size=2070956 compress_size=56133>":
+                if 'word/document.xml' in str(zi):
+                    xml = self._clean_document_xml(xml, is_vernacular)
+                yield zi.filename, xml
+            elif zi == self._settings_info:
+                yield zi.filename, etree.tostring(self.settings.getroot())
+            elif zi.filename in self._xml_parts:
+                yield zi.filename, self.__serialize_part(zi.filename)
+            elif raw:
+                yield zi.filename, zi
+            else:
+                yield zi.filename, self.zip.read(zi)
+
+        existing = set(self.zip.namelist())
+        for filename in self._xml_parts:
+            if filename not in existing:
+                yield filename, self.__serialize_part(filename)
+        for filename, data in self._binary_parts.items():
+            yield filename, data
+
+    def __serialize_part(self, filename):
+        return etree.tostring(self._xml_parts[filename], xml_declaration=True,
+                              encoding='UTF-8', standalone=True)
+
+    @staticmethod
+    def _clean_document_xml(xml, is_vernacular):
+        # print('true')
+        xml = xml.decode('utf-8')
+        all_table_tags = re.findall('<w:tbl>',xml)
+        # print(all_table_tags)
+        table_start,table_end = 0,len(xml)
+        for i in range(len(all_table_tags)):
+            start_t_index = xml.find('<w:tbl>',table_start,table_end)
+            end_t_index = xml.find('</w:tbl>',start_t_index,table_end)
+            end_t_index += len('</w:tbl>')
+            # print(f"*******\n\n{xml[start_t_index:end_t_index]}\n\n*******")
+            table_xml = xml[start_t_index:end_t_index]
+            all_w_t_tags = re.findall('<w:t>',table_xml)
+            all_empty_w_t_tags = re.findall('<w:t></w:t>',table_xml)
+            # print(f"******\n\n{len(all_w_t_tags), len(all_empty_w_t_tags)}\n\n*********")
+            if len(all_w_t_tags) == len(all_empty_w_t_tags):
+                xml = xml[:start_t_index] + xml[end_t_index:]
+                table_end = len(xml)
+            else:
+                table_start = end_t_index
+        all_empty_tags = re.findall('<w:t></w:t>',xml)
+        total_empty_tags = len(all_empty_tags)
+        # print(total_empty_tags)
+        total_empty_tags_handled = 0
+        start_index=0
+        end_index = len(xml)
+        # print(end_index)
+        if_table_found = False
+        while( total_empty_tags > 0 ):
+            if not if_table_found :
+                start_index = 0
+                end_index = len(xml)
+            table_start_index, table_end_index = 0,len(xml)
+            n = len(xml)
+            all_table_tags_indexses = []
+            for i in range(len(all_table_tags)):
+                # print('finding table tags')
+                table_start_index = xml.find('<w:tbl>',table_start_index,table_end_index)
+                table_end_index = xml.find('</w:tbl>',table_start_index,table_end_index)
+                if table_start_index > -1 and table_end_index > -1:
+                    table_end_index += len('</w:tbl>')
+                    all_table_tags_indexses.append((table_start_index, table_end_index))
+                    # print(xml[table_start_index:table_end_index])
+                    table_start_index = table_end_index
+                    table_end_index = n
+                else:
+                    break
 
-                            ind = xml.find('<w:t></w:t>',start_index,end_index)
-                            # start_index = ind + len('<w:t></w:t>')
-                            # print(start_index, end_index)
-                            is_in_table = False
-                            for tags in all_table_tags_indexses:
-                                # print('checking if in table')
-                                if ind >= tags[0] and ind <= tags[1]:
-                                    if_table_found = True
-                                    is_in_table = True
-                                    # print(tags[0],tags[1])
-                                    # print(start_index)
-                                    start_index = tags[1]
-                                    # print(start_index, end_index)
-                                    table = xml[tags[0]:tags[1]]
-                                    in_table_empty_tags = re.findall('<w:t></w:t>',table)
-                                    # print(total_empty_tags)
-                                    total_empty_tags -= len(in_table_empty_tags)
-                                    # print(total_empty_tags)
-                                    # print('t1:',total_empty_tags ,total_empty_tags_handled)
-                                    # print(len(in_table_empty_tags))
-                                    # total_empty_tags_handled += len(in_table_empty_tags)
-                                    # print('t2:',total_empty_tags ,total_empty_tags_handled)
+            ind = xml.find('<w:t></w:t>',start_index,end_index)
+            # start_index = ind + len('<w:t></w:t>')
+            # print(start_index, end_index)
+            is_in_table = False
+            for tags in all_table_tags_indexses:
+                # print('checking if in table')
+                if ind >= tags[0] and ind <= tags[1]:
+                    if_table_found = True
+                    is_in_table = True
+                    # print(tags[0],tags[1])
+                    # print(start_index)
+                    start_index = tags[1]
+                    # print(start_index, end_index)
+                    table = xml[tags[0]:tags[1]]
+                    in_table_empty_tags = re.findall('<w:t></w:t>',table)
+                    # print(total_empty_tags)
+                    total_empty_tags -= len(in_table_empty_tags)
+                    # print(total_empty_tags)
+                    # print('t1:',total_empty_tags ,total_empty_tags_handled)
+                    # print(len(in_table_empty_tags))
+                    # total_empty_tags_handled += len(in_table_empty_tags)
+                    # print('t2:',total_empty_tags ,total_empty_tags_handled)
+                    break
+            
+            if not is_in_table:
+                # print("in here")
+                i = ind
+                while True:
+                    while(xml[i-4:i] != '<w:r' ):
+                        i -= 1
+                    if (xml[i] == ' ' or xml[i] == '>'):
+                        temp_i = i-4
+                        start_i = i-4
+                        end_i = ind+17
+                        break
+                    else:
+                        i -= 1
+                # print(xml[start_i:end_i], end='\n\n')
+                if xml[ind+17 : ind+22] == '<w:r>' or xml[ind+17 : ind+22] == '<w:r ':
+                    end_ind = ind+22
+                    while(xml[end_ind: end_ind+6] != '</w:r>'):
+                        end_ind+=1
+                    temp_end_i = end_ind+6
+                    empty_block = '<w:t xml:space="preserve"> </w:t>'
+                    if xml.find(empty_block, end_i+1,temp_end_i) > 0:
+                        end_i = temp_end_i
+                        if xml[start_i-8:start_i] == '</w:pPr>' and xml[end_i:end_i+6] == '</w:p>':
+                            j = start_i-8
+                            while True:
+                                while(xml[j-4:j] != '<w:p'):
+                                    j = j - 1
+                                if xml[j] == '>' or xml[j] == ' ':
+                                    start_i = j-4
+                                    end_i = end_i + 6
                                     break
-                            
-                            if not is_in_table:
-                                # print("in here")
-                                i = ind
-                                while True:
-                                    while(xml[i-4:i] != '<w:r' ):
-                                        i -= 1
-                                    if (xml[i] == ' ' or xml[i] == '>'):
-                                        temp_i = i-4
-                                        start_i = i-4
-                                        end_i = ind+17
-                                        break
-                                    else:
-                                        i -= 1
-                                # print(xml[start_i:end_i], end='\n\n')
-                                if xml[ind+17 : ind+22] == '<w:r>' or xml[ind+17 : ind+22] == '<w:r ':
-                                    end_ind = ind+22
-                                    while(xml[end_ind: end_ind+6] != '</w:r>'):
-                                        end_ind+=1
-                                    temp_end_i = end_ind+6
-                                    empty_block = '<w:t xml:space="preserve"> </w:t>'
-                                    if xml.find(empty_block, end_i+1,temp_end_i) > 0:
-                                        end_i = temp_end_i
-                                        if xml[start_i-8:start_i] == '</w:pPr>' and xml[end_i:end_i+6] == '</w:p>':
-                                            j = start_i-8
-                                            while True:
-                                                while(xml[j-4:j] != '<w:p'):
-                                                    j = j - 1
-                                                if xml[j] == '>' or xml[j] == ' ':
-                                                    start_i = j-4
-                                                    end_i = end_i + 6
-                                                    break
-                                                else:
-                                                    j -= 1
-                                
-                                if xml[temp_i-8:temp_i] == '</w:pPr>' and xml[ind+17:ind+23] == '</w:p>':
-                                    j = temp_i-8
-                                    
-                                    while True:
-                                        while(xml[j-4:j] != '<w:p'):
-                                            j = j - 1
-                                        if xml[j] == '>' or xml[j] == ' ':
-                                            start_i = j-4
-                                            end_i = ind+23
-                                            break
-                                        else:
-                                            j -= 1
-                                    # print(xml[start_i:end_i],end='\n\n')
-
-                                # print(len(xml))
-                                temp = xml[:start_i] + xml[end_i:]
-                                del(xml)
-                                xml = temp
-                                del(temp)
-                                end_index = len(xml)
-                                # print(len(xml))
-                                # total_empty_tags_handled += 1
-                                total_empty_tags -= 1
+                                else:
+                                    j -= 1
+                
+                if xml[temp_i-8:temp_i] == '</w:pPr>' and xml[ind+17:ind+23] == '</w:p>':
+                    j = temp_i-8
+                    
+                    while True:
+                        while(xml[j-4:j] != '<w:p'):
+                            j = j - 1
+                        if xml[j] == '>' or xml[j] == ' ':
+                            start_i = j-4
+                            end_i = ind+23
+                            break
+                        else:
+                            j -= 1
+                    # print(xml[start_i:end_i],end='\n\n')
+
+                # print(len(xml))
+                temp = xml[:start_i] + xml[end_i:]
+                del(xml)
+                xml = temp
+                del(temp)
+                end_index = len(xml)
+                # print(len(xml))
+                # total_empty_tags_handled += 1
+                total_empty_tags -= 1
 			
-                        if is_vernacular:
-                            corrupted_tags = re.findall(r".\/w:t>",xml)
-                            for i in range(len(corrupted_tags)):
-                                c_tag_index = xml.find(corrupted_tags[i])
-                                if xml[c_tag_index] != '<':
-                                    temp = xml[:c_tag_index] + '<' + xml[c_tag_index+1:]
-                                    del(xml)
-                                    xml = temp
-                                    del(temp)
-                        # f = open('final_xml.xml','w')
-                        # f.write(f"{xml}")
-                        # f.close()
-                        xml = bytes(xml,'utf-8')
-                    output.writestr(zi.filename, xml)
-                elif zi == self._settings_info:
-                    xml = etree.tostring(self.settings.getroot())
-                    output.writestr(zi.filename, xml)
-                else:
-                    output.writestr(zi.filename, self.zip.read(zi))
+        if is_vernacular:
+            corrupted_tags = re.findall(r".\/w:t>",xml)
+            for i in range(len(corrupted_tags)):
+                c_tag_index = xml.find(corrupted_tags[i])
+                if xml[c_tag_index] != '<':
+                    temp = xml[:c_tag_index] + '<' + xml[c_tag_index+1:]
+                    del(xml)
+                    xml = temp
+                    del(temp)
+        # f = open('final_xml.xml','w')
+        # f.write(f"{xml}")
+        # f.close()
+        xml = bytes(xml,'utf-8')
+        return xml
 
 
     # def write(self, file):
@@ -439,7 +1255,8 @@ class MailMerge(object):
                 fields.add(mf.attrib['name'])
         return fields
 
-    def merge_templates(self, replacements, separator):
+    def merge_templates(self, replacements, separator, appendable=False, progress=None, deadline=None,
+                        processes=None, chunk_size=64):
         """
         Duplicate template. Creates a copy of the template, does a merge, and separates them by a new paragraph, a new break or a new section break.
         separator must be :
@@ -451,11 +1268,25 @@ class MailMerge(object):
         - nextColumn_section : nextColumn section break. section begins on the following column on the page. ONLY HAVE EFFECT IF DOCUMENT HAVE COLUMNS
         - nextPage_section : nextPage section break. section begins on the following page.
         - oddPage_section : oddPage section break. section begins on the next odd-numbered page, leaving the next even page blank if necessary.
+        With appendable=True, the template body is stored in the written package so that append_templates can add records later.
+
+        progress is called as progress('records', merged) after every record, progress('rows', merged) after
+        every table row and progress('items', merged) after every item of a region. Returning False from it stops
+        the merge with MergeCancelled. deadline is a time.time() timestamp, past which the merge stops with
+        DeadlineExceeded.
+
+        With processes greater than 1, the copies of the template body are merged in that many worker processes,
+        chunk_size records at a time, and spliced into this document in order. The output is the same as a serial
+        merge. Records must then be picklable, so table rows must be lists rather than generators. Worker processes
+        need Python 3.7 or later.
         """
+        with self.__watch(progress, deadline):
+            self.__merge_templates(replacements, separator, appendable, processes, chunk_size)
+
+    def __merge_templates(self, replacements, separator, appendable, processes=None, chunk_size=64):
 
         #TYPE PARAM CONTROL AND SPLIT
-        valid_separators = {'page_break', 'column_break', 'textWrapping_break', 'continuous_section', 'evenPage_section', 'nextColumn_section', 'nextPage_section', 'oddPage_section'}
-        if not separator in valid_separators:
+        if not separator in SEPARATORS:
             raise ValueError("Invalid separator argument")
         type, sepClass = separator.split("_")
   
@@ -500,128 +1331,2264 @@ class MailMerge(object):
             childrenList = root.findall('w:body/*', namespaces=NAMESPACES)
 
             #DELETE ALL CHILDREN OF BODY
-            for child in root:
-                if child.tag == '{%(w)s}body' % NAMESPACES:
-                    child.clear()
+            body = root.find('w:body', namespaces=NAMESPACES)
+            body.clear()
+
+            #KEEP THE TEMPLATE BODY, IN THE PACKAGE IF appendable FOR append_templates
+            self.__store_template(separator, childrenList, mainSection, appendable)
 
             #REFILL BODY AND MERGE DOCS - ADD LAST SECTION ENCAPSULATED OR NOT
-            lr = len(replacements)
-            lc = len(childrenList)
-
-            for i, repl in enumerate(replacements):
-                parts = []
-                for (j, n) in enumerate(childrenList):
-                    element = deepcopy(n)
-                    for child in root:
-                        if child.tag == '{%(w)s}body' % NAMESPACES:
-                            child.append(element)
-                            parts.append(element)
-                            if (j + 1) == lc:
-                                if (i + 1) == lr:
-                                    child.append(mainSection)
-                                    parts.append(mainSection)
-                                else:
-                                    if sepClass == 'section':
-                                        intSection = deepcopy(mainSection)
-                                        p   = etree.SubElement(child, '{%(w)s}p'  % NAMESPACES)
-                                        pPr = etree.SubElement(p, '{%(w)s}pPr'  % NAMESPACES)
-                                        pPr.append(intSection)
-                                        parts.append(p)
-                                    elif sepClass == 'break':
-                                        pb   = etree.SubElement(child, '{%(w)s}p'  % NAMESPACES)
-                                        r = etree.SubElement(pb, '{%(w)s}r'  % NAMESPACES)
-                                        nbreak = Element('{%(w)s}br' % NAMESPACES)
-                                        nbreak.attrib['{%(w)s}type' % NAMESPACES] = type
-                                        r.append(nbreak)
-
-                    self.merge(parts, **repl)
+            if processes is not None and processes > 1:
+                self.__append_records_parallel(body, replacements, lastSection, processes, chunk_size)
+            else:
+                self.__append_records(body, replacements, lastSection)
+            body.append(lastSection)
 
-    def merge_pages(self, replacements):
-         """
-         Deprecated method.
-         """
-         warnings.warn("merge_pages has been deprecated in favour of merge_templates",
-                      category=DeprecationWarning,
-                      stacklevel=2)         
-         self.merge_templates(replacements, "page_break")
+    def append_templates(self, replacements, progress=None, deadline=None):
+        """
+        Appends records to a document produced by merge_templates, after the
+        last record and with the same separator. The document must have been
+        merged with ``appendable=True``, which stores the template body in
+        the written package, so records already in the document are not
+        rendered again. ``progress`` and ``deadline`` are described in
+        ``merge_templates``.
+        """
+        if self._merged_template is None:
+            raise ValueError("Document was not produced by merge_templates")
+        with self.__watch(progress, deadline):
+            self.__append_templates(replacements)
 
-    def merge(self, parts=None, **replacements):
-        if not parts:
-            parts = self.parts.values()
+    def __append_templates(self, replacements):
 
-        for field, replacement in replacements.items():
-            if isinstance(replacement, list):
-                self.merge_rows(field, replacement)
-            else:
-                for part in parts:
-                    self.__merge_field(part, field, replacement)
+        for part in self.parts.values():
+            root = part.getroot()
+            if root.tag != '{%(w)s}document' % NAMESPACES:
+                continue
+            body = root.find('w:body', namespaces=NAMESPACES)
+            lastSection = body.find('w:sectPr', namespaces=NAMESPACES)
+            body.remove(lastSection)
+            self.__append_records(body, replacements, lastSection)
+            body.append(lastSection)
 
-    def __merge_field(self, part, field, text):
-        for mf in part.findall('.//MergeField[@name="%s"]' % field):
-            children = list(mf)
-            mf.clear()  # clear away the attributes
-            mf.tag = '{%(w)s}r' % NAMESPACES
-            mf.extend(children)
-
-            nodes = []
-            # preserve new lines in replacement text
-            text = text or ''  # text might be None
-            text_parts = str(text).replace('\r', '').split('\n')
-            for i, text_part in enumerate(text_parts):
-                text_node = Element('{%(w)s}t' % NAMESPACES)
-                text_node.text = text_part
-                nodes.append(text_node)
-
-                # if not last node add new line node
-                if i < (len(text_parts) - 1):
-                    nodes.append(Element('{%(w)s}br' % NAMESPACES))
-
-            ph = mf.find('MergeText')
-            if ph is not None:
-                # add text nodes at the exact position where
-                # MergeText was found
-                index = mf.index(ph)
-                for node in reversed(nodes):
-                    mf.insert(index, node)
-                mf.remove(ph)
-            else:
-                mf.extend(nodes)
+    def __append_records(self, body, replacements, lastSection):
+        """
+        Appends a merged copy of the template body for every record. The
+        separator before a record is a copy of ``lastSection``, the section
+        that ends the document, which at that point still belongs to the
+        previous record.
+        """
+        separator, childrenList, mainSection, id_slots, id_spans = self._merged_template
+        labels = self.__locate_labels(childrenList)
+        if labels is not None:
+            return self.__append_labels(body, replacements, lastSection, labels)
+        type, sepClass = separator.split("_")
+        stored = self._template_part.getroot()
+        start = int(stored.get('records', '0'))
+        count = 0
+        headers = self.__section_headers()
+        size = _tree_size(childrenList)
+        self.__reserve(size, replacements)
+        for i, repl in enumerate(replacements, start):
+            self.__grow(size)
+            if i > 0:
+                body.append(self.__separator(type, sepClass, lastSection))
+            parts = []
+            for n in childrenList:
+                element = deepcopy(n)
+                body.append(element)
+                parts.append(element)
+            if i > 0:
+                self.__renumber_ids(parts, i, id_slots, id_spans)
+            self.__merge(parts, repl, i)
+            if sepClass == 'section':
+                self.__merge_section_parts(parts, lastSection, mainSection, repl, headers)
+            count += 1
+            self.__tick('records', count)
+        stored.set('records', str(start + count))
 
-    def merge_rows(self, anchor, rows):
-        table, idx, template = self.__find_row_anchor(anchor)
-        if table is not None:
-            if len(rows) > 0:
-                del table[idx]
-                for i, row_data in enumerate(rows):
-                    row = deepcopy(template)
-                    self.merge([row], **row_data)
-                    table.insert(idx + i, row)
-            else:
-                # if there is no data for a given table
-                # we check whether table needs to be removed
-                if self.remove_empty_tables:
-                    parent = table.getparent()
-                    parent.remove(table)
+    @staticmethod
+    def __locate_labels(childrenList):
+        """
+        Splits the merge fields of the template body of a label sheet into
+        slots: the fields before the first NEXT or NEXTIF field, and those
+        after each of them. Returns, per slot, the path of the field that
+        starts it and its condition (None for the first slot), and the name
+        and path of each of its merge fields. None if there are no NEXT
+        fields.
+        """
+        slots = [(None, None, [])]
+        for j, child in enumerate(childrenList):
+            for element in child.iter('MergeField', 'NextRecord'):
+                path = (j,) + _element_path(child, element)
+                if element.tag == 'NextRecord':
+                    condition = None
+                    if element.get('operator') is not None:
+                        condition = (element.get('field'), element.get('operator'), element.get('value'))
+                    slots.append((path, condition, []))
+                else:
+                    slots[-1][2].append((element.get('name'), path))
+        return slots if len(slots) > 1 else None
 
-    def __find_row_anchor(self, field, parts=None):
-        if not parts:
-            parts = self.parts.values()
-        for part in parts:
-            for table in part.findall('.//{%(w)s}tbl' % NAMESPACES):
-                for idx, row in enumerate(table):
-                    if row.find('.//MergeField[@name="%s"]' % field) is not None:
-                        return table, idx, row
-        return None, None, None
+    def __append_labels(self, body, replacements, lastSection, slots):
+        """
+        Like __append_records, for a label sheet: every copy of the template
+        body takes successive records, moving on to the next record at each
+        NEXT field and at each NEXTIF field whose condition holds for the
+        current record, and at the end of the copy. Fields are found by the
+        paths in ``slots``, located once. Slots left over on the last copy
+        stay empty.
+        """
+        separator, childrenList, mainSection, id_slots, id_spans = self._merged_template
+        type, sepClass = separator.split("_")
+        stored = self._template_part.getroot()
+        # copies, rather than records, number the IDs and are counted for append_templates
+        i = int(stored.get('records', '0'))
+        records = iter(replacements)
+        repl = next(records, None)
+        count = 0
+        headers = self.__section_headers()
+        size = _tree_size(childrenList)
+        while repl is not None:
+            self.__grow(size)
+            if i > 0:
+                body.append(self.__separator(type, sepClass, lastSection))
+            parts = []
+            for n in childrenList:
+                element = deepcopy(n)
+                body.append(element)
+                parts.append(element)
+            if i > 0:
+                self.__renumber_ids(parts, i, id_slots, id_spans)
+            first = repl
+            located = [(_resolve_path(parts, path) if path is not None else None, condition,
+                        [(name, _resolve_path(parts, field_path)) for name, field_path in fields])
+                       for path, condition, fields in slots]
+            for marker, condition, fields in located:
+                if marker is not None:
+                    marker.getparent().remove(marker)
+                    if repl is not None and (condition is None or _compare(repl, condition)):
+                        count += 1
+                        self.__tick('records', count)
+                        repl = next(records, None)
+                if repl is None:
+                    continue
+                values = self.__sanitize(repl, count)
+                for name, mf in fields:
+                    if name in values and not _is_row_source(values[name]):
+                        self.__fill_field(mf, values[name])
+            if sepClass == 'section':
+                self.__merge_section_parts(parts, lastSection, mainSection, first, headers)
+            if repl is not None:
+                count += 1
+                self.__tick('records', count)
+                repl = next(records, None)
+            i += 1
+        stored.set('records', str(i))
 
-    def __enter__(self):
-        return self
+    def __append_records_parallel(self, body, replacements, lastSection, processes, chunk_size):
+        """
+        Like __append_records, with the copies of the template body merged in
+        worker processes. Workers return each record's copy serialized, with
+        the notes, images and drawings it added; separators, header and
+        footer parts and relationships are added here, in record order, so
+        that the result is the same as a serial merge.
+        """
+        from concurrent.futures import ProcessPoolExecutor
 
-    def __exit__(self, type, value, traceback):
-        self.close()
+        separator, childrenList, mainSection, id_slots, id_spans = self._merged_template
+        if self.__locate_labels(childrenList) is not None:
+            # records are spread over label sheets, which are filled in order
+            return self.__append_records(body, replacements, lastSection)
+        stored = self._template_part.getroot()
+        start = int(stored.get('records', '0'))
+        container = Element(body.tag, nsmap=body.getroottree().getroot().nsmap)
+        container.extend(deepcopy(n) for n in childrenList)
+        template = (etree.tostring(container), id_slots, id_spans)
+        size = _tree_size(childrenList)
+        self.__reserve(size, replacements)
 
-    def close(self):
-        if self.zip is not None:
-            try:
-                self.zip.close()
-            finally:
-                self.zip = None
+        replacements = iter(replacements)
+        chunks = iter(lambda: list(islice(replacements, chunk_size)), [])
+        headers = self.__section_headers()
+        pending = deque()
+        count = 0
+        with ProcessPoolExecutor(processes, initializer=_init_fragment_worker,
+                                 initargs=(self._snapshot(), template)) as executor:
+            for chunk in chunks:
+                offset = start + count + sum(len(records) for records, _ in pending)
+                pending.append((chunk, executor.submit(_render_worker_fragments, offset, chunk)))
+                while pending and (len(pending) >= 2 * processes or pending[0][1].done()):
+                    records, future = pending.popleft()
+                    for repl, fragment in zip(records, future.result()):
+                        self.__grow(size)
+                        self.__splice_record(body, lastSection, start + count, repl, fragment, headers)
+                        count += 1
+                        self.__tick('records', count)
+            while pending:
+                records, future = pending.popleft()
+                for repl, fragment in zip(records, future.result()):
+                    self.__grow(size)
+                    self.__splice_record(body, lastSection, start + count, repl, fragment, headers)
+                    count += 1
+                    self.__tick('records', count)
+        stored.set('records', str(start + count))
+
+    def __splice_record(self, body, lastSection, index, repl, fragment, headers):
+        separator, childrenList, mainSection, id_slots, id_spans = self._merged_template
+        type, sepClass = separator.split("_")
+        xml, images, drawings, notes, hyperlinks = fragment
+        if index > 0:
+            body.append(self.__separator(type, sepClass, lastSection))
+        parts = list(etree.fromstring(xml))
+        body.extend(parts)
+
+        # relationships of the worker are added to this package in the same order
+        document_name = self.__document_part_name()
+        embeds = dict((rid, self.__image_relationship(document_name, Image(data))) for rid, data in images)
+        if embeds:
+            for part in parts:
+                for blip in part.iter('{%(a)s}blip' % NAMESPACES):
+                    rid = blip.get('{%(r)s}embed' % NAMESPACES)
+                    if rid in embeds:
+                        blip.set('{%(r)s}embed' % NAMESPACES, embeds[rid])
+        links = dict((rid, self.__hyperlink_relationship(document_name, url)) for rid, url in hyperlinks)
+        if links:
+            for part in parts:
+                for hyperlink in part.iter('{%(w)s}hyperlink' % NAMESPACES):
+                    rid = hyperlink.get('{%(r)s}id' % NAMESPACES)
+                    if rid in links:
+                        hyperlink.set('{%(r)s}id' % NAMESPACES, links[rid])
+        if drawings:
+            doc_prs = [doc_pr for part in parts for doc_pr in part.iter(DRAWING_TAG)]
+            self._drawings.extend(doc_prs[k] for k in drawings)
+        for kind, notes_xml in notes:
+            self.__notes_part(kind).getroot().extend(list(etree.fromstring(notes_xml)))
+
+        if sepClass == 'section':
+            self.__merge_section_parts(parts, lastSection, mainSection, repl, headers)
+
+    def _render_fragments(self, template, start, records):
+        """
+        Worker side of a parallel merge_templates: merges a copy of the
+        template body for each of ``records``, numbered from ``start``.
+        Returns, per record, the merged copy serialized in a container
+        element and what it added to the package: (relationship id, data)
+        of every merged image it refers to, the positions of new drawings,
+        new notes and (relationship id, URL) of every merged hyperlink it
+        refers to. Images and hyperlinks are listed whether the record or an
+        earlier one added them, since the relationship ids of this worker
+        differ from those of the document the copies are spliced into.
+        """
+        xml, id_slots, id_spans = template
+        container = etree.fromstring(xml)
+        notes_roots = []
+        for kind in sorted(NOTE_PARTS):
+            part = self.__notes_part(kind) if kind in id_spans else None
+            if part is not None:
+                notes_roots.append((kind, part.getroot()))
+
+        document_name = self.__document_part_name()
+        results = []
+        for i, repl in enumerate(records, start):
+            notes_before = [len(root) for _, root in notes_roots]
+            drawings_before = len(self._drawings)
+
+            record = Element(container.tag, nsmap=container.nsmap)
+            record.extend(deepcopy(n) for n in container)
+            parts = list(record)
+            if i > 0:
+                self.__renumber_ids(parts, i, id_slots, id_spans)
+            self.__merge(parts, repl, i)
+
+            media = dict((rid, digest) for (name, digest), rid in self._media_relationships.items()
+                         if name == document_name)
+            images = []
+            for rid in _unique(blip.get('{%(r)s}embed' % NAMESPACES)
+                               for blip in record.iter('{%(a)s}blip' % NAMESPACES)):
+                if rid in media:
+                    prefix = 'word/media/%s.' % media[rid][:32]
+                    images.extend((rid, data) for name, data in self._binary_parts.items()
+                                  if name.startswith(prefix))
+            urls = dict((rid, url) for (name, url), rid in self._hyperlink_relationships.items()
+                        if name == document_name)
+            hyperlinks = [(rid, urls[rid]) for rid in
+                          _unique(hyperlink.get('{%(r)s}id' % NAMESPACES)
+                                  for hyperlink in record.iter('{%(w)s}hyperlink' % NAMESPACES))
+                          if rid in urls]
+            ours = set(self._drawings[drawings_before:])
+            drawings = [k for k, doc_pr in enumerate(record.iter(DRAWING_TAG)) if doc_pr in ours]
+            notes = []
+            for (kind, root), before in zip(notes_roots, notes_before):
+                if len(root) > before:
+                    added = Element(root.tag, nsmap=root.nsmap)
+                    added.extend(deepcopy(note) for note in root[before:])
+                    notes.append((kind, etree.tostring(added)))
+            results.append((etree.tostring(record), images, drawings, notes, hyperlinks))
+        return results
+
+    def __merge_section_parts(self, parts, lastSection, mainSection, repl, headers):
+        """
+        Points the header and footer references of a record's sections at
+        parts merged with the record. Records producing identical content
+        share a single part; ``headers`` maps that content to its relation.
+        """
+        rid = '{%(r)s}id' % NAMESPACES
+
+        # the last section is shared by consecutive records, reset it to the template's references
+        for reference, template_reference in zip(lastSection.iter(*SECTION_REFERENCES),
+                                                 mainSection.iter(*SECTION_REFERENCES)):
+            reference.set(rid, template_reference.get(rid))
+
+        # tables are only merged in the body
+        repl = dict((field, value) for field, value in repl.items() if not _is_row_source(value))
+        sections = [lastSection]
+        for element in parts:
+            sections.extend(element.iterfind('w:pPr/w:sectPr', namespaces=NAMESPACES))
+        for section in sections:
+            for reference in section.iter(*SECTION_REFERENCES):
+                reference.set(rid, self.__merged_section_part(reference.get(rid), repl, headers))
+
+    def __section_headers(self):
+        """
+        Header and footer parts merged so far, by template relation and
+        content digest, kept with the template for append_templates.
+        """
+        return dict(((header.get('rid'), header.get('digest')), header.get('target'))
+                    for header in self._template_part.getroot().iterfind('{%(mm)s}header' % NAMESPACES))
+
+    def __merged_section_part(self, rid, repl, headers):
+        document_name = self.__document_part_name()
+        relationship = self.__relationship(document_name, rid)
+        if relationship is None:
+            return rid
+        name = posixpath.normpath(posixpath.join(posixpath.dirname(document_name), relationship.get('Target')))
+        template = self._section_templates.get(name)
+        if template is None:
+            return rid
+
+        root = deepcopy(template)
+        # relationships added while merging go to the template part, and are copied below
+        self._part_names[root] = name
+        self.merge([root], **repl)
+        # conditions on fields the record lacks are false, as in __merge_remaining
+        if self._conditional:
+            self.__resolve_conditions([root], repl, final=True)
+        for field in self.get_merge_fields([root]):
+            self.merge([root], **{field: ''})
+        key = (rid, hashlib.sha1(_canonical_xml(root)).hexdigest())
+        if key not in headers:
+            tag = 'header' if root.tag == '{%(w)s}hdr' % NAMESPACES else 'footer'
+            new_name = self.__new_part_name(posixpath.join(posixpath.dirname(name), tag + '%d.xml'))
+            self._xml_parts[new_name] = etree.ElementTree(root)
+            template_rels = self.__xml_part(self.__rels_name(name))
+            if template_rels is not None:
+                self._xml_parts[self.__rels_name(new_name)] = deepcopy(template_rels)
+            self.__add_override(new_name, CONTENT_TYPE_HEADER if tag == 'header' else CONTENT_TYPE_FOOTER)
+            headers[key] = self.__add_relationship(
+                document_name, relationship.get('Type'), posixpath.relpath(new_name, posixpath.dirname(document_name)))
+            etree.SubElement(self._template_part.getroot(), '{%(mm)s}header' % NAMESPACES,
+                             rid=rid, digest=key[1], target=headers[key])
+        return headers[key]
+
+    def __document_part_name(self):
+        for zi, part in self.parts.items():
+            if part.getroot().tag == '{%(w)s}document' % NAMESPACES:
+                return zi.filename
+
+    @staticmethod
+    def __rels_name(name):
+        folder, filename = posixpath.split(name)
+        return posixpath.join(folder, '_rels', filename + '.rels')
+
+    def __part_rels(self, name):
+        """
+        Relationships of the part ``name``, created if the part has none yet.
+        """
+        rels_name = self.__rels_name(name)
+        rels = self.__xml_part(rels_name)
+        if rels is None:
+            rels = etree.ElementTree(Element('{%(pr)s}Relationships' % NAMESPACES, nsmap={None: NAMESPACES['pr']}))
+            self._xml_parts[rels_name] = rels
+        return rels
+
+    def __relationship(self, name, rid):
+        for relationship in self.__part_rels(name).getroot():
+            if relationship.get('Id') == rid:
+                return relationship
+        return None
+
+    def __add_relationship(self, name, type, target, external=False):
+        root = self.__part_rels(name).getroot()
+        ids = set(relationship.get('Id') for relationship in root)
+        number = len(ids) + 1
+        while 'rId%d' % number in ids:
+            number += 1
+        relationship = etree.SubElement(root, '{%(pr)s}Relationship' % NAMESPACES)
+        relationship.set('Id', 'rId%d' % number)
+        relationship.set('Type', type)
+        relationship.set('Target', target)
+        if external:
+            relationship.set('TargetMode', 'External')
+        return 'rId%d' % number
+
+    def __add_override(self, name, content_type):
+        override = etree.SubElement(self._content_types.getroot(), '{%(ct)s}Override' % NAMESPACES)
+        override.set('PartName', '/' + name)
+        override.set('ContentType', content_type)
+        self._xml_parts[CONTENT_TYPES_NAME] = self._content_types
+
+    def __add_default(self, extension, content_type):
+        root = self._content_types.getroot()
+        for default in root.findall('{%(ct)s}Default' % NAMESPACES):
+            if default.get('Extension', '').lower() == extension:
+                return
+        default = Element('{%(ct)s}Default' % NAMESPACES, Extension=extension, ContentType=content_type)
+        root.insert(0, default)
+        self._xml_parts[CONTENT_TYPES_NAME] = self._content_types
+
+    def __new_part_name(self, pattern):
+        existing = set(self.zip.namelist()) | set(self._xml_parts)
+        number = 1
+        while pattern % number in existing:
+            number += 1
+        return pattern % number
+
+    @staticmethod
+    def __separator(type, sepClass, mainSection):
+        p = Element('{%(w)s}p' % NAMESPACES)
+        if sepClass == 'section':
+            pPr = etree.SubElement(p, '{%(w)s}pPr' % NAMESPACES)
+            pPr.append(deepcopy(mainSection))
+        else:
+            r = etree.SubElement(p, '{%(w)s}r' % NAMESPACES)
+            nbreak = etree.SubElement(r, '{%(w)s}br' % NAMESPACES)
+            nbreak.attrib['{%(w)s}type' % NAMESPACES] = type
+        return p
+
+    def __store_template(self, separator, childrenList, mainSection, appendable):
+        id_slots = self.__locate_ids(childrenList)
+        id_spans = self.__id_spans(childrenList, id_slots)
+        self._merged_template = (separator, childrenList, mainSection, id_slots, id_spans)
+
+        root = Element('{%(mm)s}template' % NAMESPACES, nsmap={'mm': NAMESPACES['mm'], 'w': NAMESPACES['w']})
+        root.set('separator', separator)
+        root.set('records', '0')
+        root.set('idSpans', ' '.join('%s=%d' % item for item in sorted(id_spans.items())))
+        body = etree.SubElement(root, '{%(w)s}body' % NAMESPACES)
+        body.extend(deepcopy(n) for n in childrenList)
+        body.append(deepcopy(mainSection))
+        # headers and footers are merged per record from their unmerged content, kept for append_templates too
+        self._section_templates = {}
+        if separator.endswith('_section'):
+            for zi, part in self.parts.items():
+                if part.getroot().tag in SECTION_PART_TAGS and part.find('.//MergeField') is not None:
+                    stored = etree.SubElement(root, '{%(mm)s}part' % NAMESPACES, name=zi.filename)
+                    stored.append(deepcopy(part.getroot()))
+                    self._section_templates[zi.filename] = stored[0]
+        self._template_part = etree.ElementTree(root)
+        if appendable:
+            self._xml_parts[TEMPLATE_PART] = self._template_part
+
+    def __load_template(self):
+        self._template_part = self._xml_parts[TEMPLATE_PART]
+        root = self._template_part.getroot()
+        children = list(root.find('w:body', namespaces=NAMESPACES))
+        childrenList = children[:-1]
+        id_spans = dict((kind, int(span)) for kind, span in
+                        (item.split('=') for item in root.get('idSpans', '').split()))
+        self._section_templates = dict((stored.get('name'), stored[0])
+                                       for stored in root.iterfind('{%(mm)s}part' % NAMESPACES))
+        self._merged_template = (root.get('separator'), childrenList, children[-1],
+                                 self.__locate_ids(childrenList), id_spans)
+
+    @staticmethod
+    def __id_kind(element):
+        tag = element.tag
+        if tag in NOTE_REFERENCES:
+            return NOTE_REFERENCES[tag], ANNOTATION_ID
+        if tag == DRAWING_TAG:
+            return 'drawing', 'id'
+        if ANNOTATION_ID in element.attrib:
+            return 'annotation', ANNOTATION_ID
+        return None, None
+
+    @classmethod
+    def __locate_ids(cls, childrenList):
+        """
+        Finds the attributes holding document-unique IDs in the template body,
+        as (child index, child path, attribute, kind, value), so copies can be
+        renumbered without searching them.
+        """
+        slots = []
+        for j, child in enumerate(childrenList):
+            for element in child.iter(tag=etree.Element):
+                kind, attribute = cls.__id_kind(element)
+                if kind is None:
+                    continue
+                try:
+                    value = int(element.get(attribute))
+                except (TypeError, ValueError):
+                    continue
+                path = []
+                node = element
+                while node is not child:
+                    parent = node.getparent()
+                    path.append(parent.index(node))
+                    node = parent
+                slots.append((j, tuple(reversed(path)), attribute, kind, value))
+        return slots
+
+    def __id_spans(self, childrenList, id_slots):
+        """
+        For each kind of ID in the template, one more than the highest ID in
+        use. Copy i adds i times the span, so its IDs never collide with those
+        of other copies, headers and footers, or notes.
+        """
+        highest = {}
+        kinds = set(slot[3] for slot in id_slots)
+        for kind in kinds & {'annotation', 'drawing'}:
+            tag = DRAWING_TAG if kind == 'drawing' else etree.Element
+            attribute = 'id' if kind == 'drawing' else ANNOTATION_ID
+            for tree in chain([part.getroot() for part in self.parts.values()], childrenList):
+                for element in tree.iter(tag=tag):
+                    if self.__id_kind(element)[0] != kind:
+                        continue
+                    try:
+                        highest[kind] = max(highest.get(kind, 0), int(element.get(attribute)))
+                    except (TypeError, ValueError):
+                        continue
+        for kind in kinds & set(NOTE_PARTS):
+            notes = self.__notes_part(kind)
+            if notes is None:
+                continue
+            for note in notes.getroot().iter(NOTE_PARTS[kind][1]):
+                try:
+                    highest[kind] = max(highest.get(kind, 0), int(note.get(ANNOTATION_ID)))
+                except (TypeError, ValueError):
+                    continue
+        return dict((kind, value + 1) for kind, value in highest.items())
+
+    def __renumber_ids(self, parts, index, id_slots, id_spans):
+        copied = set()
+        for j, path, attribute, kind, value in id_slots:
+            span = id_spans.get(kind)
+            if span is None:
+                continue
+            element = parts[j]
+            for k in path:
+                element = element[k]
+            new_value = value + index * span
+            element.set(attribute, str(new_value))
+
+            if kind in NOTE_PARTS and (kind, value) not in copied:
+                # the reference gets its own copy of the footnote, endnote or comment
+                copied.add((kind, value))
+                notes = self.__notes_part(kind).getroot()
+                note = notes.find('%s[@%s="%d"]' % (NOTE_PARTS[kind][1], ANNOTATION_ID, value))
+                if note is not None:
+                    note = deepcopy(note)
+                    note.set(ANNOTATION_ID, str(new_value))
+                    notes.append(note)
+
+    def __notes_part(self, kind):
+        name = self.__typed_part_name(NOTE_PARTS[kind][0])
+        return self.__xml_part(name) if name is not None else None
+
+    def __typed_part_name(self, content_type):
+        for override in self._content_types.findall('{%(ct)s}Override' % NAMESPACES):
+            if override.get('ContentType') == content_type:
+                return override.get('PartName').split('/', 1)[1]
+        return None
+
+    def __xml_part(self, filename):
+        """
+        Parses a package part for modification; it is serialized on write.
+        """
+        if filename not in self._xml_parts:
+            if filename not in self.zip.namelist():
+                return None
+            self._xml_parts[filename] = self.__parse(filename)
+        return self._xml_parts[filename]
+
+    def _append_document(self, other, suffix):
+        """
+        Appends the body of ``other``, another loaded document, as new
+        sections after the body of this one. The parts it refers to, such as
+        images, headers and footers, are copied along with its notes and
+        comments. Its styles and numbering definitions are added to those of
+        this document; styles that differ from one with the same ID here are
+        renamed with ``suffix``. Merge fields are kept, to be merged later.
+        """
+        document_name = self.__document_part_name()
+        other_name = other.__document_part_name()
+        root = self.__xml_part_tree(document_name).getroot()
+        other_root = other.__xml_part_tree(other_name).getroot()
+        body = root.find('w:body', namespaces=NAMESPACES)
+        content = [deepcopy(child) for child in other_root.find('w:body', namespaces=NAMESPACES)]
+
+        # parts the whole document refers to, when this document has none of them
+        imported = {}
+        for content_type in (CONTENT_TYPE_STYLES, CONTENT_TYPE_NUMBERING) + tuple(
+                content_type for content_type, _ in NOTE_PARTS.values()):
+            if self.__typed_part_name(content_type) is None and other.__typed_part_name(content_type) is not None:
+                self.__import_document_part(other, other.__typed_part_name(content_type), imported)
+        numbers = self.__import_numbering(other, imported)
+        styles = self.__import_styles(other, suffix, numbers, imported)
+        self.__import_notes(other, content, imported)
+        self.__offset_ids(content)
+
+        relationships = {}
+        rids = set(value for element in content for node in element.iter(tag=etree.Element)
+                   for attribute, value in node.attrib.items() if attribute.startswith('{%(r)s}' % NAMESPACES))
+        for rid in sorted(rids):
+            relationship = other.__relationship(other_name, rid)
+            if relationship is None:
+                continue
+            if relationship.get('TargetMode') == 'External':
+                relationships[rid] = self.__add_relationship(
+                    document_name, relationship.get('Type'), relationship.get('Target'), external=True)
+            else:
+                relationships[rid] = self.__import_document_part(
+                    other, posixpath.normpath(posixpath.join(posixpath.dirname(other_name),
+                                                             relationship.get('Target'))), imported,
+                    relationship.get('Type'))
+        for element in content:
+            self.__map_references(element, styles, numbers, relationships)
+
+        # paragraphs without a style keep the default style of other, if it was renamed
+        default = styles.get(other.__default_paragraph_style())
+        if default is not None:
+            for paragraph in (p for element in content for p in element.iter(PARAGRAPH_TAG)):
+                properties = paragraph.find('w:pPr', namespaces=NAMESPACES)
+                if properties is None:
+                    properties = Element('{%(w)s}pPr' % NAMESPACES)
+                    paragraph.insert(0, properties)
+                if properties.find('w:pStyle', namespaces=NAMESPACES) is None:
+                    properties.insert(0, Element('{%(w)s}pStyle' % NAMESPACES, {'{%(w)s}val' % NAMESPACES: default}))
+
+        # the last section of this document now ends in a paragraph, the last section of other ends the body
+        section = body.find('w:sectPr', namespaces=NAMESPACES)
+        if section is not None:
+            paragraph = etree.SubElement(body, '{%(w)s}p' % NAMESPACES)
+            etree.SubElement(paragraph, '{%(w)s}pPr' % NAMESPACES).append(section)
+        body.extend(content)
+        self._conditional = self.__has_conditions()
+
+    def __xml_part_tree(self, name):
+        for zi, part in self.parts.items():
+            if zi.filename == name:
+                return part
+        return self.__xml_part(name)
+
+    def __import_document_part(self, other, name, imported, type=None):
+        """
+        Copies the part ``name`` of ``other`` and relates it to this
+        document, with the type of the relationship from ``other``'s
+        document. Returns the relationship ID.
+        """
+        other_name = other.__document_part_name()
+        if type is None:
+            for relationship in other.__part_rels(other_name).getroot():
+                target = posixpath.normpath(posixpath.join(posixpath.dirname(other_name), relationship.get('Target')))
+                if relationship.get('TargetMode') != 'External' and target == name:
+                    type = relationship.get('Type')
+        document_name = self.__document_part_name()
+        new_name = self.__import_part(other, name, imported)
+        target = posixpath.relpath(new_name, posixpath.dirname(document_name))
+        return self.__add_relationship(document_name, type, target)
+
+    def __import_part(self, other, name, imported):
+        """
+        Copies the part ``name`` of ``other`` into this package, with its
+        relationships and the parts they point to, and returns its name
+        here. XML parts get a new numbered name, binary parts a name from
+        their content hash. ``imported`` maps the parts already copied.
+        """
+        if name in imported:
+            return imported[name]
+        folder, filename = posixpath.split(name)
+        stem, extension = posixpath.splitext(filename)
+        content_types = other.__content_type_map()
+        content_type = content_types['override'].get('/' + name.lower()) or \
+            content_types['default'].get(extension[1:].lower())
+        part = next((tree for zi, tree in other.parts.items() if zi.filename == name), None)
+        if part is None and not (content_type or extension).endswith('xml'):
+            data = other._binary_parts.get(name) or other.zip.read(name)
+            new_name = posixpath.join(folder, '%s%s' % (hashlib.sha256(data).hexdigest()[:32], extension))
+            self._binary_parts[new_name] = data
+            if content_type is not None:
+                self.__add_default(extension[1:].lower(), content_type)
+        else:
+            new_name = self.__new_part_name(posixpath.join(folder, stem.rstrip('0123456789') + '%d' + extension))
+            tree = etree.ElementTree(deepcopy((part if part is not None else other.__xml_part(name)).getroot()))
+            self._xml_parts[new_name] = tree
+            if part is not None:
+                # merged like the parts of this document
+                self.parts[ZipInfo(new_name)] = tree
+            if content_type is not None:
+                self.__add_override(new_name, content_type)
+        imported[name] = new_name
+
+        rels = other.__xml_part(self.__rels_name(name))
+        if rels is not None:
+            rels = deepcopy(rels)
+            for relationship in rels.getroot():
+                if relationship.get('TargetMode') != 'External':
+                    target = posixpath.normpath(posixpath.join(folder, relationship.get('Target')))
+                    relationship.set('Target', posixpath.relpath(self.__import_part(other, target, imported),
+                                                                 posixpath.dirname(new_name)))
+            self._xml_parts[self.__rels_name(new_name)] = rels
+        return new_name
+
+    def __import_numbering(self, other, imported):
+        """
+        Adds the numbering definitions of ``other`` to those of this
+        document under new IDs. Returns the new IDs of its numbering
+        instances, by their ID in ``other``.
+        """
+        name = self.__typed_part_name(CONTENT_TYPE_NUMBERING)
+        other_name = other.__typed_part_name(CONTENT_TYPE_NUMBERING)
+        if name is None or other_name is None or other_name in imported:
+            return {}
+        root = self.__xml_part(name).getroot()
+        other_root = other.__xml_part(other_name).getroot()
+        abstract_id = '{%(w)s}abstractNumId' % NAMESPACES
+        num_id = '{%(w)s}numId' % NAMESPACES
+
+        def highest(tag, attribute):
+            return max([0] + [int(element.get(attribute)) for element in root.iterfind(tag)
+                              if element.get(attribute, '').isdigit()])
+
+        def insert(element, before):
+            # abstract definitions come before the instances, and both before numIdMacAtCleanup
+            following = root.find(before)
+            if following is None:
+                following = root.find('{%(w)s}numIdMacAtCleanup' % NAMESPACES)
+            if following is not None:
+                following.addprevious(element)
+            else:
+                root.append(element)
+
+        abstracts = {}
+        next_abstract = highest('{%(w)s}abstractNum' % NAMESPACES, abstract_id) + 1
+        for abstract in other_root.iterfind('{%(w)s}abstractNum' % NAMESPACES):
+            copy = deepcopy(abstract)
+            abstracts[abstract.get(abstract_id)] = str(next_abstract)
+            copy.set(abstract_id, str(next_abstract))
+            next_abstract += 1
+            insert(copy, '{%(w)s}num' % NAMESPACES)
+
+        numbers = {}
+        next_num = highest('{%(w)s}num' % NAMESPACES, num_id) + 1
+        for num in other_root.iterfind('{%(w)s}num' % NAMESPACES):
+            copy = deepcopy(num)
+            numbers[num.get(num_id)] = str(next_num)
+            copy.set(num_id, str(next_num))
+            next_num += 1
+            reference = copy.find('{%(w)s}abstractNumId' % NAMESPACES)
+            if reference is not None and reference.get('{%(w)s}val' % NAMESPACES) in abstracts:
+                reference.set('{%(w)s}val' % NAMESPACES, abstracts[reference.get('{%(w)s}val' % NAMESPACES)])
+            insert(copy, '{%(w)s}numIdMacAtCleanup' % NAMESPACES)
+        return numbers
+
+    def __import_styles(self, other, suffix, numbers, imported):
+        """
+        Adds the styles of ``other`` this document does not have. A style
+        that differs from the one with the same ID here is added under a
+        new ID. Returns the new IDs by the ID in ``other``.
+        """
+        name = self.__typed_part_name(CONTENT_TYPE_STYLES)
+        other_name = other.__typed_part_name(CONTENT_TYPE_STYLES)
+        if name is None or other_name is None or other_name in imported:
+            return {}
+        root = self.__xml_part(name).getroot()
+        other_root = other.__xml_part(other_name).getroot()
+        style_id = '{%(w)s}styleId' % NAMESPACES
+        existing = dict((style.get(style_id), style) for style in root.iterfind('{%(w)s}style' % NAMESPACES))
+        renamed = {}
+        copies = []
+        for style in other_root.iterfind('{%(w)s}style' % NAMESPACES):
+            sid = style.get(style_id)
+            if sid in existing:
+                if _canonical_xml(existing[sid]) == _canonical_xml(style):
+                    continue
+                new_id = sid + suffix
+                while new_id in existing:
+                    new_id += suffix
+                renamed[sid] = new_id
+                existing[new_id] = style
+            copies.append(deepcopy(style))
+        for copy in copies:
+            if copy.get(style_id) in renamed:
+                copy.set(style_id, renamed[copy.get(style_id)])
+                copy.attrib.pop('{%(w)s}default' % NAMESPACES, None)
+                style_name = copy.find('{%(w)s}name' % NAMESPACES)
+                if style_name is not None:
+                    style_name.set('{%(w)s}val' % NAMESPACES, style_name.get('{%(w)s}val' % NAMESPACES, '') + suffix)
+            self.__map_references(copy, renamed, numbers, {})
+            root.append(copy)
+        return renamed
+
+    def __default_paragraph_style(self):
+        name = self.__typed_part_name(CONTENT_TYPE_STYLES)
+        if name is None:
+            return None
+        for style in self.__xml_part(name).getroot().iterfind('{%(w)s}style' % NAMESPACES):
+            if style.get('{%(w)s}type' % NAMESPACES) == 'paragraph' and \
+                    style.get('{%(w)s}default' % NAMESPACES) in ('1', 'true', 'on'):
+                return style.get('{%(w)s}styleId' % NAMESPACES)
+        return None
+
+    def __import_notes(self, other, content, imported):
+        """
+        Copies the footnotes, endnotes and comments ``content`` refers to
+        from ``other`` under new IDs, unless their whole part was imported.
+        """
+        copied = {}
+        for element in content:
+            for reference in element.iter(*NOTE_REFERENCES):
+                kind = NOTE_REFERENCES[reference.tag]
+                name = other.__typed_part_name(NOTE_PARTS[kind][0])
+                if name is None or name in imported:
+                    continue
+                key = (kind, reference.get(ANNOTATION_ID))
+                if key not in copied:
+                    notes = self.__notes_part(kind).getroot()
+                    note = other.__notes_part(kind).getroot().find(
+                        '%s[@%s="%s"]' % (NOTE_PARTS[kind][1], ANNOTATION_ID, key[1]))
+                    copied[key] = str(max([0] + [int(n.get(ANNOTATION_ID)) for n in notes.iter(NOTE_PARTS[kind][1])
+                                                 if n.get(ANNOTATION_ID, '').lstrip('-').isdigit()]) + 1)
+                    if note is not None:
+                        note = deepcopy(note)
+                        note.set(ANNOTATION_ID, copied[key])
+                        notes.append(note)
+                reference.set(ANNOTATION_ID, copied[key])
+
+    def __offset_ids(self, content):
+        """
+        Moves the annotation and drawing IDs in ``content`` above those in
+        use in this document.
+        """
+        highest = {'annotation': 0, 'drawing': 0}
+        for part in self.parts.values():
+            for element in part.getroot().iter(tag=etree.Element):
+                kind, attribute = self.__id_kind(element)
+                if kind in highest and element.get(attribute, '').isdigit():
+                    highest[kind] = max(highest[kind], int(element.get(attribute)))
+        for element in content:
+            for node in element.iter(tag=etree.Element):
+                kind, attribute = self.__id_kind(node)
+                if kind in highest and node.get(attribute, '').isdigit():
+                    node.set(attribute, str(int(node.get(attribute)) + highest[kind] + 1))
+
+    @staticmethod
+    def __map_references(element, styles, numbers, relationships):
+        for node in element.iter(tag=etree.Element):
+            if node.tag in STYLE_REFERENCES:
+                if node.get('{%(w)s}val' % NAMESPACES) in styles:
+                    node.set('{%(w)s}val' % NAMESPACES, styles[node.get('{%(w)s}val' % NAMESPACES)])
+            elif node.tag == '{%(w)s}numId' % NAMESPACES:
+                if node.get('{%(w)s}val' % NAMESPACES) in numbers:
+                    node.set('{%(w)s}val' % NAMESPACES, numbers[node.get('{%(w)s}val' % NAMESPACES)])
+            elif relationships:
+                for attribute, value in node.attrib.items():
+                    if attribute.startswith('{%(r)s}' % NAMESPACES) and value in relationships:
+                        node.set(attribute, relationships[value])
+
+    def merge_templates_sharded(self, replacements, separator, output, shard_size=1000, processes=None):
+        """
+        Splits the records into shards of at most ``shard_size`` records and
+        writes each shard to its own document with merge_templates. Shards
+        are rendered in ``processes`` worker processes (one per CPU by
+        default, in this process if 1), each starting from this loaded
+        template. Records are consumed lazily, a few shards ahead of the
+        workers.
+
+        ``output`` names the file of each shard: a format string given the
+        shard index, such as ``'letters-{:04d}.docx'``, or a function.
+        Returns a list of (file name, record count) in shard order. Worker
+        processes need Python 3.7 or later; use processes=1 on older versions.
+        """
+        if separator not in SEPARATORS:
+            raise ValueError("Invalid separator argument")
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        name = output.format if isinstance(output, string_types) else output
+        replacements = iter(replacements)
+        shards = iter(lambda: list(islice(replacements, shard_size)), [])
+        snapshot = self._snapshot()
+
+        if processes == 1:
+            return [_render_shard(snapshot, records, separator, name(index))
+                    for index, records in enumerate(shards)]
+
+        from concurrent.futures import ProcessPoolExecutor
+        processes = processes or multiprocessing.cpu_count()
+        manifest = []
+        pending = deque()
+        with ProcessPoolExecutor(processes, initializer=_init_shard_worker, initargs=(snapshot,)) as executor:
+            for index, records in enumerate(shards):
+                pending.append(executor.submit(_render_worker_shard, records, separator, name(index)))
+                if len(pending) >= 2 * processes:
+                    manifest.append(pending.popleft().result())
+            while pending:
+                manifest.append(pending.popleft().result())
+        return manifest
+
+    def merge_pages(self, replacements):
+         """
+         Deprecated method.
+         """
+         warnings.warn("merge_pages has been deprecated in favour of merge_templates",
+                      category=DeprecationWarning,
+                      stacklevel=2)         
+         self.merge_templates(replacements, "page_break")
+
+    def merge(self, parts=None, **replacements):
+        self.__merge(parts, replacements)
+
+    def __merge(self, parts, replacements, record=None):
+        if not parts:
+            parts = self.parts.values()
+
+        replacements = self.__sanitize(replacements, record)
+        if self._conditional:
+            self.__resolve_conditions(parts, replacements)
+        for field, replacement in replacements.items():
+            if _is_row_source(replacement):
+                # only regions and tables within parts, such as the copy of one record's body
+                if not self.__merge_region(field, replacement, None, parts, record):
+                    self.__merge_rows(field, replacement, None, parts, record)
+            else:
+                for part in parts:
+                    self.__merge_field(part, field, replacement)
+
+    def __sanitize(self, replacements, record):
+        """
+        Applies the invalid_characters policy to the text values of a record.
+        All values are checked in a single search, so clean records, by far
+        the most common, cost one pass over their text.
+        """
+        texts = dict((field, _texts(value)) for field, value in replacements.items())
+        values = [text for field_texts in texts.values() for text in field_texts]
+        if not values or INVALID_XML_CHARACTERS.search(u''.join(values)) is None:
+            return replacements
+        sanitized = dict(replacements)
+        for field, value in replacements.items():
+            if INVALID_XML_CHARACTERS.search(u''.join(texts[field])) is not None:
+                if self.invalid_characters == 'raise':
+                    raise InvalidCharacterError(field, record)
+                table = INVALID_XML_TRANSLATIONS[self.invalid_characters]
+                sanitized[field] = value._translate(table) if isinstance(value, RichText) else value.translate(table)
+        return sanitized
+
+    def __merge_field(self, part, field, text):
+        for mf in part.findall('.//MergeField[@name="%s"]' % field):
+            self.__fill_field(mf, text)
+
+    def __fill_field(self, mf, text):
+        children = list(mf)
+        mf.clear()  # clear away the attributes
+        mf.tag = '{%(w)s}r' % NAMESPACES
+        mf.extend(children)
+
+        if isinstance(text, RichText):
+            # runs of their own, in place of the field's run
+            parent = mf.getparent()
+            index = parent.index(mf)
+            parent[index:index + 1] = self.__rich_text_nodes(mf, text)
+            return
+        if isinstance(text, Image):
+            nodes = [self.__image_drawing(mf, text)]
+        else:
+            nodes = self.__text_nodes(text)
+
+        ph = mf.find('MergeText')
+        if ph is not None:
+            # add text nodes at the exact position where
+            # MergeText was found
+            index = mf.index(ph)
+            for node in reversed(nodes):
+                mf.insert(index, node)
+            mf.remove(ph)
+        else:
+            mf.extend(nodes)
+
+    @staticmethod
+    def __text_nodes(text):
+        nodes = []
+        # preserve new lines in replacement text
+        text = text or ''  # text might be None
+        text_parts = str(text).replace('\r', '').split('\n')
+        for i, text_part in enumerate(text_parts):
+            text_node = Element('{%(w)s}t' % NAMESPACES)
+            text_node.text = text_part
+            nodes.append(text_node)
+
+            # if not last node add new line node
+            if i < (len(text_parts) - 1):
+                nodes.append(Element('{%(w)s}br' % NAMESPACES))
+        return nodes
+
+    def __rich_text_nodes(self, run, text):
+        """
+        Builds a run for every segment of ``text``, a RichText, from the run
+        properties of ``run``, the field's run. The properties of every
+        combination of field formatting and segment formatting are built
+        once and copied from then on.
+        """
+        base = run.find('{%(w)s}rPr' % NAMESPACES)
+        base_xml = etree.tostring(base) if base is not None else None
+        nodes = []
+        for segment in text.segments:
+            formatting = segment[1:5] + (segment[5] is not None,)
+            key = (base_xml, formatting)
+            if key not in self._run_properties:
+                self._run_properties[key] = self.__run_properties(base, *formatting)
+            node = Element('{%(w)s}r' % NAMESPACES)
+            if self._run_properties[key] is not None:
+                node.append(deepcopy(self._run_properties[key]))
+            node.extend(self.__text_nodes(segment[0]))
+            if segment[5] is not None:
+                rid = self.__hyperlink_relationship(self.__part_name(run), segment[5])
+                hyperlink = Element('{%(w)s}hyperlink' % NAMESPACES, {'{%(r)s}id' % NAMESPACES: rid})
+                hyperlink.append(node)
+                node = hyperlink
+            nodes.append(node)
+        return nodes
+
+    @staticmethod
+    def __run_properties(base, bold, italic, underline, color, is_hyperlink):
+        properties = deepcopy(base) if base is not None else Element('{%(w)s}rPr' % NAMESPACES)
+        if is_hyperlink:
+            underline = HYPERLINK_UNDERLINE if underline is None else underline
+            color = HYPERLINK_COLOR if color is None else color
+        if underline is True:
+            underline = 'single'
+        elif underline is False:
+            underline = 'none'
+        for name, value in (('b', bold), ('i', italic), ('color', color), ('u', underline)):
+            if value is None:
+                continue
+            tag = '{%s}%s' % (NAMESPACES['w'], name)
+            for existing in properties.findall(tag):
+                properties.remove(existing)
+            # on/off properties are on without a value
+            element = Element(tag)
+            if value is not True:
+                element.set('{%(w)s}val' % NAMESPACES, '0' if value is False else value)
+            order = RUN_PROPERTIES.index(tag)
+            for index, child in enumerate(properties):
+                if child.tag not in RUN_PROPERTIES or RUN_PROPERTIES.index(child.tag) > order:
+                    break
+            else:
+                index = len(properties)
+            properties.insert(index, element)
+        return properties if len(properties) else None
+
+    def __hyperlink_relationship(self, part_name, url):
+        """
+        Relates an external hyperlink to the part once per URL.
+        """
+        key = (part_name, url)
+        if key not in self._hyperlink_relationships:
+            self._hyperlink_relationships[key] = self.__add_relationship(
+                part_name, RELATIONSHIP_TYPE_HYPERLINK, url, external=True)
+        return self._hyperlink_relationships[key]
+
+    def __image_drawing(self, element, image):
+        """
+        Builds an inline drawing of ``image``, embedded from the part that
+        contains ``element``.
+        """
+        rid = self.__image_relationship(self.__part_name(element), image)
+
+        drawing = Element('{%(w)s}drawing' % NAMESPACES)
+        inline = etree.SubElement(drawing, '{%(wp)s}inline' % NAMESPACES, distT='0', distB='0', distL='0', distR='0')
+        etree.SubElement(inline, '{%(wp)s}extent' % NAMESPACES, cx=str(image.width), cy=str(image.height))
+        doc_pr = etree.SubElement(inline, DRAWING_TAG, id='0', name='Picture', descr=image.description)
+        self._drawings.append(doc_pr)
+        frame = etree.SubElement(inline, '{%(wp)s}cNvGraphicFramePr' % NAMESPACES)
+        etree.SubElement(frame, '{%(a)s}graphicFrameLocks' % NAMESPACES, noChangeAspect='1')
+        graphic = etree.SubElement(inline, '{%(a)s}graphic' % NAMESPACES)
+        data = etree.SubElement(graphic, '{%(a)s}graphicData' % NAMESPACES, uri=NAMESPACES['pic'])
+        pic = etree.SubElement(data, '{%(pic)s}pic' % NAMESPACES)
+        nv_pic_pr = etree.SubElement(pic, '{%(pic)s}nvPicPr' % NAMESPACES)
+        etree.SubElement(nv_pic_pr, '{%(pic)s}cNvPr' % NAMESPACES, id='0', name='Picture')
+        etree.SubElement(nv_pic_pr, '{%(pic)s}cNvPicPr' % NAMESPACES)
+        blip_fill = etree.SubElement(pic, '{%(pic)s}blipFill' % NAMESPACES)
+        etree.SubElement(blip_fill, '{%(a)s}blip' % NAMESPACES, {'{%(r)s}embed' % NAMESPACES: rid})
+        stretch = etree.SubElement(blip_fill, '{%(a)s}stretch' % NAMESPACES)
+        etree.SubElement(stretch, '{%(a)s}fillRect' % NAMESPACES)
+        sp_pr = etree.SubElement(pic, '{%(pic)s}spPr' % NAMESPACES)
+        xfrm = etree.SubElement(sp_pr, '{%(a)s}xfrm' % NAMESPACES)
+        etree.SubElement(xfrm, '{%(a)s}off' % NAMESPACES, x='0', y='0')
+        etree.SubElement(xfrm, '{%(a)s}ext' % NAMESPACES, cx=str(image.width), cy=str(image.height))
+        geometry = etree.SubElement(sp_pr, '{%(a)s}prstGeom' % NAMESPACES, prst='rect')
+        etree.SubElement(geometry, '{%(a)s}avLst' % NAMESPACES)
+        return drawing
+
+    def __image_relationship(self, part_name, image):
+        """
+        Adds the image to the package once, keyed by its content hash, and
+        relates it to the part once.
+        """
+        key = (part_name, image.digest)
+        if key not in self._media_relationships:
+            media_name = 'word/media/%s.%s' % (image.digest[:32], image.format)
+            if media_name not in self._binary_parts:
+                self.__grow(len(image.data))
+                self._binary_parts[media_name] = image.data
+                self.__add_default(image.format, IMAGE_CONTENT_TYPES[image.format])
+            self._media_relationships[key] = self.__add_relationship(
+                part_name, RELATIONSHIP_TYPE_IMAGE, posixpath.relpath(media_name, posixpath.dirname(part_name)))
+        return self._media_relationships[key]
+
+    def __part_name(self, element):
+        root = element.getroottree().getroot()
+        for zi, part in self.parts.items():
+            if part.getroot() is root:
+                return zi.filename
+        return self._part_names.get(root) or self.__document_part_name()
+
+    def __number_drawings(self):
+        """
+        Gives the drawings inserted for images IDs above those of all other
+        drawings, once the document is complete.
+        """
+        if not self._drawings:
+            return
+        ours = set(self._drawings)
+        highest = 0
+        for tree in chain(self.parts.values(), self._xml_parts.values()):
+            for doc_pr in tree.getroot().iter(DRAWING_TAG):
+                if doc_pr not in ours:
+                    try:
+                        highest = max(highest, int(doc_pr.get('id')))
+                    except (TypeError, ValueError):
+                        continue
+        for number, doc_pr in enumerate(self._drawings, highest + 1):
+            doc_pr.set('id', str(number))
+            doc_pr.set('name', 'Picture %d' % number)
+
+    def merge_rows(self, anchor, rows, columns=None, progress=None, deadline=None):
+        """
+        Repeats the table row containing the MergeField ``anchor`` for every
+        item of ``rows``. Rows can be any iterable, such as a generator,
+        ``csv.DictReader`` or database cursor; it is consumed lazily, one row
+        at a time. Items are mappings of field names to values, or sequences
+        of values if the field names are given as ``columns``.
+
+        ``progress`` and ``deadline`` are described in ``merge_templates``;
+        progress is reported as ``('rows', merged)`` after every row.
+        """
+        with self.__watch(progress, deadline):
+            self.__merge_rows(anchor, rows, columns)
+
+    def __merge_rows(self, anchor, rows, columns, parts=None, record=None):
+        table, idx, template = self.__find_row_anchor(anchor, parts)
+        if table is not None:
+            sized, rows = rows, iter(rows)
+            first = next(rows, None)
+            if first is not None:
+                del table[idx]
+                size = _tree_size([template])
+                self.__reserve(size, sized)
+                for i, row_data in enumerate(chain([first], rows)):
+                    if columns is not None:
+                        row_data = dict(zip(columns, row_data))
+                    self.__grow(size)
+                    row = deepcopy(template)
+                    table.insert(idx + i, row)
+                    self.__merge([row], row_data, i if record is None else record)
+                    self.__tick('rows', i + 1)
+            else:
+                # if there is no data for a given table
+                # we check whether table needs to be removed
+                if self.remove_empty_tables:
+                    parent = table.getparent()
+                    parent.remove(table)
+
+    def merge_region(self, name, items, columns=None, progress=None, deadline=None):
+        """
+        Repeats the region ``name`` for every item of ``items``. A region
+        runs from a MergeField ``RegionStart:<name>`` to a MergeField
+        ``RegionEnd:<name>``: the paragraphs (or table rows) from the one
+        holding the start field to the one holding the end field, or that
+        single paragraph if both are in it. Paragraphs holding nothing but a
+        marker are left out of the copies. Items are mappings of field names
+        to values, or sequences of values if the field names are given as
+        ``columns``; without items the region is removed.
+
+        Passing a list to ``merge`` for a field that names a region merges
+        the region. ``progress`` and ``deadline`` are described in
+        ``merge_templates``; progress is reported as ``('items', merged)``
+        after every item.
+        """
+        with self.__watch(progress, deadline):
+            if not self.__merge_region(name, items, columns):
+                raise ValueError("No region %r in document" % name)
+
+    def __merge_region(self, name, items, columns, parts=None, record=None):
+        region = self.__find_region(name, parts)
+        if region is None:
+            return False
+        container, blocks = region
+        index = container.index(blocks[0])
+        template, slots = self.__compile_region(name, blocks)
+        for block in blocks:
+            container.remove(block)
+        size = _tree_size(template)
+        self.__reserve(size, items)
+
+        # the copy of the blocks for every item, with its fields located by the precompiled slots
+        for i, item in enumerate(items):
+            if columns is not None:
+                item = dict(zip(columns, item))
+            item = self.__sanitize(item, i if record is None else record)
+            self.__grow(size)
+            copy = [deepcopy(block) for block in template]
+            fields = {}
+            for field, path in slots:
+                element = copy[path[0]]
+                for position in path[1:]:
+                    element = element[position]
+                fields.setdefault(field, []).append(element)
+            container[index:index] = copy
+            index += len(copy)
+            if self._conditional:
+                self.__resolve_conditions(copy, item)
+            for field, value in item.items():
+                if _is_row_source(value):
+                    if not self.__merge_region(field, value, None, copy, record):
+                        self.__merge_rows(field, value, None, copy, record)
+                else:
+                    for mf in fields.get(field, ()):
+                        self.__fill_field(mf, value)
+            self.__tick('items', i + 1)
+        return True
+
+    def __find_region(self, name, parts=None):
+        """
+        Returns the element containing the region ``name`` and the region's
+        children of it, or None if there is no such region.
+        """
+        if not parts:
+            parts = self.parts.values()
+        # parts may be siblings, such as the copy of one record's body
+        start = None
+        for mf in chain.from_iterable(part.iter('MergeField') for part in parts):
+            if mf.get('name') == REGION_START + name and start is None:
+                start = mf
+            elif mf.get('name') == REGION_END + name and start is not None:
+                span = _span(start, mf)
+                if span is None:
+                    start = None
+                    continue
+                # a region within a paragraph repeats the paragraph
+                container = span[0]
+                paragraph = container if container.tag == PARAGRAPH_TAG else next(
+                    container.iterancestors(PARAGRAPH_TAG), None)
+                if paragraph is not None:
+                    return paragraph.getparent(), [paragraph]
+                return span
+        return None
+
+    def __has_conditions(self):
+        trees = list(self.parts.values())
+        if self._template_part is not None:
+            trees.append(self._template_part)
+        return any(mf.get('name').startswith(CONDITION_START) for tree in trees for mf in tree.iter('MergeField'))
+
+    def __resolve_conditions(self, parts, replacements, final=False):
+        """
+        Keeps or removes the conditional regions in ``parts`` whose
+        condition is on a field in ``replacements``, or all of them if
+        ``final``. Markers are collected in a single pass and regions are
+        resolved outermost first, so a removed region is never looked into.
+
+        A region runs from a MergeField ``IfStart:<condition>`` to a
+        MergeField ``IfEnd:<condition>``. Within a paragraph, it covers the
+        runs between them; otherwise the paragraphs from the one holding the
+        start marker to the one holding the end marker. The condition is a
+        field name, true if its value is not empty, ``!field``, ``field=value``
+        or ``field!=value``.
+        """
+        markers = [mf for part in parts for mf in part.iter('MergeField')
+                   if mf.get('name').startswith((CONDITION_START, CONDITION_END))]
+        starts = {}
+        regions = []
+        for mf in markers:
+            name = mf.get('name')
+            if name.startswith(CONDITION_START):
+                starts.setdefault(name[len(CONDITION_START):], []).append(mf)
+            elif starts.get(name[len(CONDITION_END):]):
+                # the innermost open region with the same condition
+                regions.append((starts[name[len(CONDITION_END):]].pop(), mf, name[len(CONDITION_END):]))
+        position = dict((mf, i) for i, mf in enumerate(markers))
+        regions.sort(key=lambda region: position[region[0]])
+
+        removed = set()
+        for start, end, condition in regions:
+            field, test = _condition(condition)
+            if field not in replacements and not final:
+                continue
+            if any(element in removed for element in chain([start], start.iterancestors())):
+                continue
+            span = _span(start, end)
+            if span is None:
+                continue
+            container, blocks = span
+            if test(replacements.get(field)):
+                for mf in (start, end):
+                    parent = mf.getparent()
+                    parent.remove(mf)
+                    removed.add(mf)
+                    # a paragraph holding only a marker is left out
+                    if len(blocks) > 1 and parent.tag == PARAGRAPH_TAG and \
+                            all(child.tag == '{%(w)s}pPr' % NAMESPACES for child in parent):
+                        parent.getparent().remove(parent)
+                        removed.add(parent)
+            else:
+                for block in blocks:
+                    container.remove(block)
+                    removed.add(block)
+                # as is a paragraph left empty
+                if container.tag == PARAGRAPH_TAG and \
+                        all(child.tag == '{%(w)s}pPr' % NAMESPACES for child in container):
+                    container.getparent().remove(container)
+                    removed.add(container)
+
+    @staticmethod
+    def __compile_region(name, blocks):
+        """
+        Copies the blocks of a region without its markers, and locates its
+        merge fields once, as (field name, path) where the path is the index
+        of the block followed by child indexes down to the field.
+        """
+        template = [deepcopy(block) for block in blocks]
+        markers = [mf for block in template for mf in block.iter('MergeField')
+                   if mf.get('name') in (REGION_START + name, REGION_END + name)]
+        for mf in markers:
+            parent = mf.getparent()
+            parent.remove(mf)
+            # a paragraph holding only a marker is left out
+            if len(blocks) > 1 and parent.tag == PARAGRAPH_TAG and \
+                    all(child.tag == '{%(w)s}pPr' % NAMESPACES for child in parent):
+                if parent in template:
+                    template.remove(parent)
+                else:
+                    parent.getparent().remove(parent)
+        slots = []
+        for index, block in enumerate(template):
+            for mf in block.iter('MergeField'):
+                path = []
+                element = mf
+                while element is not block:
+                    parent = element.getparent()
+                    path.append(parent.index(element))
+                    element = parent
+                slots.append((mf.get('name'), [index] + path[::-1]))
+        return template, slots
+
+    def __find_row_anchor(self, field, parts=None):
+        if not parts:
+            parts = self.parts.values()
+        for part in parts:
+            # iter includes part itself, which may be a table of a record's body
+            for table in part.iter('{%(w)s}tbl' % NAMESPACES):
+                for idx, row in enumerate(table):
+                    if row.find('.//MergeField[@name="%s"]' % field) is not None:
+                        return table, idx, row
+        return None, None, None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def close(self):
+        if self.zip is not None:
+            try:
+                self.zip.close()
+            finally:
+                self.zip = None
+
+
+def _texts(value):
+    """
+    Text of a merge value that ends up in the document as given.
+    """
+    if isinstance(value, text_type):
+        return [value]
+    if isinstance(value, RichText):
+        return [segment[0] for segment in value.segments if isinstance(segment[0], text_type)]
+    return []
+
+
+def _span(start, end):
+    """
+    Returns the innermost element containing both ``start`` and ``end``,
+    and its children from the one holding ``start`` to the one holding
+    ``end``; None if they are not in the same tree.
+    """
+    ancestors = set(start.iterancestors())
+    container = next((ancestor for ancestor in end.iterancestors() if ancestor in ancestors), None)
+    if container is None:
+        return None
+    first, last = [next(e for e in chain([marker], marker.iterancestors()) if e.getparent() is container)
+                   for marker in (start, end)]
+    return container, container[container.index(first):container.index(last) + 1]
+
+
+def _condition(condition):
+    """
+    Returns the field of a conditional region's condition and a test of the
+    field's value.
+    """
+    def text(value):
+        return '' if value is None else str(value)
+
+    if '!=' in condition:
+        field, expected = condition.split('!=', 1)
+        return field, lambda value: text(value) != expected
+    if '=' in condition:
+        field, expected = condition.split('=', 1)
+        return field, lambda value: text(value) == expected
+    if condition.startswith('!'):
+        return condition[1:], lambda value: not value
+    return condition, lambda value: bool(value)
+
+
+def _unique(values):
+    """
+    ``values`` without repetitions, in order of first occurrence.
+    """
+    seen = set()
+    return [value for value in values if not (value in seen or seen.add(value))]
+
+
+def _tree_size(elements):
+    """
+    Estimated resident size in bytes of the trees of ``elements``.
+    """
+    size = 0
+    for root in elements:
+        for element in root.iter():
+            size += ELEMENT_SIZE + ATTRIBUTE_SIZE * len(element.attrib)
+            size += len(element.text or '') + len(element.tail or '')
+    return size
+
+
+def _element_path(root, element):
+    """
+    Child indexes leading from ``root`` down to ``element``.
+    """
+    path = []
+    while element is not root:
+        parent = element.getparent()
+        path.append(parent.index(element))
+        element = parent
+    return tuple(reversed(path))
+
+
+def _resolve_path(parts, path):
+    element = parts[path[0]]
+    for index in path[1:]:
+        element = element[index]
+    return element
+
+
+def _compare(record, condition):
+    """
+    Evaluates the condition of a NEXTIF field, (field, operator, value),
+    for ``record``. Values are compared as numbers if both are numbers.
+    """
+    field, operator, expected = condition
+    value = record.get(field)
+    value = '' if value is None else value
+    try:
+        value, expected = float(value), float(expected)
+    except (TypeError, ValueError):
+        value = str(value)
+    comparisons = {
+        '=': value == expected,
+        '<>': value != expected,
+        '<': value < expected,
+        '<=': value <= expected,
+        '>': value > expected,
+        '>=': value >= expected,
+    }
+    # other operators move on, like NEXT
+    return comparisons.get(operator, True)
+
+
+def _canonical_xml(element):
+    return etree.tostring(element, method='c14n', exclusive=True)
+
+
+def _is_row_source(value):
+    """
+    Table data is any iterable of rows: lists, but also generators, cursors
+    and readers. Strings and mappings are iterable too, but are never rows.
+    """
+    if isinstance(value, list):
+        return True
+    if isinstance(value, string_types) or isinstance(value, Mapping):
+        return False
+    return hasattr(value, '__iter__')
+
+
+# Template snapshot of a merge_templates_sharded worker process
+_shard_worker_snapshot = None
+
+
+def _init_shard_worker(snapshot):
+    global _shard_worker_snapshot
+    _shard_worker_snapshot = snapshot
+
+
+def _render_worker_shard(records, separator, filename):
+    return _render_shard(_shard_worker_snapshot, records, separator, filename)
+
+
+def _render_shard(snapshot, records, separator, filename):
+    with MailMerge._from_snapshot(snapshot) as document:
+        document.merge_templates(records, separator)
+        document.write(filename)
+    return filename, len(records)
+
+
+def _xml_attribute(value):
+    return value.replace('&', '&amp;').replace('<', '&lt;').replace('"', '&quot;')
+
+
+def _strip_xml_declaration(data):
+    data = data.lstrip()
+    if data.startswith(b'\xef\xbb\xbf'):
+        data = data[3:]
+    if data.startswith(b'<?xml'):
+        data = data[data.index(b'?>') + 2:]
+    return data
+
+
+def _copy_member(source, zi, output, zinfo):
+    """
+    Copies member ``zi`` of the ``source`` archive to ``output`` as
+    ``zinfo``, without decompressing and compressing it again. Falls back
+    to a regular write where the raw data cannot be copied: on Python
+    versions before 3.6, and for encrypted and Zip64 members.
+    """
+    if sys.version_info < (3, 6) or source.fp is None or zi.flag_bits & 0x1 or \
+            max(zi.file_size, zi.compress_size, zi.header_offset) >= 0x7fffffff:
+        output.writestr(zinfo, source.read(zi))
+        return
+
+    fp = source.fp
+    fp.seek(zi.header_offset)
+    header = fp.read(30)
+    if header[:4] != b'PK\x03\x04':
+        output.writestr(zinfo, source.read(zi))
+        return
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    fp.seek(zi.header_offset + 30 + name_length + extra_length)
+    data = fp.read(zi.compress_size)
+
+    zinfo.compress_type = zi.compress_type
+    zinfo.flag_bits = 0
+    zinfo.CRC = zi.CRC
+    zinfo.compress_size = zi.compress_size
+    zinfo.file_size = zi.file_size
+    zinfo.header_offset = output.fp.tell()
+    output.fp.write(zinfo.FileHeader(False))
+    output.fp.write(data)
+    output.filelist.append(zinfo)
+    output.NameToInfo[zinfo.filename] = zinfo
+    output._didModify = True
+    output.start_dir = output.fp.tell()
+
+
+# Template of a parallel merge_templates worker process
+_fragment_worker_template = None
+
+
+def _init_fragment_worker(snapshot, template):
+    global _fragment_worker_template
+    _fragment_worker_template = (snapshot, template)
+
+
+def _render_worker_fragments(start, records):
+    snapshot, template = _fragment_worker_template
+    with MailMerge._from_snapshot(snapshot) as document:
+        return document._render_fragments(template, start, records)
+
+
+class _ChunkBuffer(object):
+    """
+    Write-only, non-seekable file object collecting the output of ZipFile
+    until it is drained by ``MailMerge.iter_bytes``.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        self.size = 0
+        return data
+
+
+def template_digest(file):
+    """
+    SHA-256 of the template package, read from a path or a file-like object.
+    """
+    digest = hashlib.sha256()
+    if hasattr(file, 'read'):
+        position = file.tell()
+        file.seek(0)
+        for chunk in iter(lambda: file.read(65536), b''):
+            digest.update(chunk)
+        file.seek(position)
+    else:
+        with open(file, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _canonical_default(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, bytes):
+        return binascii.hexlify(value).decode('ascii')
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if hasattr(value, '_cache_key'):
+        return value._cache_key()
+    raise TypeError("Cannot compute a cache key for value of type %s" % type(value).__name__)
+
+
+def record_digest(record):
+    """
+    SHA-256 of a canonical JSON serialization of a record (or list of
+    records), independent of key order.
+    """
+    data = json.dumps(record, sort_keys=True, separators=(',', ':'),
+                      ensure_ascii=False, default=_canonical_default)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class Template(object):
+    """
+    A template loaded once, to render from in many threads at the same time.
+
+    Loading parses the package and locates the merge fields; the result is
+    kept as read-only bytes. Every render builds its own ``MailMerge`` from
+    those bytes, with its own trees and no state shared with other renders,
+    so no locking is needed. Parsing, serializing and compressing happen in
+    lxml and zlib, which release the GIL, so renders in a thread pool run
+    concurrently. Keyword arguments are passed to ``MailMerge``.
+
+    ``size`` is the estimated memory of the document of a render before it
+    is merged, in bytes, for packing renders by memory.
+    """
+
+    def __init__(self, file, **options):
+        with MailMerge(file, **options) as document:
+            self._snapshot = document._snapshot()
+            self.fields = frozenset(document.get_merge_fields())
+        self.digest = hashlib.sha256(self._snapshot['package']).hexdigest()
+        self.size = self._snapshot['template_size']
+
+    def document(self):
+        """
+        Returns a new, independent document to merge and write.
+        """
+        return MailMerge._from_snapshot(self._snapshot)
+
+    def render(self, record, separator=None, **write_options):
+        """
+        Returns the document merged with ``record`` as bytes. With a
+        ``separator``, ``record`` is a list of records passed to
+        ``merge_templates``. Keyword arguments are passed to ``write``.
+        """
+        output = BytesIO()
+        with self.document() as document:
+            if separator is not None:
+                document.merge_templates(record, separator)
+            else:
+                document.merge(**record)
+            document.write(output, **write_options)
+        return output.getvalue()
+
+
+class Composer(Template):
+    """
+    Several templates composed into one document, such as a cover letter,
+    a statement and terms, each starting a new section.
+
+    The bodies of the templates are appended to the first one when the
+    Composer is created. Their styles, numbering, notes and relationships,
+    and the parts these refer to, are reconciled then, once; every render
+    only merges and writes, like a ``Template``. A style that differs from
+    one with the same ID in an earlier template is renamed, with ``_2`` for
+    the second template and so on. Keyword arguments are passed to
+    ``MailMerge``.
+    """
+
+    def __init__(self, templates, **options):
+        documents = []
+        try:
+            for template in templates:
+                documents.append(MailMerge(template, **options))
+            if not documents:
+                raise ValueError("No templates to compose")
+            for index, document in enumerate(documents[1:], 2):
+                documents[0]._append_document(document, '_%d' % index)
+            self._snapshot = documents[0]._snapshot()
+            self.fields = frozenset(documents[0].get_merge_fields())
+        finally:
+            for document in documents:
+                document.close()
+        self.digest = hashlib.sha256(b''.join(hashlib.sha256(package).digest() for package in
+                                              [self._snapshot['package']] + [
+                                                  xml for _, xml in self._snapshot['parts']])).hexdigest()
+        self.size = self._snapshot['template_size']
+
+
+class RenderCache(object):
+    """
+    Cache of rendered documents keyed by the template content hash and a
+    canonical hash of the record. Entries are kept in an in-memory LRU of
+    ``max_items`` documents and, when ``directory`` is given, in an on-disk
+    store bounded to ``max_disk_bytes``; the least recently used files are
+    evicted first.
+
+    Because ``MailMerge.write`` produces deterministic output, a cached entry
+    is byte-identical to a fresh render of the same template and record.
+    """
+
+    def __init__(self, max_items=128, directory=None, max_disk_bytes=256 * 1024 * 1024):
+        self.max_items = max_items
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._digests = {}
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        # Index of the on-disk store: path -> (mtime, size)
+        self._disk_index = {}
+        if directory is not None:
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            for path in self.__disk_entries():
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                self._disk_index[path] = (stat.st_mtime, stat.st_size)
+            self._disk_bytes = sum(size for _, size in self._disk_index.values())
+
+    def key(self, template, record, **options):
+        if isinstance(template, Template):
+            template_hash = template.digest
+        elif hasattr(template, 'read'):
+            template_hash = template_digest(template)
+        else:
+            stat = os.stat(template)
+            stamp = (os.path.abspath(template), stat.st_size, stat.st_mtime)
+            template_hash = self._digests.get(stamp)
+            if template_hash is None:
+                template_hash = self._digests[stamp] = template_digest(template)
+        return hashlib.sha256(
+            (template_hash + record_digest([record, options])).encode('ascii')).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.pop(key)
+                self._memory[key] = data
+                self.hits += 1
+                return data
+
+        if self.directory is not None:
+            path = self.__disk_path(key)
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                os.utime(path, None)
+            except (IOError, OSError):
+                data = None
+            if data is not None:
+                self.__remember(key, data)
+                with self._lock:
+                    self._disk_index[path] = (time.time(), len(data))
+                    self.hits += 1
+                return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, data):
+        self.__remember(key, data)
+        if self.directory is None or len(data) > self.max_disk_bytes:
+            return
+
+        path = self.__disk_path(key)
+        folder = os.path.dirname(path)
+        if not os.path.isdir(folder):
+            try:
+                os.makedirs(folder)
+            except OSError:
+                if not os.path.isdir(folder):
+                    raise
+        tmp_path = '%s.%d.%d.tmp' % (path, os.getpid(), threading.current_thread().ident)
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        _replace_file(tmp_path, path)
+
+        with self._lock:
+            _, previous = self._disk_index.get(path, (None, 0))
+            self._disk_index[path] = (time.time(), len(data))
+            self._disk_bytes += len(data) - previous
+            if self._disk_bytes > self.max_disk_bytes:
+                self.__evict_disk()
+
+    def render(self, template, record, separator=None, **options):
+        """
+        Returns the rendered document as bytes, merging ``record`` into
+        ``template`` unless the pair is already cached. With a ``separator``,
+        ``record`` is a list of records passed to ``merge_templates``.
+        Remaining keyword arguments are passed to ``MailMerge``, unless
+        ``template`` is a loaded ``Template``.
+        """
+        key = self.key(template, record, separator=separator, **options)
+        data = self.get(key)
+        if data is None and isinstance(template, Template):
+            data = template.render(record, separator)
+            self.put(key, data)
+        elif data is None:
+            if hasattr(template, 'seek'):
+                template.seek(0)
+            output = BytesIO()
+            with MailMerge(template, **options) as document:
+                if separator is not None:
+                    document.merge_templates(record, separator)
+                else:
+                    document.merge(**record)
+                document.write(output)
+            data = output.getvalue()
+            self.put(key, data)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self.directory is not None:
+                for path in self.__disk_entries():
+                    os.remove(path)
+                self._disk_index.clear()
+                self._disk_bytes = 0
+
+    def __remember(self, key, data):
+        with self._lock:
+            self._memory.pop(key, None)
+            self._memory[key] = data
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+    def __disk_path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.docx')
+
+    def __disk_entries(self):
+        for folder, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename.endswith('.docx'):
+                    yield os.path.join(folder, filename)
+
+    def __evict_disk(self):
+        # Least recently used first, from the index rather than the directory
+        entries = sorted((mtime, size, path) for path, (mtime, size) in self._disk_index.items())
+        for _, size, path in entries:
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            del self._disk_index[path]
+            self._disk_bytes -= size
+
+
+class BatchJob(object):
+    """
+    Resumable batch run of ``merge_templates`` driven by a manifest, a dict
+    or the path of a JSON file with these keys:
+
+    ``template``
+        Path of the template.
+    ``records``
+        Path of a JSON Lines file with one record per line, or, for a
+        manifest given as a dict, a list of records.
+    ``output``
+        Format string for the output file of a shard, given the shard index.
+    ``state``
+        Directory holding the claim and checkpoint files. It may be shared
+        between machines, for example over NFS.
+    ``separator``
+        Separator passed to ``merge_templates``, ``page_break`` by default.
+    ``shard_size``
+        Number of records per shard, 1000 by default. Alternatively
+        ``shards`` gives an explicit list of ``[start, stop)`` record ranges.
+
+    Relative paths in a manifest file are relative to the file. Each worker
+    claims a shard by creating its claim file exclusively, renders it and
+    then records a checkpoint; finished shards are skipped on restart.
+    While rendering, a worker refreshes its claim every quarter of
+    ``claim_timeout`` seconds. Claims older than that without a checkpoint
+    are taken to be from a worker that died and are claimed again. Claim
+    files are numbered by generation, and a claim is taken over by creating
+    the next generation exclusively, so a single worker wins even when
+    several find the same stale claim.
+
+    The byte offset of every shard in a records file is found in a single
+    pass and kept in the state directory, so a shard is read by seeking to
+    it rather than parsing the records before it.
+    """
+
+    def __init__(self, manifest, claim_timeout=3600, worker=None):
+        base = None
+        if isinstance(manifest, string_types):
+            base = os.path.dirname(os.path.abspath(manifest))
+            with open(manifest, 'rb') as f:
+                manifest = json.loads(f.read().decode('utf-8'))
+        self.manifest = manifest
+        self.claim_timeout = claim_timeout
+        self.worker = worker or '%s-%d' % (socket.gethostname(), os.getpid())
+        # Generation of the claim file of every shard this worker claimed
+        self._claims = {}
+        self.separator = manifest.get('separator', 'page_break')
+        if self.separator not in SEPARATORS:
+            raise ValueError("Invalid separator argument")
+
+        def resolve(path):
+            return os.path.join(base, path) if base is not None else path
+
+        self.template = resolve(manifest['template'])
+        self.output = resolve(manifest['output'])
+        self.state = resolve(manifest['state'])
+        self.records = manifest['records']
+        if isinstance(self.records, string_types):
+            self.records = resolve(self.records)
+
+        if not os.path.isdir(self.state):
+            try:
+                os.makedirs(self.state)
+            except OSError:
+                if not os.path.isdir(self.state):
+                    raise
+
+        if 'shards' in manifest:
+            self.shards = [(int(start), int(stop)) for start, stop in manifest['shards']]
+            self._offsets = self.__index_records(set(start for start, _ in self.shards), None)[1]
+        else:
+            shard_size = int(manifest.get('shard_size', 1000))
+            if shard_size < 1:
+                raise ValueError("shard_size must be at least 1")
+            count, self._offsets = self.__index_records(set(), shard_size)
+            self.shards = [(start, min(start + shard_size, count)) for start in range(0, count, shard_size)]
+
+    def status(self):
+        """
+        Returns the indexes of the shards that are done, claimed by a worker
+        and still pending.
+        """
+        status = {'done': [], 'claimed': [], 'pending': []}
+        for index in range(len(self.shards)):
+            if os.path.exists(self.__state_path(index, 'done')):
+                status['done'].append(index)
+            elif self.__claim_generations(index):
+                status['claimed'].append(index)
+            else:
+                status['pending'].append(index)
+        return status
+
+    def checkpoint(self, index):
+        """
+        Returns the checkpoint of a finished shard, or None.
+        """
+        try:
+            with open(self.__state_path(index, 'done'), 'rb') as f:
+                return json.loads(f.read().decode('utf-8'))
+        except (IOError, OSError):
+            return None
+
+    def run(self, limit=None):
+        """
+        Claims and renders pending shards until none are left, or ``limit``
+        shards have been rendered. Returns the indexes of the shards rendered
+        by this call.
+        """
+        rendered = []
+        snapshot = None
+        for index in range(len(self.shards)):
+            if limit is not None and len(rendered) >= limit:
+                break
+            if not self.__claim(index):
+                continue
+            done = threading.Event()
+            heartbeat = threading.Thread(target=self.__heartbeat, args=(index, done))
+            heartbeat.daemon = True
+            heartbeat.start()
+            try:
+                if snapshot is None:
+                    with MailMerge(self.template) as document:
+                        snapshot = document._snapshot()
+                self.__render(index, snapshot)
+            finally:
+                done.set()
+                heartbeat.join()
+                # The claim may have been taken over if this worker stalled.
+                if self.__owns_claim(index):
+                    try:
+                        os.remove(self.__claim_path(index, self._claims[index]))
+                    except OSError:
+                        pass
+            rendered.append(index)
+        return rendered
+
+    def __heartbeat(self, index, done):
+        path = self.__claim_path(index, self._claims[index])
+        while not done.wait(self.claim_timeout / 4.0):
+            if not self.__owns_claim(index):
+                break
+            try:
+                os.utime(path, None)
+            except OSError:
+                break
+
+    def __owns_claim(self, index):
+        generations = self.__claim_generations(index)
+        return bool(generations) and max(generations) == self._claims.get(index)
+
+    def __render(self, index, snapshot):
+        start, stop = self.shards[index]
+        records = self.__read_records(start, stop)
+        filename = self.output.format(index)
+        folder = os.path.dirname(filename)
+        if folder and not os.path.isdir(folder):
+            try:
+                os.makedirs(folder)
+            except OSError:
+                if not os.path.isdir(folder):
+                    raise
+        tmp_path = '%s.%s.tmp' % (filename, self.worker)
+        _render_shard(snapshot, records, self.separator, tmp_path)
+        _replace_file(tmp_path, filename)
+
+        checkpoint = {'shard': index, 'start': start, 'stop': stop, 'records': len(records),
+                      'output': filename, 'worker': self.worker}
+        path = self.__state_path(index, 'done')
+        with open(path + '.tmp', 'wb') as f:
+            f.write(json.dumps(checkpoint, sort_keys=True).encode('utf-8'))
+        _replace_file(path + '.tmp', path)
+
+    def __claim(self, index):
+        if os.path.exists(self.__state_path(index, 'done')):
+            return False
+        generations = self.__claim_generations(index)
+        current = max(generations) if generations else 0
+        if generations:
+            try:
+                if time.time() - os.path.getmtime(self.__claim_path(index, current)) <= self.claim_timeout:
+                    return False
+            except OSError:
+                # released since it was listed
+                return False
+        # Of the workers that found the same claim, only the one creating the next generation takes over.
+        path = self.__claim_path(index, current + 1)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except OSError as e:
+            if e.errno == errno.EEXIST:
+                return False
+            raise
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self.worker.encode('utf-8'))
+        self._claims[index] = current + 1
+        for generation in generations:
+            try:
+                os.remove(self.__claim_path(index, generation))
+            except OSError:
+                pass
+        # Another worker may have finished the shard between the checks.
+        if os.path.exists(self.__state_path(index, 'done')):
+            os.remove(path)
+            return False
+        return True
+
+    def __claim_path(self, index, generation):
+        return self.__state_path(index, 'claim.%d' % generation)
+
+    def __claim_generations(self, index):
+        prefix = 'shard-%06d.claim.' % index
+        generations = []
+        for name in os.listdir(self.state):
+            if name.startswith(prefix) and name[len(prefix):].isdigit():
+                generations.append(int(name[len(prefix):]))
+        return generations
+
+    def __state_path(self, index, kind):
+        return os.path.join(self.state, 'shard-%06d.%s' % (index, kind))
+
+    def __index_records(self, starts, step):
+        """
+        Returns the number of records and the byte offsets of the records
+        at ``starts``, or at every multiple of ``step``. Lines are only
+        counted here, not parsed.
+        """
+        if not isinstance(self.records, string_types):
+            return len(self.records), {}
+
+        stat = os.stat(self.records)
+        source = [os.path.abspath(self.records), stat.st_size, stat.st_mtime]
+        path = os.path.join(self.state, 'records.index')
+        try:
+            with open(path, 'rb') as f:
+                index = json.loads(f.read().decode('utf-8'))
+            if index['source'] == source and index['step'] == step:
+                offsets = dict((int(start), offset) for start, offset in index['offsets'].items())
+                if starts <= set(offsets):
+                    return index['count'], offsets
+        except (IOError, OSError, ValueError, KeyError):
+            pass
+
+        count = 0
+        offsets = {}
+        with open(self.records, 'rb') as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    if count in starts or (step and count % step == 0):
+                        offsets[count] = offset
+                    count += 1
+                offset += len(line)
+        offsets[count] = offset
+
+        index = {'source': source, 'step': step, 'count': count, 'offsets': offsets}
+        with open(path + '.%s.tmp' % self.worker, 'wb') as f:
+            f.write(json.dumps(index, sort_keys=True).encode('utf-8'))
+        _replace_file(path + '.%s.tmp' % self.worker, path)
+        return count, offsets
+
+    def __read_records(self, start, stop):
+        if not isinstance(self.records, string_types):
+            return self.records[start:stop]
+        if start not in self._offsets:
+            raise ValueError("No record %d in %s" % (start, self.records))
+        records = []
+        with open(self.records, 'rb') as f:
+            f.seek(self._offsets[start])
+            for line in f:
+                if len(records) >= stop - start:
+                    break
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line.decode('utf-8')))
+        return records
+
+
+class Bundle(object):
+    """
+    Writes many rendered documents into one zip or tar archive, without an
+    intermediate file per document. ``file`` is a path or a file object,
+    which for a zip on Python 3.6+ or a tar need not be seekable.
+
+    Members are named by formatting ``name`` with the document ``index``
+    and the keyword arguments given to ``add``. Unless ``index`` is None,
+    an index member listing every document with its size, SHA-256 and
+    keyword arguments is written when the bundle is closed.
+    """
+
+    def __init__(self, file, format='zip', name='document-{index:06d}.docx', index='index.json'):
+        if format not in ('zip', 'tar'):
+            raise ValueError("Bundle format must be 'zip' or 'tar'")
+        self.format = format
+        self.name = name
+        self.index = index
+        self.entries = []
+        self._names = set()
+        if format == 'zip':
+            # documents are compressed already
+            self.archive = ZipFile(file, 'w', ZIP_STORED)
+        elif hasattr(file, 'write'):
+            self.archive = tarfile.open(fileobj=file, mode='w|')
+        else:
+            self.archive = tarfile.open(file, mode='w')
+
+    def add(self, document, is_vernacular=False, **info):
+        """
+        Writes ``document``, a merged ``MailMerge`` or the bytes of a
+        rendered document, to the bundle. Returns its member name.
+        """
+        if isinstance(document, bytes):
+            data = document
+        else:
+            output = BytesIO()
+            document.write(output, is_vernacular)
+            data = output.getvalue()
+
+        name = self.name.format(index=len(self.entries), **info)
+        self.__add_member(name, data)
+        entry = {'name': name, 'size': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+        if info:
+            entry['info'] = info
+        self.entries.append(entry)
+        return name
+
+    def close(self):
+        if self.archive is None:
+            return
+        if self.index is not None:
+            index = json.dumps(self.entries, indent=1, sort_keys=True, default=_canonical_default)
+            self.__add_member(self.index, index.encode('utf-8'))
+        self.archive.close()
+        self.archive = None
+
+    def __add_member(self, name, data):
+        name = posixpath.normpath(name)
+        if name.startswith(('/', '../')) or name == '..' or name in self._names:
+            raise ValueError("Invalid or duplicate member name %r" % name)
+        self._names.add(name)
+        if self.format == 'zip':
+            zi = MailMerge._zip_info(name)
+            zi.compress_type = ZIP_STORED
+            self.archive.writestr(zi, data)
+        else:
+            ti = tarfile.TarInfo(name)
+            ti.size = len(data)
+            ti.mode = 0o644
+            self.archive.addfile(ti, BytesIO(data))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
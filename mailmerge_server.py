@@ -0,0 +1,318 @@
+"""
+Render server for docx-mailmerge, built on asyncio and the standard library.
+
+Templates are loaded once at start-up and handed to a bounded pool of worker
+processes (or threads), which render each request from the loaded template.
+Requests beyond the pool and its queue are rejected with 503, so a burst of
+traffic cannot pile up unbounded work.
+
+Endpoints:
+
+``POST /render/<template>``
+    Body is a JSON object of merge values; returns the merged document.
+``POST /batch/<template>?separator=page_break``
+    Body is a JSON list of records passed to ``merge_templates``.
+``GET /metrics``
+    Counters and gauges in the Prometheus text format, including the
+    estimated memory of every loaded template and the largest estimated
+    peak of a render.
+
+Requires Python 3.7 or later.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import parse_qs, urlsplit
+
+from mailmerge import MailMerge, LimitExceeded, SEPARATORS
+
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    411: 'Length Required',
+    413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+
+# Template snapshots of a worker, by template name
+_snapshots = {}
+
+
+def _init_worker(snapshots):
+    _snapshots.update(snapshots)
+
+
+def _render(name, record, separator=None):
+    output = BytesIO()
+    with MailMerge._from_snapshot(_snapshots[name]) as document:
+        if separator is not None:
+            document.merge_templates(record, separator)
+        else:
+            document.merge(**record)
+        document.write(output)
+        return output.getvalue(), document.peak_size
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super(HTTPError, self).__init__(message or REASONS[status])
+        self.status = status
+
+
+class RenderServer(object):
+    """
+    Serves renders of the ``templates``, a dict of template name to path.
+
+    Rendering runs in a pool of ``workers`` processes, or threads with
+    ``use_processes=False``. At most ``max_queue`` requests wait for a
+    worker; further requests are answered with 503 and a Retry-After header.
+    Request bodies are limited to ``max_body`` bytes. Renders that would
+    take more than an estimated ``memory_budget`` bytes are stopped and
+    answered with 413.
+    """
+
+    def __init__(self, templates, workers=None, use_processes=True, max_queue=64,
+                 max_body=16 * 1024 * 1024, memory_budget=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.max_body = max_body
+        self.snapshots = {}
+        for name, path in templates.items():
+            with MailMerge(path, memory_budget=memory_budget) as document:
+                self.snapshots[name] = document._snapshot()
+
+        if use_processes:
+            # Workers are started by a fork server rather than forked from this
+            # process, so they do not inherit its open client connections.
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            self.executor = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                                initargs=(self.snapshots,))
+            # Start the whole pool now rather than on the first requests.
+            for future in [self.executor.submit(int, 0) for _ in range(self.workers)]:
+                future.result()
+        else:
+            _init_worker(self.snapshots)
+            self.executor = ThreadPoolExecutor(self.workers)
+        self.server = None
+        self.pending = 0
+        self.metrics = {
+            'requests': {},
+            'rejected': 0,
+            'renders': 0,
+            'render_seconds': 0.0,
+            'render_peak_bytes': 0,
+        }
+
+    async def start(self, host='127.0.0.1', port=8000):
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=True)
+
+    async def handle(self, reader, writer):
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await self.read_request(reader)
+                except HTTPError as e:
+                    await self.respond(writer, e.status, str(e).encode('utf-8'), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                connection = headers.get('connection', '').lower()
+                if version == 'HTTP/1.1':
+                    keep_alive = connection != 'close'
+                else:
+                    keep_alive = connection == 'keep-alive'
+                status, content_type, data, extra = await self.dispatch(method, target, body)
+                await self.respond(writer, status, data, content_type, extra, keep_alive)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        try:
+            line = await reader.readline()
+        except ValueError:
+            raise HTTPError(431)
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(400)
+
+        headers = {}
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                raise HTTPError(431)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+            if len(headers) > 100:
+                raise HTTPError(431)
+
+        body = b''
+        if method == 'POST':
+            if 'content-length' not in headers:
+                raise HTTPError(411)
+            try:
+                length = int(headers['content-length'])
+            except ValueError:
+                raise HTTPError(400)
+            if length < 0:
+                raise HTTPError(400)
+            if length > self.max_body:
+                raise HTTPError(413)
+            body = await reader.readexactly(length)
+        return method, target, version, headers, body
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        route, _, name = url.path.strip('/').partition('/')
+        try:
+            if route == 'metrics' and not name:
+                if method != 'GET':
+                    raise HTTPError(405)
+                status, content_type, data, extra = 200, 'text/plain; version=0.0.4', self.render_metrics(), {}
+            elif route in ('render', 'batch') and name:
+                if method != 'POST':
+                    raise HTTPError(405)
+                data = await self.render(route, name, parse_qs(url.query), body)
+                status, content_type, extra = 200, DOCX_CONTENT_TYPE, {}
+            else:
+                raise HTTPError(404)
+        except HTTPError as e:
+            status, content_type, data = e.status, 'text/plain; charset=utf-8', str(e).encode('utf-8')
+            extra = {'Retry-After': '1'} if e.status == 503 else {}
+        requests = self.metrics['requests']
+        requests[status] = requests.get(status, 0) + 1
+        return status, content_type, data, extra
+
+    async def render(self, route, name, query, body):
+        if name not in self.snapshots:
+            raise HTTPError(404, "Unknown template %r" % name)
+        try:
+            record = json.loads(body.decode('utf-8'))
+        except ValueError:
+            raise HTTPError(400, "Body is not valid JSON")
+        separator = None
+        if route == 'batch':
+            separator = query.get('separator', ['page_break'])[0]
+            if separator not in SEPARATORS or not isinstance(record, list):
+                raise HTTPError(400, "Expected a list of records and a valid separator")
+        elif not isinstance(record, dict):
+            raise HTTPError(400, "Expected an object of merge values")
+
+        if self.pending >= self.workers + self.max_queue:
+            self.metrics['rejected'] += 1
+            raise HTTPError(503, "Render queue is full")
+        self.pending += 1
+        start = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            data, peak = await loop.run_in_executor(self.executor, _render, name, record, separator)
+        except LimitExceeded as e:
+            raise HTTPError(413, "Render too large: %s" % e)
+        except Exception as e:
+            raise HTTPError(500, "Render failed: %s" % e)
+        finally:
+            self.pending -= 1
+        self.metrics['renders'] += 1
+        self.metrics['render_seconds'] += time.time() - start
+        self.metrics['render_peak_bytes'] = max(self.metrics['render_peak_bytes'], peak)
+        return data
+
+    def render_metrics(self):
+        metrics = self.metrics
+        lines = ['mailmerge_requests_total{status="%d"} %d' % item
+                 for item in sorted(metrics['requests'].items())]
+        lines += [
+            'mailmerge_rejected_total %d' % metrics['rejected'],
+            'mailmerge_renders_total %d' % metrics['renders'],
+            'mailmerge_render_seconds_total %f' % metrics['render_seconds'],
+            'mailmerge_pending %d' % self.pending,
+            'mailmerge_workers %d' % self.workers,
+            'mailmerge_templates %d' % len(self.snapshots),
+            'mailmerge_render_peak_bytes %d' % metrics['render_peak_bytes'],
+        ]
+        lines += ['mailmerge_template_bytes{template="%s"} %d' % (name, snapshot['template_size'])
+                  for name, snapshot in sorted(self.snapshots.items())]
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+    async def respond(self, writer, status, data, content_type='text/plain; charset=utf-8', extra=None,
+                      keep_alive=True):
+        headers = [
+            'HTTP/1.1 %d %s' % (status, REASONS[status]),
+            'Content-Type: %s' % content_type,
+            'Content-Length: %d' % len(data),
+            'Connection: %s' % ('keep-alive' if keep_alive else 'close'),
+        ]
+        headers += ['%s: %s' % item for item in sorted((extra or {}).items())]
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1'))
+        writer.write(data)
+        await writer.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve docx-mailmerge renders over HTTP.")
+    parser.add_argument('templates', nargs='+', metavar='NAME=PATH',
+                        help="template to serve, by name")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--threads', action='store_true', help="render in threads instead of processes")
+    parser.add_argument('--max-queue', type=int, default=64)
+    parser.add_argument('--memory-budget', type=int, default=None,
+                        help="estimated bytes a single render may use")
+    args = parser.parse_args(argv)
+
+    templates = dict(template.split('=', 1) for template in args.templates)
+    server = RenderServer(templates, workers=args.workers, use_processes=not args.threads,
+                          max_queue=args.max_queue, memory_budget=args.memory_budget)
+
+    async def serve():
+        await server.start(args.host, args.port)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -16,7 +16,7 @@ setup(name='docx-mailmerge',
       author_email='bouke@haarsma.eu',
       url='http://github.com/Bouke/docx-mailmerge',
       license='MIT',
-      py_modules=['mailmerge'],
+      py_modules=['mailmerge', 'mailmerge_server'],
       zip_safe=False,
       install_requires=['lxml']
 )
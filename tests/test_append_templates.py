@@ -0,0 +1,58 @@
+import unittest
+from io import BytesIO
+from os import path
+
+from mailmerge import MailMerge
+from tests.utils import EtreeMixin, get_document_body_part
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')
+RECORDS = [{'fieldname': name} for name in ('one', 'two', 'three', 'four', 'five')]
+
+
+class AppendTemplatesTest(EtreeMixin, unittest.TestCase):
+    def merge(self, records, separator):
+        output = BytesIO()
+        with MailMerge(TEMPLATE) as document:
+            document.merge_templates(records, separator, appendable=True)
+            document.write(output)
+        return output
+
+    def append(self, file, records):
+        output = BytesIO()
+        with MailMerge(file) as document:
+            document.append_templates(records)
+            document.write(output)
+        return output
+
+    def assert_same_body(self, lhs, rhs):
+        with MailMerge(lhs) as left, MailMerge(rhs) as right:
+            self.assert_equal_tree(get_document_body_part(left).getroot(),
+                                   get_document_body_part(right).getroot())
+
+    def test_append_page_break(self):
+        merged = self.merge(RECORDS[:2], 'page_break')
+        appended = self.append(self.append(merged, RECORDS[2:4]), RECORDS[4:])
+        self.assert_same_body(self.merge(RECORDS, 'page_break'), appended)
+
+    def test_append_next_page_section(self):
+        merged = self.merge(RECORDS[:3], 'nextPage_section')
+        appended = self.append(merged, RECORDS[3:])
+        self.assert_same_body(self.merge(RECORDS, 'nextPage_section'), appended)
+
+    def test_append_to_empty_merge(self):
+        merged = self.merge([], 'page_break')
+        appended = self.append(merged, RECORDS)
+        self.assert_same_body(self.merge(RECORDS, 'page_break'), appended)
+
+    def test_requires_merged_document(self):
+        with MailMerge(TEMPLATE) as document:
+            self.assertRaises(ValueError, document.append_templates, RECORDS)
+
+    def test_template_is_opt_in(self):
+        output = BytesIO()
+        with MailMerge(TEMPLATE) as document:
+            document.merge_templates(RECORDS, 'page_break')
+            document.write(output)
+        with MailMerge(output) as document:
+            self.assertNotIn('mailmerge/template.xml', document.zip.namelist())
+            self.assertRaises(ValueError, document.append_templates, RECORDS)
@@ -0,0 +1,146 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from io import BytesIO
+from os import path
+from unittest import mock
+
+import mailmerge
+from mailmerge import BatchJob, MailMerge
+from tests.utils import EtreeMixin, get_document_body_part
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')
+RECORDS = [{'fieldname': 'record %d' % i} for i in range(7)]
+
+
+class BatchJobTest(EtreeMixin, unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open(path.join(self.directory, 'records.jsonl'), 'w') as f:
+            for record in RECORDS:
+                f.write(json.dumps(record) + '\n')
+        self.manifest = path.join(self.directory, 'job.json')
+        with open(self.manifest, 'w') as f:
+            json.dump({
+                'template': TEMPLATE,
+                'records': 'records.jsonl',
+                'output': 'out/letters-{:03d}.docx',
+                'state': 'state',
+                'shard_size': 3,
+            }, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_run(self):
+        job = BatchJob(self.manifest)
+        self.assertEqual(job.shards, [(0, 3), (3, 6), (6, 7)])
+        self.assertEqual(job.run(), [0, 1, 2])
+        self.assertEqual(job.status(), {'done': [0, 1, 2], 'claimed': [], 'pending': []})
+        self.assertEqual(job.checkpoint(2)['records'], 1)
+
+        for index, (start, stop) in enumerate(job.shards):
+            expected = BytesIO()
+            with MailMerge(TEMPLATE) as document:
+                document.merge_templates(RECORDS[start:stop], 'page_break')
+                document.write(expected)
+            filename = path.join(self.directory, 'out', 'letters-%03d.docx' % index)
+            with MailMerge(filename) as shard, MailMerge(expected) as merged:
+                self.assert_equal_tree(get_document_body_part(merged).getroot(),
+                                       get_document_body_part(shard).getroot())
+
+    def test_resume(self):
+        self.assertEqual(BatchJob(self.manifest).run(limit=1), [0])
+        job = BatchJob(self.manifest)
+        self.assertEqual(job.status()['pending'], [1, 2])
+        self.assertEqual(job.run(), [1, 2])
+        self.assertEqual(job.run(), [])
+
+    def test_claimed_shards_are_skipped(self):
+        job = BatchJob(self.manifest, worker='a')
+        claim = path.join(self.directory, 'state', 'shard-000001.claim.1')
+        with open(claim, 'w') as f:
+            f.write('b')
+        self.assertEqual(job.status()['claimed'], [1])
+        self.assertEqual(job.run(), [0, 2])
+
+        # A claim whose worker died is taken over after the timeout.
+        stale = time.time() - 7200
+        os.utime(claim, (stale, stale))
+        self.assertEqual(job.run(), [1])
+        self.assertEqual(job.checkpoint(1)['worker'], 'a')
+        self.assertEqual(job.status()['claimed'], [])
+
+    def test_stale_claim_is_taken_over_once(self):
+        first = BatchJob(self.manifest, worker='a')
+        second = BatchJob(self.manifest, worker='b')
+        claim = path.join(self.directory, 'state', 'shard-000000.claim.1')
+        with open(claim, 'w') as f:
+            f.write('c')
+        stale = time.time() - 7200
+        os.utime(claim, (stale, stale))
+
+        self.assertTrue(first._BatchJob__claim(0))
+        # the second worker found the stale claim before the first took it over
+        with mock.patch.object(second, '_BatchJob__claim_generations', return_value=[1]):
+            self.assertFalse(second._BatchJob__claim(0))
+        self.assertFalse(second._BatchJob__claim(0))
+        self.assertTrue(first._BatchJob__owns_claim(0))
+        with open(path.join(self.directory, 'state', 'shard-000000.claim.2')) as f:
+            self.assertEqual(f.read(), 'a')
+
+    def test_shard_is_read_by_offset(self):
+        job = BatchJob(self.manifest)
+        self.assertTrue(path.exists(path.join(self.directory, 'state', 'records.index')))
+        with mock.patch.object(mailmerge.json, 'loads', wraps=json.loads) as loads:
+            self.assertEqual(job._BatchJob__read_records(6, 7), RECORDS[6:])
+        self.assertEqual(loads.call_count, 1)
+
+    def test_claim_is_refreshed_while_rendering(self):
+        job = BatchJob(self.manifest, claim_timeout=0.2, worker='a')
+        claim = path.join(self.directory, 'state', 'shard-000000.claim.1')
+        render_shard = mailmerge._render_shard
+        ages = []
+
+        def slow_render(*args):
+            time.sleep(0.5)
+            ages.append(time.time() - os.path.getmtime(claim))
+            return render_shard(*args)
+
+        with mock.patch.object(mailmerge, '_render_shard', side_effect=slow_render):
+            self.assertEqual(job.run(limit=1), [0])
+        self.assertLess(ages[0], 0.2)
+        self.assertFalse(path.exists(claim))
+
+    def test_claim_taken_over_is_kept(self):
+        job = BatchJob(self.manifest, worker='a')
+        claim = path.join(self.directory, 'state', 'shard-000000.claim.2')
+        render_shard = mailmerge._render_shard
+
+        def stolen_render(*args):
+            with open(claim, 'w') as f:
+                f.write('b')
+            return render_shard(*args)
+
+        with mock.patch.object(mailmerge, '_render_shard', side_effect=stolen_render):
+            self.assertEqual(job.run(limit=1), [0])
+        with open(claim) as f:
+            self.assertEqual(f.read(), 'b')
+
+    def test_explicit_shards(self):
+        job = BatchJob({
+            'template': TEMPLATE,
+            'records': RECORDS,
+            'output': path.join(self.directory, '{}.docx'),
+            'state': path.join(self.directory, 'state'),
+            'shards': [[0, 5], [5, 7]],
+        })
+        self.assertEqual(job.run(), [0, 1])
+        self.assertEqual([job.checkpoint(i)['records'] for i in (0, 1)], [5, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import tarfile
+import unittest
+from io import BytesIO
+from os import path
+from zipfile import ZipFile
+
+from mailmerge import Bundle, MailMerge
+from tests.utils import get_document_body_part
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')
+
+
+class UnseekableOutput(object):
+    def __init__(self):
+        self.output = BytesIO()
+
+    def write(self, data):
+        return self.output.write(data)
+
+    def flush(self):
+        pass
+
+
+class BundleTest(unittest.TestCase):
+    def fill(self, bundle):
+        for customer in ('alice', 'bob'):
+            with MailMerge(TEMPLATE) as document:
+                document.merge(fieldname=customer)
+                bundle.add(document, customer=customer)
+
+    def assert_documents(self, members):
+        index = json.loads(members.pop('index.json').decode('utf-8'))
+        self.assertEqual([entry['name'] for entry in index], ['00000-alice.docx', '00001-bob.docx'])
+        self.assertEqual(sorted(members), ['00000-alice.docx', '00001-bob.docx'])
+        for entry in index:
+            data = members[entry['name']]
+            self.assertEqual(entry['sha256'], hashlib.sha256(data).hexdigest())
+            self.assertEqual(entry['size'], len(data))
+            with MailMerge(BytesIO(data)) as document:
+                texts = get_document_body_part(document).getroot().itertext()
+                self.assertIn(entry['info']['customer'], ''.join(texts))
+
+    def test_zip(self):
+        output = UnseekableOutput()
+        with Bundle(output, name='{index:05d}-{customer}.docx') as bundle:
+            self.fill(bundle)
+        with ZipFile(BytesIO(output.output.getvalue())) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assert_documents(dict((name, archive.read(name)) for name in archive.namelist()))
+
+    def test_tar(self):
+        output = UnseekableOutput()
+        with Bundle(output, format='tar', name='{index:05d}-{customer}.docx') as bundle:
+            self.fill(bundle)
+        with tarfile.open(fileobj=BytesIO(output.output.getvalue())) as archive:
+            self.assert_documents(dict((member.name, archive.extractfile(member).read())
+                                       for member in archive.getmembers()))
+
+    def test_invalid_names(self):
+        with Bundle(BytesIO(), name='../{index}.docx', index=None) as bundle:
+            self.assertRaises(ValueError, bundle.add, b'data')
+        with Bundle(BytesIO(), name='same.docx', index=None) as bundle:
+            bundle.add(b'data')
+            self.assertRaises(ValueError, bundle.add, b'data')
+
+
+class RawMemberCopyTest(unittest.TestCase):
+    def test_unchanged_members_are_copied(self):
+        output = BytesIO()
+        with MailMerge(TEMPLATE) as document:
+            document.merge(fieldname='copied')
+            document.write(output)
+        with ZipFile(TEMPLATE) as template, ZipFile(output) as merged:
+            self.assertIsNone(merged.testzip())
+            styles = merged.getinfo('word/styles.xml')
+            self.assertEqual(styles.compress_size, template.getinfo('word/styles.xml').compress_size)
+            self.assertEqual(merged.read('word/styles.xml'), template.read('word/styles.xml'))
+
+
+if __name__ == '__main__':
+    unittest.main()
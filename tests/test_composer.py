@@ -0,0 +1,144 @@
+import unittest
+from io import BytesIO
+from os import path
+from unittest import mock
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from lxml import etree
+
+from mailmerge import MailMerge, Composer, NAMESPACES, RenderCache
+
+ROWS = path.join(path.dirname(__file__), 'test_merge_table_rows.docx')
+SIMPLE = path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')
+MULTIPLE = path.join(path.dirname(__file__), 'test_multiple_elements.docx')
+
+NUMBERING = (
+    '<w:numbering xmlns:w="%(w)s">'
+    '<w:abstractNum w:abstractNumId="0"><w:lvl w:ilvl="0"><w:numFmt w:val="%%s"/></w:lvl></w:abstractNum>'
+    '<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>'
+    '</w:numbering>' % NAMESPACES
+)
+LIST_ITEM = (
+    '<w:p><w:pPr><w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr></w:pPr>'
+    '<w:r><w:t>%s</w:t></w:r></w:p>'
+)
+
+
+def with_numbering(filename, number_format):
+    """
+    Returns a copy of the docx at ``filename`` with a numbering part and a
+    list item numbered by it at the start of the body.
+    """
+    output = BytesIO()
+    with ZipFile(filename) as source, ZipFile(output, 'w', ZIP_DEFLATED) as target:
+        for zi in source.infolist():
+            data = source.read(zi).decode('utf-8') if zi.filename.endswith(('.xml', '.rels')) else source.read(zi)
+            if zi.filename == '[Content_Types].xml':
+                data = data.replace('</Types>', '<Override PartName="/word/numbering.xml" ContentType="application/'
+                                    'vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/></Types>')
+            elif zi.filename == 'word/_rels/document.xml.rels':
+                data = data.replace('</Relationships>', '<Relationship Id="rId99" Type="http://schemas.openxmlformats'
+                                    '.org/officeDocument/2006/relationships/numbering" Target="numbering.xml"/>'
+                                    '</Relationships>')
+            elif zi.filename == 'word/document.xml':
+                data = data.replace('<w:body>', '<w:body>' + LIST_ITEM % number_format)
+            target.writestr(zi, data)
+        target.writestr('word/numbering.xml', NUMBERING % number_format)
+    output.seek(0)
+    return output
+
+
+class ComposerTest(unittest.TestCase):
+    def render(self, composer, record):
+        return ZipFile(BytesIO(composer.render(record)))
+
+    def test_bodies_in_order(self):
+        composer = Composer([ROWS, SIMPLE, MULTIPLE])
+        with MailMerge(ROWS) as rows, MailMerge(SIMPLE) as simple, MailMerge(MULTIPLE) as multiple:
+            fields = rows.get_merge_fields() | simple.get_merge_fields() | multiple.get_merge_fields()
+        self.assertEqual(composer.fields, fields)
+
+        package = self.render(composer, {'student_name': 'Student', 'fieldname': 'Simple', 'foo': 'Multiple'})
+        root = etree.fromstring(package.read('word/document.xml'))
+        text = [''.join(p.itertext()) for p in root.iter('{%(w)s}p' % NAMESPACES)]
+        self.assertTrue(text[1].startswith('Student received the grades'))
+        self.assertLess(1, text.index('Merge : Simple'))
+        self.assertLess(text.index('Merge : Simple'), text.index('Multiple'))
+        # every template ends a section of its own
+        self.assertEqual(len(root.findall('.//w:sectPr', namespaces=NAMESPACES)), 3)
+        self.assertIsNotNone(root.find('w:body/w:sectPr', namespaces=NAMESPACES))
+
+    def test_parts_copied(self):
+        package = self.render(Composer([MULTIPLE, SIMPLE]), {})
+        root = etree.fromstring(package.read('word/document.xml'))
+        rels = etree.fromstring(package.read('word/_rels/document.xml.rels'))
+        targets = dict((rel.get('Id'), rel.get('Target')) for rel in rels)
+        references = root.findall('.//w:headerReference', namespaces=NAMESPACES)
+        self.assertEqual(len(references), 1)
+        header = 'word/' + targets[references[0].get('{%(r)s}id' % NAMESPACES)]
+        self.assertIn(header, package.namelist())
+        content_types = package.read('[Content_Types].xml').decode('utf-8')
+        self.assertIn('PartName="/%s"' % header, content_types)
+        self.assertIn('footnotes', ' '.join(targets.values()))
+
+    def test_styles_reconciled(self):
+        package = self.render(Composer([ROWS, MULTIPLE]), {'foo': 'Multiple'})
+        styles = etree.fromstring(package.read('word/styles.xml'))
+        ids = [style.get('{%(w)s}styleId' % NAMESPACES) for style in styles.iterfind('w:style', NAMESPACES)]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertIn('Normal_2', ids)
+        normal = styles.find('w:style[@w:styleId="Normal_2"]', NAMESPACES)
+        self.assertIsNone(normal.get('{%(w)s}default' % NAMESPACES))
+
+        # paragraphs of the second template keep its default style
+        root = etree.fromstring(package.read('word/document.xml'))
+        paragraph = next(p for p in root.iter('{%(w)s}p' % NAMESPACES) if ''.join(p.itertext()) == 'Multiple')
+        self.assertEqual(paragraph.find('w:pPr/w:pStyle', NAMESPACES).get('{%(w)s}val' % NAMESPACES), 'Normal_2')
+
+    def test_numbering_renumbered(self):
+        composer = Composer([with_numbering(SIMPLE, 'decimal'), with_numbering(MULTIPLE, 'bullet')])
+        package = self.render(composer, {})
+        numbering = etree.fromstring(package.read('word/numbering.xml'))
+        self.assertEqual([child.tag.split('}')[1] for child in numbering], ['abstractNum', 'abstractNum', 'num', 'num'])
+        nums = dict((num.get('{%(w)s}numId' % NAMESPACES), num.find('w:abstractNumId', NAMESPACES).get(
+            '{%(w)s}val' % NAMESPACES)) for num in numbering.iterfind('w:num', NAMESPACES))
+        self.assertEqual(nums, {'1': '0', '2': '1'})
+
+        root = etree.fromstring(package.read('word/document.xml'))
+        items = dict((''.join(p.itertext()), p.find('w:pPr/w:numPr/w:numId', NAMESPACES).get('{%(w)s}val' % NAMESPACES))
+                     for p in root.iter('{%(w)s}p' % NAMESPACES) if p.find('w:pPr/w:numPr', NAMESPACES) is not None)
+        self.assertEqual(items, {'decimal': '1', 'bullet': '2'})
+
+    def test_numbering_imported(self):
+        package = self.render(Composer([SIMPLE, with_numbering(MULTIPLE, 'bullet')]), {})
+        rels = package.read('word/_rels/document.xml.rels').decode('utf-8')
+        self.assertIn('relationships/numbering', rels)
+        self.assertTrue(any(name.startswith('word/numbering') for name in package.namelist()))
+
+    def test_composed_once(self):
+        with mock.patch.object(MailMerge, '_append_document', autospec=True,
+                               side_effect=MailMerge._append_document) as append:
+            composer = Composer([ROWS, SIMPLE])
+            first = composer.render({'fieldname': 'a'})
+            second = composer.render({'fieldname': 'a'})
+        self.assertEqual(append.call_count, 1)
+        self.assertEqual(first, second)
+
+    def test_fields_in_copied_headers(self):
+        composer = Composer([MULTIPLE, SIMPLE])
+        with composer.document() as document:
+            headers = [zi.filename for zi, part in document.parts.items()
+                       if part.getroot().tag == '{%(w)s}hdr' % NAMESPACES]
+        self.assertEqual(len(headers), 1)
+
+    def test_render_cache(self):
+        cache = RenderCache()
+        composer = Composer([ROWS, SIMPLE])
+        cache.render(composer, {'fieldname': 'a'})
+        cache.render(composer, {'fieldname': 'a'})
+        self.assertEqual(cache.hits, 1)
+        self.assertNotEqual(composer.digest, Composer([SIMPLE, ROWS]).digest)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from io import BytesIO
+from os import path
+from unittest.mock import patch
+
+from mailmerge import MailMerge, NAMESPACES
+from tests.utils import get_document_body_part, patched_docx
+
+
+def field(name):
+    return '<w:fldSimple w:instr=" MERGEFIELD %s "/>' % name
+
+
+def run(text):
+    return '<w:r><w:t xml:space="preserve">%s</w:t></w:r>' % text
+
+
+CONDITIONS = ''.join('<w:p>%s</w:p>' % ''.join(paragraph) for paragraph in [
+    [field('IfStart:co_borrower')],
+    [run('Co-borrower: '), field('co_borrower')],
+    [field('IfStart:region=EU'), run('EU disclaimer'), field('IfEnd:region=EU')],
+    [field('IfEnd:co_borrower')],
+    [field('IfStart:!co_borrower'), run('Single applicant'), field('IfEnd:!co_borrower')],
+    [run('Price'), field('IfStart:region!=US'), run(' incl. VAT'), field('IfEnd:region!=US'), run('.')],
+])
+
+
+class ConditionsTest(unittest.TestCase):
+    def setUp(self):
+        self.template = patched_docx(path.join(path.dirname(__file__), 'test_merge_templates_simple.docx'), {
+            'word/document.xml': lambda xml: xml.replace('<w:sectPr', CONDITIONS + '<w:sectPr', 1),
+        })
+
+    def paragraphs(self, document):
+        document.write(BytesIO())
+        body = get_document_body_part(document).getroot()
+        return [''.join(p.itertext()) for p in body.iter('{%(w)s}p' % NAMESPACES)
+                if not ''.join(p.itertext()).startswith('Merge')]
+
+    def test_selected(self):
+        with MailMerge(self.template) as document:
+            document.merge(co_borrower='Jane Doe', region='EU')
+            self.assertEqual(self.paragraphs(document), [
+                'Co-borrower: Jane Doe', 'EU disclaimer', 'Price incl. VAT.',
+            ])
+
+    def test_not_selected(self):
+        with MailMerge(self.template) as document:
+            document.merge(co_borrower='', region='US')
+            self.assertEqual(self.paragraphs(document), ['Single applicant', 'Price.'])
+
+    def test_nested(self):
+        with MailMerge(self.template) as document:
+            document.merge(co_borrower='Jane Doe', region='NL')
+            self.assertEqual(self.paragraphs(document), ['Co-borrower: Jane Doe', 'Price incl. VAT.'])
+
+    def test_missing_fields_are_empty(self):
+        with MailMerge(self.template) as document:
+            self.assertEqual(self.paragraphs(document), ['Single applicant', 'Price incl. VAT.'])
+
+    def test_removed_before_merging(self):
+        with MailMerge(self.template) as document:
+            document.merge(co_borrower=None)
+            self.assertNotIn('co_borrower', document.get_merge_fields())
+            self.assertIn('IfStart:region!=US', document.get_merge_fields())
+
+    def test_merge_templates(self):
+        with MailMerge(self.template) as document:
+            document.merge_templates([
+                {'fieldname': '1', 'co_borrower': 'Jane Doe', 'region': 'EU'},
+                {'fieldname': '2', 'region': 'US'},
+            ], 'page_break')
+            self.assertEqual(self.paragraphs(document), [
+                'Co-borrower: Jane Doe', 'EU disclaimer', 'Price incl. VAT.',
+                '',  # page break
+                'Single applicant', 'Price.',
+            ])
+
+    def test_section_headers(self):
+        template = patched_docx(path.join(path.dirname(__file__), 'test_merge_templates_simple.docx'), {
+            'word/header1.xml': lambda xml: xml.replace('</w:p></w:hdr>', ''.join([
+                field('IfStart:vip'), run(' for VIP'), field('IfEnd:vip'), '</w:p></w:hdr>',
+            ])),
+        })
+        with MailMerge(template) as document:
+            document.merge_templates([{'fieldname': '1', 'vip': 'yes'}, {'fieldname': '2'}], 'nextPage_section')
+            document.write(BytesIO())
+            root = get_document_body_part(document).getroot()
+            rids = root.xpath('//w:sectPr/w:headerReference/@r:id', namespaces=dict(
+                NAMESPACES, r='http://schemas.openxmlformats.org/officeDocument/2006/relationships'))
+            rels = document._xml_parts['word/_rels/document.xml.rels'].getroot()
+            targets = dict((rel.get('Id'), rel.get('Target')) for rel in rels)
+            headers = [''.join(document._xml_parts['word/' + targets[rid]].getroot().itertext()) for rid in rids]
+        self.assertEqual(headers, ['Header on every page for VIP', 'Header on every page'])
+
+    def test_no_conditions(self):
+        with MailMerge(path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')) as document:
+            self.assertFalse(document._conditional)
+            with patch.object(document, '_MailMerge__resolve_conditions') as resolve:
+                document.merge(fieldname='x')
+            resolve.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import base64
+import os
+import tempfile
+import unittest
+from io import BytesIO
+from os import path
+from zipfile import ZipFile
+
+from lxml import etree
+
+from mailmerge import MailMerge, Image, NAMESPACES
+from tests.test_merge_image import png
+from tests.utils import EtreeMixin
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')
+PKG = '{%(pkg)s}' % NAMESPACES
+
+
+class FlatOPCTest(EtreeMixin, unittest.TestCase):
+    def render(self, flat, **values):
+        output = BytesIO()
+        with MailMerge(TEMPLATE) as document:
+            document.merge(**values)
+            document.write(output, flat=flat)
+        return output.getvalue()
+
+    def parts(self, data):
+        root = etree.fromstring(data)
+        self.assertEqual(root.tag, PKG + 'package')
+        return dict((part.get(PKG + 'name'), part) for part in root)
+
+    def test_parts_match_package(self):
+        flat = self.parts(self.render(True, fieldname='flat'))
+        with ZipFile(BytesIO(self.render(False, fieldname='flat'))) as package:
+            names = ['/' + name for name in package.namelist() if name != '[Content_Types].xml']
+            self.assertEqual(sorted(flat), sorted(names))
+            document = flat['/word/document.xml']
+            self.assertEqual(document.get(PKG + 'contentType'),
+                             'application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml')
+            self.assert_equal_tree(etree.fromstring(package.read('word/document.xml')), document[0][0])
+        self.assertEqual(flat['/_rels/.rels'].get(PKG + 'contentType'),
+                         'application/vnd.openxmlformats-package.relationships+xml')
+
+    def test_binary_parts(self):
+        data = png(40, 30)
+        flat = self.parts(self.render(True, fieldname=Image(data)))
+        media = [part for name, part in flat.items() if name.startswith('/word/media/')]
+        self.assertEqual(len(media), 1)
+        self.assertEqual(media[0].get(PKG + 'contentType'), 'image/png')
+        self.assertEqual(base64.b64decode(media[0].find(PKG + 'binaryData').text), data)
+
+    def test_write_to_path(self):
+        fd, filename = tempfile.mkstemp(suffix='.xml')
+        os.close(fd)
+        try:
+            with MailMerge(TEMPLATE) as document:
+                document.merge(fieldname='flat')
+                document.write(filename, flat=True)
+            with open(filename, 'rb') as f:
+                self.assertEqual(f.read(), self.render(True, fieldname='flat'))
+        finally:
+            os.remove(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
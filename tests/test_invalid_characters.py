@@ -0,0 +1,61 @@
+import unittest
+from os import path
+
+from mailmerge import MailMerge, InvalidCharacterError
+from tests.utils import get_document_body_part
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_table_rows.docx')
+
+
+class InvalidCharactersTest(unittest.TestCase):
+    def text(self, document):
+        return ''.join(get_document_body_part(document).getroot().itertext())
+
+    def test_raise(self):
+        with MailMerge(TEMPLATE) as document:
+            with self.assertRaises(InvalidCharacterError) as context:
+                document.merge(student_name='Bouke\x00Haarsma')
+        self.assertEqual(context.exception.field, 'student_name')
+        self.assertIsNone(context.exception.record)
+        self.assertIsInstance(context.exception, ValueError)
+
+    def test_raise_record_index(self):
+        with MailMerge(TEMPLATE) as document:
+            with self.assertRaises(InvalidCharacterError) as context:
+                document.merge_templates([{'student_name': 'ok'}, {'student_name': 'bad\x1b[0m'}], 'page_break')
+        self.assertEqual((context.exception.field, context.exception.record), ('student_name', 1))
+        self.assertIn('record 1', str(context.exception))
+
+    def test_raise_row_index(self):
+        with MailMerge(TEMPLATE) as document:
+            with self.assertRaises(InvalidCharacterError) as context:
+                document.merge_rows('class_code', [{'class_code': 'A'}, {'class_code': 'B'}, {'class_code': 'C\x0b'}])
+        self.assertEqual((context.exception.field, context.exception.record), ('class_code', 2))
+
+    def test_strip(self):
+        with MailMerge(TEMPLATE, invalid_characters='strip') as document:
+            document.merge_templates([
+                {'student_name': 'Bouke\x00 Haarsma￾', 'class_code': [{'class_code': 'EC\x07ON'}]},
+            ], 'page_break')
+            text = self.text(document)
+        self.assertIn('Bouke Haarsma', text)
+        self.assertIn('ECON', text)
+
+    def test_replace(self):
+        with MailMerge(TEMPLATE, invalid_characters='replace') as document:
+            document.merge(student_name='Bouke\x01Haarsma\tTab')
+            text = self.text(document)
+        self.assertIn('Bouke�Haarsma\tTab', text)
+
+    def test_clean_values_are_unchanged(self):
+        replacements = {'student_name': 'Bouke\tHaarsma\r\nline', 'class_code': [], 'thesis_grade': 8}
+        with MailMerge(TEMPLATE, invalid_characters='strip') as document:
+            self.assertIs(document._MailMerge__sanitize(replacements, None), replacements)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            MailMerge(TEMPLATE, invalid_characters='ignore')
+
+
+if __name__ == '__main__':
+    unittest.main()
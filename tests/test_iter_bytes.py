@@ -0,0 +1,55 @@
+import unittest
+from io import BytesIO
+from os import path
+from zipfile import ZipFile
+
+from mailmerge import MailMerge
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')
+
+
+class NonSeekableOutput(object):
+    def __init__(self):
+        self.data = BytesIO()
+
+    def write(self, data):
+        return self.data.write(data)
+
+    def flush(self):
+        pass
+
+
+class IterBytesTest(unittest.TestCase):
+    def stream(self, **kwargs):
+        with MailMerge(TEMPLATE) as document:
+            document.merge(fieldname='streamed')
+            return list(document.iter_bytes(**kwargs))
+
+    def write(self, output):
+        with MailMerge(TEMPLATE) as document:
+            document.merge(fieldname='streamed')
+            document.write(output)
+
+    def test_chunks_form_valid_package(self):
+        chunks = self.stream(chunk_size=1024)
+        self.assertGreater(len(chunks), 1)
+
+        with ZipFile(BytesIO(b''.join(chunks))) as output:
+            self.assertIsNone(output.testzip())
+            self.assertIn(b'streamed', output.read('word/document.xml'))
+
+    def test_same_members_as_write(self):
+        seekable = BytesIO()
+        self.write(seekable)
+
+        streamed = ZipFile(BytesIO(b''.join(self.stream())))
+        written = ZipFile(seekable)
+        self.assertEqual(streamed.namelist(), written.namelist())
+        for name in written.namelist():
+            self.assertEqual(streamed.read(name), written.read(name))
+
+    def test_write_non_seekable(self):
+        output = NonSeekableOutput()
+        self.write(output)
+        with ZipFile(BytesIO(output.data.getvalue())) as package:
+            self.assertIsNone(package.testzip())
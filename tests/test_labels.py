@@ -0,0 +1,62 @@
+import re
+import unittest
+from io import BytesIO
+from os import path
+
+from mailmerge import MailMerge, NAMESPACES
+from tests.utils import get_document_body_part, patched_docx
+
+
+def field(instr):
+    return '<w:fldSimple w:instr=" %s "/>' % instr.replace('"', '&quot;')
+
+
+def cell(*fields):
+    return '<w:tc><w:p>%s</w:p></w:tc>' % ''.join(field(instr) for instr in fields)
+
+
+def sheet(next_field):
+    cells = [cell('MERGEFIELD name')] + [cell(next_field, 'MERGEFIELD name') for _ in range(5)]
+    rows = [cells[:3], cells[3:]]
+    return '<w:tbl>%s</w:tbl>' % ''.join('<w:tr>%s</w:tr>' % ''.join(row) for row in rows)
+
+
+class LabelsTest(unittest.TestCase):
+    def template(self, next_field):
+        return patched_docx(path.join(path.dirname(__file__), 'test_merge_templates_simple.docx'), {
+            'word/document.xml': lambda xml: re.sub('<w:body>.*?<w:sectPr', '<w:body>%s<w:sectPr' % sheet(next_field),
+                                                    xml, flags=re.S),
+        })
+
+    def labels(self, document):
+        document.write(BytesIO())
+        body = get_document_body_part(document).getroot()
+        return [[''.join(tc.itertext()) for tc in tbl.iter('{%(w)s}tc' % NAMESPACES)]
+                for tbl in body.iter('{%(w)s}tbl' % NAMESPACES)]
+
+    def test_next(self):
+        records = [{'name': 'Name %d' % i} for i in range(1, 15)]
+        with MailMerge(self.template('NEXT')) as document:
+            document.merge_templates(records, 'continuous_section')
+            labels = self.labels(document)
+        self.assertEqual(len(labels), 3)
+        self.assertEqual(sum(labels, []), [r['name'] for r in records] + [''] * 4)
+
+    def test_nextif(self):
+        records = [{'name': 'Name %d' % i, 'single': 'Y' if i != 2 else 'N'} for i in range(1, 4)]
+        with MailMerge(self.template('NEXTIF single = "Y"')) as document:
+            document.merge_templates(records, 'continuous_section')
+            labels = self.labels(document)
+        # a record that fails the condition fills the rest of the sheet
+        self.assertEqual(labels, [['Name 1', 'Name 2', 'Name 2', 'Name 2', 'Name 2', 'Name 2'],
+                                  ['Name 3', '', '', '', '', '']])
+
+    def test_merge_removes_next_fields(self):
+        with MailMerge(self.template('NEXT')) as document:
+            self.assertEqual(document.get_merge_fields(), {'name'})
+            document.merge(name='Name')
+            self.assertEqual(self.labels(document), [['Name'] * 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
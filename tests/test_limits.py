@@ -0,0 +1,83 @@
+import unittest
+from io import BytesIO
+from os import path
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from mailmerge import MailMerge, Limits, LimitExceeded
+from tests.utils import patched_docx, get_document_body_part
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')
+
+
+def with_member(name, data):
+    output = BytesIO()
+    with ZipFile(TEMPLATE) as source, ZipFile(output, 'w', ZIP_DEFLATED) as target:
+        for zi in source.infolist():
+            target.writestr(zi, source.read(zi))
+        target.writestr(name, data)
+    output.seek(0)
+    return output
+
+
+def wrap_body(prefix, suffix):
+    return lambda xml: xml.replace('<w:body>', '<w:body>' + prefix, 1).replace('</w:body>', suffix + '</w:body>', 1)
+
+
+class LimitsTest(unittest.TestCase):
+    def test_within_limits(self):
+        with MailMerge(TEMPLATE, limits=Limits()) as document:
+            self.assertEqual(document.get_merge_fields(), {'fieldname'})
+            document.merge(fieldname='safe')
+            document.write(BytesIO())
+
+    def test_compression_bomb(self):
+        bomb = with_member('word/media/bomb.bin', b'\0' * (8 * 1024 * 1024))
+        with self.assertRaises(LimitExceeded):
+            MailMerge(bomb, limits=Limits())
+        bomb.seek(0)
+        with self.assertRaises(LimitExceeded):
+            MailMerge(bomb, limits=Limits(max_compression_ratio=None, max_member_size=1024 * 1024))
+
+    def test_members(self):
+        with self.assertRaises(LimitExceeded):
+            MailMerge(TEMPLATE, limits=Limits(max_members=5))
+
+    def test_depth(self):
+        deep = patched_docx(TEMPLATE, {'word/document.xml': wrap_body('<w:p>' * 100, '</w:p>' * 100)})
+        with self.assertRaises(LimitExceeded):
+            MailMerge(deep, limits=Limits(max_depth=50))
+
+    def test_nodes(self):
+        wide = patched_docx(TEMPLATE, {'word/document.xml': wrap_body('<w:p/>' * 5000, '')})
+        with self.assertRaises(LimitExceeded):
+            MailMerge(wide, limits=Limits(max_nodes=1000))
+
+    def test_fields(self):
+        with self.assertRaises(LimitExceeded):
+            MailMerge(TEMPLATE, limits=Limits(max_fields=0))
+
+    def test_time(self):
+        with self.assertRaises(LimitExceeded):
+            MailMerge(TEMPLATE, limits=Limits(max_seconds=-1))
+
+    def test_limit_exceeded_is_value_error(self):
+        self.assertTrue(issubclass(LimitExceeded, ValueError))
+
+    def test_external_entities_are_not_resolved(self):
+        secret = path.abspath(__file__)
+
+        def add_entity(xml):
+            declaration, _, rest = xml.partition('?>')
+            doctype = '<!DOCTYPE w:document [<!ENTITY secret SYSTEM "file://%s">]>' % secret
+            return wrap_body('<w:p><w:r><w:t>&secret;</w:t></w:r></w:p>', '')(declaration + '?>' + doctype + rest)
+
+        template = patched_docx(TEMPLATE, {'word/document.xml': add_entity})
+        for limits in (None, Limits()):
+            template.seek(0)
+            with MailMerge(template, limits=limits) as document:
+                text = ''.join(get_document_body_part(document).getroot().itertext())
+                self.assertNotIn('import unittest', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from io import BytesIO
+from os import path
+
+from mailmerge import MailMerge, LimitExceeded, Template
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')
+TABLE_ROWS = path.join(path.dirname(__file__), 'test_merge_table_rows.docx')
+
+
+def rows(count):
+    for i in range(count):
+        yield {'class_code': 'C%d' % i, 'class_name': 'Class %d' % i, 'class_grade': 'A'}
+
+
+class MemoryBudgetTest(unittest.TestCase):
+    def test_sizes(self):
+        with MailMerge(TABLE_ROWS) as document:
+            self.assertGreater(document.template_size, 0)
+            self.assertEqual(document.peak_size, document.template_size)
+            document.merge_rows('class_code', list(rows(10)))
+            grown = document.peak_size - document.template_size
+        with MailMerge(TABLE_ROWS) as document:
+            document.merge_rows('class_code', list(rows(20)))
+            self.assertEqual(document.peak_size - document.template_size, 2 * grown)
+
+    def test_template_size(self):
+        template = Template(TEMPLATE)
+        with template.document() as document:
+            self.assertEqual(document.template_size, template.size)
+            document.merge_templates([{'fieldname': 'one'}, {'fieldname': 'two'}], 'page_break')
+            self.assertGreater(document.peak_size, template.size)
+
+    def test_budget_rows(self):
+        with MailMerge(TABLE_ROWS) as document:
+            document.merge_rows('class_code', list(rows(1)))
+            budget = document.template_size + 3 * (document.peak_size - document.template_size)
+        with MailMerge(TABLE_ROWS, memory_budget=budget) as document:
+            document.merge_rows('class_code', list(rows(2)))
+            document.write(BytesIO())
+
+        # a list is rejected before any row is copied
+        with MailMerge(TABLE_ROWS, memory_budget=budget) as document:
+            with self.assertRaises(LimitExceeded):
+                document.merge_rows('class_code', list(rows(1000)))
+            self.assertEqual(document.peak_size, document.template_size)
+
+        # rows of a generator are counted as they are copied
+        with MailMerge(TABLE_ROWS, memory_budget=budget) as document:
+            with self.assertRaises(LimitExceeded):
+                document.merge_rows('class_code', rows(1000))
+            self.assertLessEqual(document.peak_size, budget)
+
+    def test_budget_records(self):
+        records = [{'fieldname': str(i)} for i in range(1000)]
+        template = Template(TEMPLATE, memory_budget=Template(TEMPLATE).size + 50000)
+        with template.document() as document:
+            with self.assertRaises(LimitExceeded):
+                document.merge_templates(records, 'page_break')
+        template.render(records[:2], 'page_break')
+
+    def test_budget_template(self):
+        with self.assertRaises(LimitExceeded):
+            MailMerge(TEMPLATE, memory_budget=1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
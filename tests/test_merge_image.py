@@ -0,0 +1,77 @@
+import struct
+import tempfile
+import unittest
+import zlib
+from os import path
+from zipfile import ZipFile
+
+from lxml import etree
+
+from mailmerge import MailMerge, Image, NAMESPACES, EMU_PER_PIXEL, EMU_PER_CM
+from tests.utils import get_document_body_part
+
+
+def png(width, height, color=b'\x00\x00\x00'):
+    def chunk(tag, data):
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff)
+    raw = b''.join(b'\x00' + color * width for _ in range(height))
+    header = chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+    return b'\x89PNG\r\n\x1a\n' + header + chunk(b'IDAT', zlib.compress(raw)) + chunk(b'IEND', b'')
+
+
+class ImageTest(unittest.TestCase):
+    def test_native_size(self):
+        image = Image(png(4, 2))
+        self.assertEqual((image.format, image.width, image.height), ('png', 4 * EMU_PER_PIXEL, 2 * EMU_PER_PIXEL))
+
+    def test_invalid_size(self):
+        self.assertRaises(ValueError, Image, png(0, 2), width=EMU_PER_CM)
+        self.assertRaises(ValueError, Image, png(4, 0), height=EMU_PER_CM)
+        self.assertRaises(ValueError, Image, png(4, 2), width=0)
+        self.assertRaises(ValueError, Image, png(4, 2), height=-EMU_PER_CM)
+
+    def test_scaled_size(self):
+        image = Image(png(4, 2), width=2 * EMU_PER_CM)
+        self.assertEqual((image.width, image.height), (2 * EMU_PER_CM, EMU_PER_CM))
+
+    def test_unsupported_format(self):
+        self.assertRaises(ValueError, Image, b'not an image')
+
+
+class MergeImageTest(unittest.TestCase):
+    def test_images_deduplicated(self):
+        logo = png(4, 2)
+        signatures = [png(3, 3, b'\xff\x00\x00'), png(3, 3, b'\x00\xff\x00')]
+
+        with MailMerge(path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')) as document:
+            document.merge_templates([
+                {'fieldname': Image(logo)},
+                {'fieldname': Image(signatures[0])},
+                {'fieldname': Image(logo)},
+                {'fieldname': Image(signatures[1])},
+                {'fieldname': Image(logo)},
+            ], 'page_break')
+
+            with tempfile.TemporaryFile() as outfile:
+                document.write(outfile)
+                output = ZipFile(outfile)
+                media = [name for name in output.namelist() if name.startswith('word/media/')]
+                rels = etree.fromstring(output.read('word/_rels/document.xml.rels'))
+                content_types = output.read('[Content_Types].xml').decode('utf-8')
+                self.assertEqual(output.read(media[0]), logo)
+
+            root = get_document_body_part(document).getroot()
+
+        self.assertEqual(len(media), 3)
+        self.assertEqual(len(rels.xpath('*[contains(@Type, "/image")]')), 3)
+        self.assertIn('Extension="png"', content_types)
+
+        blips = root.xpath('//a:blip/@r:embed', namespaces=dict(
+            NAMESPACES, r='http://schemas.openxmlformats.org/officeDocument/2006/relationships'))
+        self.assertEqual(len(blips), 5)
+        self.assertEqual(blips[0], blips[2])
+        self.assertEqual(blips[0], blips[4])
+        self.assertEqual(len(set(blips)), 3)
+
+        ids = root.xpath('//wp:docPr/@id', namespaces=NAMESPACES)
+        self.assertEqual(len(set(ids)), 5)
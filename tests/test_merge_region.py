@@ -0,0 +1,85 @@
+import unittest
+from io import BytesIO
+from os import path
+
+from mailmerge import MailMerge, NAMESPACES
+from tests.utils import get_document_body_part, patched_docx
+
+REGIONS = (
+    '<w:p><w:fldSimple w:instr=" MERGEFIELD RegionStart:clauses "/></w:p>'
+    '<w:p><w:r><w:t xml:space="preserve">Clause </w:t></w:r><w:fldSimple w:instr=" MERGEFIELD number "/>'
+    '<w:r><w:t xml:space="preserve">: </w:t></w:r><w:fldSimple w:instr=" MERGEFIELD text "/></w:p>'
+    '<w:p><w:r><w:t>Signed</w:t></w:r></w:p>'
+    '<w:p><w:fldSimple w:instr=" MERGEFIELD RegionEnd:clauses "/></w:p>'
+    '<w:p><w:r><w:t xml:space="preserve">Name: </w:t></w:r><w:fldSimple w:instr=" MERGEFIELD RegionStart:names "/>'
+    '<w:fldSimple w:instr=" MERGEFIELD name "/><w:fldSimple w:instr=" MERGEFIELD RegionEnd:names "/></w:p>'
+    '<w:p><w:r><w:t>End</w:t></w:r></w:p>'
+)
+
+
+class MergeRegionTest(unittest.TestCase):
+    def setUp(self):
+        self.template = patched_docx(path.join(path.dirname(__file__), 'test_merge_templates_simple.docx'), {
+            'word/document.xml': lambda xml: xml.replace('<w:sectPr', REGIONS + '<w:sectPr', 1),
+        })
+
+    def paragraphs(self, document):
+        document.write(BytesIO())
+        body = get_document_body_part(document).getroot()
+        return [''.join(p.itertext()) for p in body.iter('{%(w)s}p' % NAMESPACES)][1:]
+
+    def test_paragraphs(self):
+        with MailMerge(self.template) as document:
+            document.merge(clauses=[{'number': 1, 'text': 'Scope'}, {'number': 2, 'text': 'Term'}])
+            self.assertEqual(self.paragraphs(document), [
+                'Clause 1: Scope', 'Signed', 'Clause 2: Term', 'Signed', 'Name: ', 'End',
+            ])
+
+    def test_within_paragraph(self):
+        with MailMerge(self.template) as document:
+            document.merge(names=[{'name': 'Ann'}, {'name': 'Bob'}], clauses=[])
+            self.assertEqual(self.paragraphs(document), ['Name: Ann', 'Name: Bob', 'End'])
+
+    def test_no_items(self):
+        with MailMerge(self.template) as document:
+            document.merge(clauses=[], names=iter([]))
+            self.assertEqual(self.paragraphs(document), ['End'])
+
+    def test_merge_region(self):
+        with MailMerge(self.template) as document:
+            progress = []
+            document.merge_region('clauses', ((i, 'Clause text') for i in range(1, 4)), columns=['number', 'text'],
+                                  progress=lambda kind, count: progress.append((kind, count)))
+            self.assertEqual(progress, [('items', 1), ('items', 2), ('items', 3)])
+            self.assertEqual(self.paragraphs(document)[:6], [
+                'Clause 1: Clause text', 'Signed', 'Clause 2: Clause text', 'Signed', 'Clause 3: Clause text', 'Signed',
+            ])
+            with self.assertRaises(ValueError):
+                document.merge_region('clauses', [])
+
+    def test_compiled_once(self):
+        with MailMerge(self.template) as document:
+            compile_region = document._MailMerge__compile_region
+            calls = []
+
+            def counting(*args):
+                calls.append(args)
+                return compile_region(*args)
+
+            document._MailMerge__compile_region = counting
+            document.merge(clauses=[{'number': i, 'text': 'x'} for i in range(50)])
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(len(self.paragraphs(document)), 102)
+
+    def test_merge_templates(self):
+        with MailMerge(self.template) as document:
+            document.merge_templates([
+                {'fieldname': 'first', 'clauses': [{'number': 1, 'text': 'a'}]},
+                {'fieldname': 'second', 'clauses': [{'number': 1, 'text': 'b'}, {'number': 2, 'text': 'c'}]},
+            ], 'page_break')
+            paragraphs = [p for p in self.paragraphs(document) if p.startswith(('Clause', 'Merge'))]
+        self.assertEqual(paragraphs, ['Clause 1: a', 'Merge : second', 'Clause 1: b', 'Clause 2: c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import csv
+import io
+import sqlite3
+import unittest
+from os import path
+
+from mailmerge import MailMerge, NAMESPACES
+from tests.utils import get_document_body_part
+
+ROWS = [
+    ('ECON101', 'Economics 101', 'A'),
+    ('ECONADV', 'Economics Advanced', 'B'),
+    ('OPRES', 'Operations Research', 'A'),
+]
+COLUMNS = ('class_code', 'class_name', 'class_grade')
+
+
+class MergeRowsIterableTest(unittest.TestCase):
+    def setUp(self):
+        self.document = MailMerge(path.join(path.dirname(__file__), 'test_merge_table_rows.docx'))
+
+    def tearDown(self):
+        self.document.close()
+
+    def cell_texts(self):
+        root = get_document_body_part(self.document).getroot()
+        return [
+            ''.join(t.text for t in row.iter('{%(w)s}t' % NAMESPACES))
+            for row in root.findall('.//{%(w)s}tr' % NAMESPACES)[1:-1]
+        ]
+
+    def assert_rows_merged(self):
+        self.assertEqual(self.cell_texts(), [''.join(row) for row in ROWS])
+
+    def test_generator(self):
+        self.document.merge(class_code=(dict(zip(COLUMNS, row)) for row in ROWS))
+        self.assert_rows_merged()
+
+    def test_csv_dict_reader(self):
+        data = io.StringIO()
+        writer = csv.writer(data)
+        writer.writerow(COLUMNS)
+        writer.writerows(ROWS)
+        data.seek(0)
+        self.document.merge(class_code=csv.DictReader(data))
+        self.assert_rows_merged()
+
+    def test_cursor_with_columns(self):
+        connection = sqlite3.connect(':memory:')
+        connection.execute('CREATE TABLE classes (code, name, grade)')
+        connection.executemany('INSERT INTO classes VALUES (?, ?, ?)', ROWS)
+        cursor = connection.execute('SELECT code, name, grade FROM classes ORDER BY rowid')
+        self.document.merge_rows('class_code', cursor, columns=COLUMNS)
+        self.assert_rows_merged()
+        connection.close()
+
+    def test_empty_generator_removes_table(self):
+        self.document.remove_empty_tables = True
+        self.document.merge(class_code=(row for row in []))
+        root = get_document_body_part(self.document).getroot()
+        self.assertIsNone(root.find('.//{%(w)s}tbl' % NAMESPACES))
+
+    def test_strings_are_not_rows(self):
+        self.document.merge(student_name='Bouke Haarsma')
+        root = get_document_body_part(self.document).getroot()
+        self.assertIn('Bouke Haarsma', [t.text for t in root.iter('{%(w)s}t' % NAMESPACES)])
@@ -0,0 +1,93 @@
+import unittest
+import tempfile
+from io import BytesIO
+from os import path
+from zipfile import ZipFile
+
+from lxml import etree
+
+from mailmerge import MailMerge, NAMESPACES
+from tests.utils import get_document_body_part, patched_docx
+
+HEADER_FIELD = (
+    '<w:r><w:t xml:space="preserve"> for </w:t></w:r>'
+    '<w:fldSimple w:instr=" MERGEFIELD company "><w:r><w:t>«company»</w:t></w:r></w:fldSimple>'
+    '</w:p></w:hdr>'
+)
+NAMESPACES_R = dict(NAMESPACES, r='http://schemas.openxmlformats.org/officeDocument/2006/relationships')
+RECORDS = [
+    {'fieldname': '1', 'company': 'Acme'},
+    {'fieldname': '2', 'company': 'Globex'},
+    {'fieldname': '3', 'company': 'Acme'},
+]
+
+
+class MergeTemplatesHeadersTest(unittest.TestCase):
+    def setUp(self):
+        self.template = patched_docx(path.join(path.dirname(__file__), 'test_merge_templates_simple.docx'), {
+            'word/header1.xml': lambda xml: xml.replace('</w:p></w:hdr>', HEADER_FIELD),
+        })
+
+    def merge(self, separator):
+        output = tempfile.TemporaryFile()
+        with MailMerge(self.template) as document:
+            self.assertEqual(document.get_merge_fields(), {'fieldname', 'company'})
+            document.merge_templates(RECORDS, separator)
+            document.write(output)
+            root = get_document_body_part(document).getroot()
+        return root, ZipFile(output)
+
+    def header_text(self, output, rid):
+        rels = etree.fromstring(output.read('word/_rels/document.xml.rels'))
+        target = rels.xpath('string(*[@Id="%s"]/@Target)' % rid)
+        header = etree.fromstring(output.read('word/' + target))
+        return ''.join(header.itertext())
+
+    def test_section_headers_per_record(self):
+        root, output = self.merge('nextPage_section')
+        rids = root.xpath('//w:sectPr/w:headerReference/@r:id', namespaces=NAMESPACES_R)
+        self.assertEqual(len(rids), 3)
+        self.assertEqual(self.header_text(output, rids[0]), 'Header on every page for Acme')
+        self.assertEqual(self.header_text(output, rids[1]), 'Header on every page for Globex')
+
+        # identical headers share one part
+        self.assertEqual(rids[0], rids[2])
+        self.assertNotEqual(rids[0], rids[1])
+        headers = [name for name in output.namelist() if name.startswith('word/header')]
+        self.assertEqual(len(headers), 3)
+
+        content_types = output.read('[Content_Types].xml').decode('utf-8')
+        for name in headers:
+            self.assertIn('PartName="/%s"' % name, content_types)
+
+    def test_break_keeps_single_header(self):
+        root, output = self.merge('page_break')
+        self.assertEqual(root.xpath('//w:headerReference/@r:id', namespaces=NAMESPACES_R), ['rId6'])
+        self.assertEqual(self.header_text(output, 'rId6'), 'Header on every page for ')
+
+    def test_append_merges_headers_per_record(self):
+        records = RECORDS + [{'fieldname': '4', 'company': 'Globex'}]
+        expected = BytesIO()
+        with MailMerge(self.template) as document:
+            document.merge_templates(records, 'nextPage_section')
+            document.write(expected)
+
+        self.template.seek(0)
+        combined = BytesIO()
+        with MailMerge(self.template) as document:
+            document.merge_templates(records[:2], 'nextPage_section', appendable=True)
+            document.write(combined)
+        appended = BytesIO()
+        with MailMerge(combined) as document:
+            document.append_templates(records[2:])
+            document.write(appended)
+
+        results = []
+        for output in (expected, appended):
+            with MailMerge(output) as document:
+                root = get_document_body_part(document).getroot()
+                rids = root.xpath('//w:sectPr/w:headerReference/@r:id', namespaces=NAMESPACES_R)
+            output = ZipFile(output)
+            results.append((rids, [self.header_text(output, rid) for rid in rids]))
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[1][1][3], 'Header on every page for Globex')
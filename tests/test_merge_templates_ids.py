@@ -0,0 +1,54 @@
+import unittest
+import tempfile
+from os import path
+from zipfile import ZipFile
+
+from lxml import etree
+
+from mailmerge import MailMerge, NAMESPACES
+from tests.utils import get_document_body_part, patched_docx
+
+NAMESPACES_WP = dict(NAMESPACES, wp='http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing')
+
+FOOTNOTE_AND_DRAWING = (
+    '<w:r><w:footnoteReference w:id="1"/></w:r>'
+    '<w:r><w:drawing><wp:inline><wp:docPr id="5" name="Picture 5"/></wp:inline></w:drawing></w:r>'
+    '<w:bookmarkStart'
+)
+FOOTNOTE = '<w:footnote w:id="1"><w:p><w:r><w:t>Footnote</w:t></w:r></w:p></w:footnote></w:footnotes>'
+
+
+class MergeTemplatesIdsTest(unittest.TestCase):
+    def setUp(self):
+        self.template = patched_docx(path.join(path.dirname(__file__), 'test_merge_templates_simple.docx'), {
+            'word/document.xml': lambda xml: xml.replace('<w:bookmarkStart', FOOTNOTE_AND_DRAWING),
+            'word/footnotes.xml': lambda xml: xml.replace('</w:footnotes>', FOOTNOTE),
+        })
+
+    def merge(self, separator='page_break'):
+        output = tempfile.TemporaryFile()
+        with MailMerge(self.template) as document:
+            document.merge_templates([{'fieldname': str(i)} for i in range(3)], separator)
+            document.write(output)
+            root = get_document_body_part(document).getroot()
+        return root, ZipFile(output)
+
+    def ids(self, root, xpath):
+        return [int(value) for value in root.xpath(xpath, namespaces=NAMESPACES_WP)]
+
+    def test_bookmarks_renumbered(self):
+        root, _ = self.merge()
+        self.assertEqual(self.ids(root, '//w:bookmarkStart/@w:id'), [0, 1, 2])
+        self.assertEqual(self.ids(root, '//w:bookmarkEnd/@w:id'), [0, 1, 2])
+
+    def test_drawings_renumbered(self):
+        root, _ = self.merge('nextPage_section')
+        self.assertEqual(self.ids(root, '//wp:docPr/@id'), [5, 11, 17])
+
+    def test_footnotes_copied(self):
+        root, output = self.merge()
+        self.assertEqual(self.ids(root, '//w:footnoteReference/@w:id'), [1, 3, 5])
+
+        footnotes = etree.fromstring(output.read('word/footnotes.xml'))
+        self.assertEqual(self.ids(footnotes, '/w:footnotes/w:footnote/@w:id'), [-1, 0, 1, 3, 5])
+        self.assertEqual(footnotes.xpath('string(w:footnote[@w:id="5"])', namespaces=NAMESPACES), 'Footnote')
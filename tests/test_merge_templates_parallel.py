@@ -0,0 +1,76 @@
+import sys
+import unittest
+from io import BytesIO
+from os import path
+
+from mailmerge import MailMerge, Image, RichText
+from tests.test_merge_image import png
+from tests.test_merge_templates_headers import HEADER_FIELD
+from tests.test_merge_templates_ids import FOOTNOTE_AND_DRAWING, FOOTNOTE
+from tests.utils import patched_docx
+
+SIMPLE = path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')
+ROWS = path.join(path.dirname(__file__), 'test_merge_table_rows.docx')
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "worker processes need Python 3.7")
+class MergeTemplatesParallelTest(unittest.TestCase):
+    def assert_same_output(self, template, records, separator):
+        outputs = []
+        for processes in (None, 2):
+            if hasattr(template, 'seek'):
+                template.seek(0)
+            output = BytesIO()
+            with MailMerge(template) as document:
+                document.merge_templates(records, separator, processes=processes, chunk_size=2)
+                document.write(output)
+            outputs.append(output.getvalue())
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_page_break(self):
+        self.assert_same_output(SIMPLE, [{'fieldname': str(i)} for i in range(7)], 'page_break')
+
+    def test_ids_and_notes(self):
+        template = patched_docx(SIMPLE, {
+            'word/document.xml': lambda xml: xml.replace('<w:bookmarkStart', FOOTNOTE_AND_DRAWING),
+            'word/footnotes.xml': lambda xml: xml.replace('</w:footnotes>', FOOTNOTE),
+        })
+        self.assert_same_output(template, [{'fieldname': str(i)} for i in range(5)], 'page_break')
+
+    def test_section_headers(self):
+        template = patched_docx(SIMPLE, {
+            'word/header1.xml': lambda xml: xml.replace('</w:p></w:hdr>', HEADER_FIELD),
+        })
+        records = [{'fieldname': str(i), 'company': ('Acme', 'Globex', 'Initech')[i % 3]} for i in range(5)]
+        self.assert_same_output(template, records, 'nextPage_section')
+
+    def test_images(self):
+        images = [Image(png(4, 2)), Image(png(3, 3))]
+        self.assert_same_output(SIMPLE, [{'fieldname': images[i % 2 if i < 4 else 0]} for i in range(5)],
+                                'page_break')
+
+    def test_images_repeated_in_chunk(self):
+        images = [Image(png(4, 2)), Image(png(3, 3))]
+        records = [{'fieldname': images[i // 2]} for i in range(4)]
+        self.assert_same_output(SIMPLE, records, 'page_break')
+
+    def test_images_repeated_in_chunk_with_sections(self):
+        template = patched_docx(SIMPLE, {
+            'word/header1.xml': lambda xml: xml.replace('</w:p></w:hdr>', HEADER_FIELD),
+        })
+        images = [Image(png(4, 2)), Image(png(3, 3))]
+        records = [{'fieldname': images[i // 2], 'company': ('Acme', 'Globex')[i % 2]} for i in range(4)]
+        self.assert_same_output(template, records, 'nextPage_section')
+
+    def test_hyperlinks_repeated_in_chunk(self):
+        urls = ['https://example.com/a', 'https://example.com/b']
+        records = [{'fieldname': RichText('Link', hyperlink=urls[i // 2])} for i in range(4)]
+        self.assert_same_output(SIMPLE, records, 'page_break')
+
+    def test_table_rows(self):
+        records = [{'class_code': [{'class_code': '%d-%d' % (i, j)} for j in range(i)]} for i in range(5)]
+        self.assert_same_output(ROWS, records, 'page_break')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from os import path
+
+from mailmerge import MailMerge, NAMESPACES
+from tests.utils import get_document_body_part
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_table_rows.docx')
+
+
+class MergeTemplatesRowsTest(unittest.TestCase):
+    def tables(self, document):
+        body = get_document_body_part(document).getroot()
+        return [[''.join(row.itertext()) for row in table.iterfind('w:tr', namespaces=NAMESPACES)]
+                for table in body.iter('{%(w)s}tbl' % NAMESPACES)]
+
+    def test_rows_stay_in_their_record(self):
+        with MailMerge(TEMPLATE) as document:
+            document.merge_templates([
+                {'class_code': []},
+                {'class_code': [{'class_code': 'ECON101'}, {'class_code': 'OPRES'}]},
+                {'class_code': [{'class_code': 'MATH'}]},
+            ], 'page_break')
+            tables = self.tables(document)
+
+        self.assertEqual(len(tables), 3)
+        self.assertFalse(any('ECON101' in row or 'MATH' in row for row in tables[0]))
+        self.assertEqual(sum('ECON101' in row or 'OPRES' in row for row in tables[1]), 2)
+        self.assertEqual(sum('MATH' in row for row in tables[2]), 1)
+
+    def test_scan_is_confined_to_record(self):
+        with MailMerge(TEMPLATE) as document:
+            visited = []
+            original = document._MailMerge__find_row_anchor
+
+            def find_row_anchor(field, parts=None):
+                visited.append(parts)
+                return original(field, parts)
+
+            document._MailMerge__find_row_anchor = find_row_anchor
+            document.merge_templates([{'class_code': [{'class_code': str(i)}]} for i in range(3)], 'page_break')
+        self.assertEqual(len(visited), 3)
+        self.assertTrue(all(parts is not None for parts in visited))
+
+
+if __name__ == '__main__':
+    unittest.main()
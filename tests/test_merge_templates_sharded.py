@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest
+from io import BytesIO
+from os import path
+
+from mailmerge import MailMerge
+from tests.utils import EtreeMixin, get_document_body_part
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')
+RECORDS = [{'fieldname': 'record %d' % i} for i in range(7)]
+
+
+class MergeTemplatesShardedTest(EtreeMixin, unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def shard(self, processes):
+        output = path.join(self.directory, '%d-{}.docx' % processes)
+        with MailMerge(TEMPLATE) as document:
+            return document.merge_templates_sharded(
+                iter(RECORDS), 'page_break', output, shard_size=3, processes=processes)
+
+    def test_shards(self):
+        manifest = self.shard(1)
+        self.assertEqual([(path.basename(name), count) for name, count in manifest],
+                         [('1-0.docx', 3), ('1-1.docx', 3), ('1-2.docx', 1)])
+
+        for (name, count), start in zip(manifest, (0, 3, 6)):
+            expected = BytesIO()
+            with MailMerge(TEMPLATE) as document:
+                document.merge_templates(RECORDS[start:start + count], 'page_break')
+                document.write(expected)
+            with MailMerge(name) as shard, MailMerge(expected) as merged:
+                self.assert_equal_tree(get_document_body_part(merged).getroot(),
+                                       get_document_body_part(shard).getroot())
+
+    def test_processes(self):
+        serial = self.shard(1)
+        parallel = self.shard(2)
+        self.assertEqual([count for _, count in serial], [count for _, count in parallel])
+        for (lhs, _), (rhs, _) in zip(serial, parallel):
+            with open(lhs, 'rb') as left, open(rhs, 'rb') as right:
+                self.assertEqual(left.read(), right.read())
+
+    def test_output_function(self):
+        names = []
+
+        def output(index):
+            name = path.join(self.directory, 'shard%d.docx' % index)
+            names.append(name)
+            return name
+
+        with MailMerge(TEMPLATE) as document:
+            result = document.merge_templates_sharded(RECORDS, 'page_break', output, shard_size=4, processes=1)
+        self.assertEqual(result, [(names[0], 4), (names[1], 3)])
+        self.assertTrue(all(os.path.exists(name) for name in names))
+
+    def test_invalid_arguments(self):
+        with MailMerge(TEMPLATE) as document:
+            with self.assertRaises(ValueError):
+                document.merge_templates_sharded(RECORDS, 'line_break', 'x{}.docx')
+            with self.assertRaises(ValueError):
+                document.merge_templates_sharded(RECORDS, 'page_break', 'x{}.docx', shard_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import tempfile
+from os import path
+
+from mailmerge import MailMerge, NAMESPACES
+from tests.utils import get_document_body_part
+
+
+class MinifyTest(unittest.TestCase):
+    def open(self, name, **kwargs):
+        return MailMerge(path.join(path.dirname(__file__), name), **kwargs)
+
+    def test_noise_removed(self):
+        with self.open('test_merge_table_rows.docx', minify=True) as document:
+            root = get_document_body_part(document).getroot()
+            self.assertEqual(root.findall('.//{%(w)s}proofErr' % NAMESPACES), [])
+            for element in root.iter():
+                for name in element.attrib:
+                    self.assertFalse(name.startswith('{%(w)s}rsid' % NAMESPACES), name)
+                    self.assertNotIn(name, ('{%(w14)s}paraId' % NAMESPACES, '{%(w14)s}textId' % NAMESPACES))
+
+    def test_runs_coalesced(self):
+        with self.open('test_merge_table_rows.docx', minify=True) as document:
+            root = get_document_body_part(document).getroot()
+            paragraph = root.find('{%(w)s}body/{%(w)s}p[2]' % NAMESPACES)
+            texts = [t.text for t in paragraph.findall('{%(w)s}r/{%(w)s}t' % NAMESPACES)]
+            self.assertEqual(texts, [' received the grades for ', ' in the table below.'])
+
+    def test_fields_preserved(self):
+        with self.open('test_merge_table_rows.docx') as document:
+            expected = document.get_merge_fields()
+
+        with self.open('test_merge_table_rows.docx', minify=True) as document:
+            self.assertEqual(document.get_merge_fields(), expected)
+            document.merge(student_name='Bouke Haarsma', study_name='Industrial Engineering', class_code=[
+                {'class_code': 'ECON101', 'class_name': 'Economics 101', 'class_grade': 'A'},
+            ])
+
+            with tempfile.TemporaryFile() as outfile:
+                document.write(outfile)
+
+            root = get_document_body_part(document).getroot()
+            paragraph = root.find('{%(w)s}body/{%(w)s}p[2]' % NAMESPACES)
+            self.assertEqual(
+                ''.join(t.text for t in paragraph.iter('{%(w)s}t' % NAMESPACES)),
+                'Bouke Haarsma received the grades for Industrial Engineering in the table below.')
+            self.assertEqual(len(root.findall('.//{%(w)s}tr' % NAMESPACES)), 3)
@@ -0,0 +1,74 @@
+import time
+import unittest
+from io import BytesIO
+from os import path
+
+from mailmerge import MailMerge, MergeCancelled, DeadlineExceeded
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')
+ROWS_TEMPLATE = path.join(path.dirname(__file__), 'test_merge_table_rows.docx')
+RECORDS = [{'fieldname': str(i)} for i in range(5)]
+
+
+class ProgressTest(unittest.TestCase):
+    def test_records(self):
+        events = []
+        with MailMerge(TEMPLATE) as document:
+            document.merge_templates(RECORDS, 'page_break', progress=lambda *event: events.append(event))
+        self.assertEqual(events, [('records', i) for i in range(1, 6)])
+
+    def test_rows(self):
+        events = []
+        with MailMerge(ROWS_TEMPLATE) as document:
+            rows = [{'class_code': 'a'}, {'class_code': 'b'}]
+            document.merge_rows('class_code', rows, progress=lambda *event: events.append(event))
+        self.assertEqual(events, [('rows', 1), ('rows', 2)])
+
+    def test_bytes(self):
+        events = []
+        output = BytesIO()
+        with MailMerge(TEMPLATE) as document:
+            document.merge(fieldname='bytes')
+            document.write(output, progress=lambda *event: events.append(event))
+        self.assertTrue(events)
+        self.assertEqual(set(kind for kind, _ in events), {'bytes'})
+        self.assertLessEqual(events[-1][1], len(output.getvalue()))
+
+        events = []
+        with MailMerge(TEMPLATE) as document:
+            data = b''.join(document.iter_bytes(progress=lambda *event: events.append(event)))
+        self.assertEqual(events[-1], ('bytes', len(data)))
+
+    def test_cancel(self):
+        def progress(kind, count):
+            return count < 2
+
+        consumed = []
+
+        def records():
+            for record in RECORDS:
+                consumed.append(record)
+                yield record
+
+        with MailMerge(TEMPLATE) as document:
+            with self.assertRaises(MergeCancelled):
+                document.merge_templates(records(), 'page_break', progress=progress)
+        self.assertEqual(len(consumed), 2)
+
+    def test_deadline(self):
+        with MailMerge(TEMPLATE) as document:
+            with self.assertRaises(DeadlineExceeded):
+                document.merge_templates(RECORDS, 'page_break', deadline=time.time() - 1)
+        with MailMerge(TEMPLATE) as document:
+            with self.assertRaises(DeadlineExceeded):
+                document.write(BytesIO(), deadline=time.time() - 1)
+
+    def test_state_is_reset(self):
+        with MailMerge(TEMPLATE) as document:
+            with self.assertRaises(DeadlineExceeded):
+                document.merge_templates(RECORDS, 'page_break', deadline=time.time() - 1)
+            document.write(BytesIO())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import shutil
+import tempfile
+from io import BytesIO
+from os import path
+from unittest import mock
+from zipfile import ZipFile
+
+import mailmerge
+from mailmerge import MailMerge, RenderCache, ZIP_DATE_TIME
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')
+
+
+class DeterministicOutputTest(unittest.TestCase):
+    def render(self):
+        output = BytesIO()
+        with MailMerge(TEMPLATE) as document:
+            document.merge(fieldname='deterministic')
+            document.write(output)
+        return output.getvalue()
+
+    def test_identical_bytes(self):
+        self.assertEqual(self.render(), self.render())
+
+    def test_fixed_timestamps(self):
+        with ZipFile(BytesIO(self.render())) as output:
+            for zi in output.infolist():
+                self.assertEqual(zi.date_time, ZIP_DATE_TIME)
+
+
+class RenderCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_memory_hit_skips_merge(self):
+        cache = RenderCache()
+        first = cache.render(TEMPLATE, {'fieldname': 'cached'})
+        with mock.patch.object(mailmerge, 'MailMerge', side_effect=AssertionError):
+            second = cache.render(TEMPLATE, {'fieldname': 'cached'})
+        self.assertEqual(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_record_key_order_is_irrelevant(self):
+        cache = RenderCache()
+        self.assertEqual(cache.key(TEMPLATE, {'a': 1, 'b': 2}),
+                         cache.key(TEMPLATE, {'b': 2, 'a': 1}))
+        self.assertNotEqual(cache.key(TEMPLATE, {'a': 1}),
+                            cache.key(TEMPLATE, {'a': 2}))
+
+    def test_disk_store(self):
+        first = RenderCache(directory=self.directory).render(TEMPLATE, {'fieldname': 'disk'})
+        cache = RenderCache(directory=self.directory)
+        with mock.patch.object(mailmerge, 'MailMerge', side_effect=AssertionError):
+            self.assertEqual(first, cache.render(TEMPLATE, {'fieldname': 'disk'}))
+
+    def test_disk_store_is_bounded(self):
+        cache = RenderCache(max_items=1, directory=self.directory, max_disk_bytes=50000)
+        # Eviction works from the index, without scanning the directory.
+        with mock.patch('os.walk', side_effect=AssertionError):
+            for i in range(10):
+                cache.render(TEMPLATE, {'fieldname': str(i)})
+        self.assertLessEqual(cache._disk_bytes, 50000)
+        self.assertEqual(len(cache._memory), 1)
+
+        stored = RenderCache(directory=self.directory)
+        self.assertEqual(stored._disk_bytes, cache._disk_bytes)
+        self.assertEqual(sorted(stored._disk_index), sorted(cache._disk_index))
+
+    def test_merge_templates(self):
+        cache = RenderCache()
+        records = [{'fieldname': 'a'}, {'fieldname': 'b'}]
+        data = cache.render(TEMPLATE, records, separator='page_break')
+        self.assertEqual(data, cache.render(TEMPLATE, records, separator='page_break'))
+        self.assertNotEqual(data, cache.render(TEMPLATE, records, separator='column_break'))
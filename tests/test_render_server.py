@@ -0,0 +1,114 @@
+import json
+import sys
+import unittest
+from io import BytesIO
+from os import path
+
+from mailmerge import MailMerge
+from tests.utils import EtreeMixin, get_document_body_part
+
+# the server needs Python 3.7
+if sys.version_info >= (3, 7):
+    import asyncio
+    from mailmerge_server import RenderServer
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_templates_simple.docx')
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "the render server needs Python 3.7")
+class RenderServerTest(EtreeMixin, unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.server = RenderServer({'simple': TEMPLATE}, workers=2, use_processes=False, max_queue=0,
+                                   max_body=1024)
+        self.loop.run_until_complete(self.server.start(port=0))
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.server.close())
+        self.loop.close()
+
+    def request(self, method, target, body=None):
+        async def send():
+            reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+            data = json.dumps(body).encode('utf-8') if body is not None else b''
+            head = '%s %s HTTP/1.1\r\nConnection: close\r\n' % (method, target)
+            if method == 'POST':
+                head += 'Content-Length: %d\r\n' % len(data)
+            writer.write(head.encode('latin-1') + b'\r\n' + data)
+            response = await reader.read()
+            writer.close()
+            return response
+        response = self.loop.run_until_complete(send())
+        head, _, data = response.partition(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        headers = dict(line.split(': ', 1) for line in lines[1:])
+        return int(lines[0].split()[1]), headers, data
+
+    def assert_same_body(self, data, expected):
+        with MailMerge(BytesIO(data)) as left, MailMerge(BytesIO(expected)) as right:
+            self.assert_equal_tree(get_document_body_part(right).getroot(),
+                                   get_document_body_part(left).getroot())
+
+    def test_render(self):
+        status, headers, data = self.request('POST', '/render/simple', {'fieldname': 'one'})
+        self.assertEqual(status, 200)
+        self.assertEqual(int(headers['Content-Length']), len(data))
+
+        expected = BytesIO()
+        with MailMerge(TEMPLATE) as document:
+            document.merge(fieldname='one')
+            document.write(expected)
+        self.assert_same_body(data, expected.getvalue())
+
+    def test_batch(self):
+        records = [{'fieldname': 'one'}, {'fieldname': 'two'}]
+        status, _, data = self.request('POST', '/batch/simple?separator=nextPage_section', records)
+        self.assertEqual(status, 200)
+
+        expected = BytesIO()
+        with MailMerge(TEMPLATE) as document:
+            document.merge_templates(records, 'nextPage_section')
+            document.write(expected)
+        self.assert_same_body(data, expected.getvalue())
+
+    def test_errors(self):
+        self.assertEqual(self.request('POST', '/render/missing', {})[0], 404)
+        self.assertEqual(self.request('GET', '/render/simple')[0], 405)
+        self.assertEqual(self.request('POST', '/render/simple', [])[0], 400)
+        self.assertEqual(self.request('POST', '/batch/simple?separator=foo', [])[0], 400)
+        self.assertEqual(self.request('POST', '/render/simple', {'fieldname': 'x' * 2048})[0], 413)
+
+    def test_backpressure(self):
+        self.server.pending = self.server.workers
+        status, headers, _ = self.request('POST', '/render/simple', {'fieldname': 'one'})
+        self.assertEqual(status, 503)
+        self.assertEqual(headers['Retry-After'], '1')
+        self.server.pending = 0
+
+        status, _, data = self.request('GET', '/metrics')
+        self.assertEqual(status, 200)
+        metrics = dict(line.rsplit(' ', 1) for line in data.decode('utf-8').splitlines())
+        self.assertEqual(metrics['mailmerge_rejected_total'], '1')
+        self.assertEqual(metrics['mailmerge_requests_total{status="503"}'], '1')
+        self.assertEqual(metrics['mailmerge_pending'], '0')
+
+    def test_memory_metrics(self):
+        self.assertEqual(self.request('POST', '/render/simple', {'fieldname': 'one'})[0], 200)
+        status, _, data = self.request('GET', '/metrics')
+        metrics = dict(line.rsplit(' ', 1) for line in data.decode('utf-8').splitlines())
+        template = int(metrics['mailmerge_template_bytes{template="simple"}'])
+        self.assertGreater(template, 0)
+        self.assertGreaterEqual(int(metrics['mailmerge_render_peak_bytes']), template)
+
+
+class RenderServerProcessTest(RenderServerTest):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.server = RenderServer({'simple': TEMPLATE}, workers=1, max_queue=0, max_body=1024)
+        self.loop.run_until_complete(self.server.start(port=0))
+
+    test_errors = test_backpressure = None
+
+
+if __name__ == '__main__':
+    unittest.main()
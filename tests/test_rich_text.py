@@ -0,0 +1,102 @@
+import unittest
+from io import BytesIO
+from os import path
+from zipfile import ZipFile
+
+from lxml import etree
+
+from mailmerge import MailMerge, NAMESPACES, RichText, RenderCache, record_digest
+from tests.utils import get_document_body_part
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_multiple_elements.docx')
+URL = 'https://example.com/invoice?id=1&copy=2'
+
+
+def local_names(element):
+    return [child.tag.split('}')[1] for child in element]
+
+
+class RichTextTest(unittest.TestCase):
+    def runs(self, document):
+        body = get_document_body_part(document).getroot()
+        return [run for run in body.iter('{%(w)s}r' % NAMESPACES) if run.findtext('{%(w)s}t' % NAMESPACES)]
+
+    def test_segments(self):
+        with MailMerge(TEMPLATE) as document:
+            document.merge(foo=RichText('Total: ').add('EUR 12.00', bold=True, color='C00000').add(' due'),
+                           bar='', gak='')
+            runs = self.runs(document)
+
+        self.assertEqual([run.findtext('{%(w)s}t' % NAMESPACES) for run in runs], ['Total: ', 'EUR 12.00', ' due'])
+        # formatting of the field is kept, segment formatting is added in schema order
+        self.assertEqual(local_names(runs[0].find('{%(w)s}rPr' % NAMESPACES)), ['sz'])
+        properties = runs[1].find('{%(w)s}rPr' % NAMESPACES)
+        self.assertEqual(local_names(properties), ['b', 'color', 'sz'])
+        self.assertIsNone(properties[0].get('{%(w)s}val' % NAMESPACES))
+        self.assertEqual(properties[1].get('{%(w)s}val' % NAMESPACES), 'C00000')
+        self.assertEqual(properties[2].get('{%(w)s}val' % NAMESPACES), '22')
+
+    def test_turn_off(self):
+        with MailMerge(TEMPLATE) as document:
+            document.merge(foo=RichText('plain', bold=False, underline=False))
+            properties = self.runs(document)[0].find('{%(w)s}rPr' % NAMESPACES)
+        self.assertEqual(local_names(properties), ['b', 'sz', 'u'])
+        self.assertEqual([p.get('{%(w)s}val' % NAMESPACES) for p in properties], ['0', '22', 'none'])
+
+    def test_hyperlink(self):
+        with MailMerge(TEMPLATE) as document:
+            document.merge(foo=RichText('Pay ').add('online', hyperlink=URL), bar=RichText('here', hyperlink=URL))
+            output = BytesIO()
+            document.write(output)
+
+        with ZipFile(output) as package:
+            body = etree.fromstring(package.read('word/document.xml'))
+            rels = etree.fromstring(package.read('word/_rels/document.xml.rels'))
+        links = [rel for rel in rels if rel.get('Target') == URL]
+        self.assertEqual(len(links), 1)
+        self.assertEqual(links[0].get('TargetMode'), 'External')
+        hyperlinks = list(body.iter('{%(w)s}hyperlink' % NAMESPACES))
+        self.assertEqual(len(hyperlinks), 2)
+        for hyperlink in hyperlinks:
+            self.assertEqual(hyperlink.get('{%(r)s}id' % NAMESPACES), links[0].get('Id'))
+            properties = hyperlink.find('w:r/w:rPr', namespaces=NAMESPACES)
+            self.assertEqual(local_names(properties), ['color', 'sz', 'u'])
+
+    def test_properties_are_cached(self):
+        with MailMerge(TEMPLATE) as document:
+            document.merge_templates([
+                {'foo': RichText(str(i)).add(' bold', bold=True).add(' link', hyperlink=URL)} for i in range(20)
+            ], 'page_break')
+            self.assertEqual(len(document._run_properties), 3)
+
+    def test_parallel(self):
+        records = [{'foo': RichText('Record %d ' % i).add('link', hyperlink='https://example.com/%d' % (i % 3))}
+                   for i in range(6)]
+        outputs = []
+        for processes in (None, 2):
+            output = BytesIO()
+            with MailMerge(TEMPLATE) as document:
+                document.merge_templates(records, 'page_break', processes=processes, chunk_size=2)
+                document.write(output)
+            outputs.append(output.getvalue())
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_invalid_characters(self):
+        with MailMerge(TEMPLATE, invalid_characters='strip') as document:
+            document.merge(foo=RichText('a\x00b').add('c\x01', bold=True))
+            texts = [run.findtext('{%(w)s}t' % NAMESPACES) for run in self.runs(document)]
+        self.assertEqual(texts, ['ab', 'c'])
+
+    def test_cache_key(self):
+        self.assertEqual(record_digest({'foo': RichText('a', bold=True)}),
+                         record_digest({'foo': RichText('a', bold=True)}))
+        self.assertNotEqual(record_digest({'foo': RichText('a', bold=True)}),
+                            record_digest({'foo': RichText('a', italic=True)}))
+        cache = RenderCache()
+        cache.render(TEMPLATE, {'foo': RichText('a', bold=True)})
+        cache.render(TEMPLATE, {'foo': RichText('a', bold=True)})
+        self.assertEqual(cache.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
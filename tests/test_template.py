@@ -0,0 +1,61 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from os import path
+
+from mailmerge import MailMerge, RenderCache, Template
+
+TEMPLATE = path.join(path.dirname(__file__), 'test_merge_table_rows.docx')
+
+
+def record(i):
+    return {
+        'student_name': 'Student %d' % i,
+        'class_code': [{'class_code': 'C%d' % j, 'class_name': 'Class %d' % j} for j in range(i % 7)],
+    }
+
+
+def render(i):
+    output = BytesIO()
+    with MailMerge(TEMPLATE) as document:
+        document.merge(**record(i))
+        document.write(output)
+    return output.getvalue()
+
+
+class TemplateTest(unittest.TestCase):
+    def test_fields(self):
+        with MailMerge(TEMPLATE) as document:
+            self.assertEqual(Template(TEMPLATE).fields, document.get_merge_fields())
+
+    def test_threads(self):
+        template = Template(TEMPLATE)
+        with ThreadPoolExecutor(8) as executor:
+            outputs = list(executor.map(lambda i: template.render(record(i)), range(40)))
+        self.assertEqual(outputs, [render(i) for i in range(40)])
+
+    def test_documents_are_independent(self):
+        template = Template(TEMPLATE)
+        with template.document() as first, template.document() as second:
+            first.merge(student_name='first')
+            self.assertEqual(second.get_merge_fields(), template.fields)
+            self.assertNotEqual(first.get_merge_fields(), template.fields)
+
+    def test_merge_templates(self):
+        records = [record(i) for i in range(3)]
+        expected = BytesIO()
+        with MailMerge(TEMPLATE) as document:
+            document.merge_templates(records, 'page_break')
+            document.write(expected)
+        self.assertEqual(Template(TEMPLATE).render(records, 'page_break'), expected.getvalue())
+
+    def test_render_cache(self):
+        template = Template(TEMPLATE)
+        cache = RenderCache()
+        self.assertEqual(cache.render(template, record(3)), render(3))
+        self.assertEqual(cache.render(template, record(3)), render(3))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,7 @@
+from io import BytesIO
+from zipfile import ZipFile, ZIP_DEFLATED
+
+
 class EtreeMixin(object):
     def assert_equal_tree(self, lhs, rhs):
         """
@@ -17,3 +21,20 @@ def get_document_body_part(document):
             return part
 
     raise AssertionError("main document body not found in document.parts")
+
+
+def patched_docx(filename, patches):
+    """
+    Returns a copy of the docx at ``filename`` as a file object, where each
+    member named in ``patches`` is replaced by the result of calling the
+    corresponding function with its contents as text.
+    """
+    output = BytesIO()
+    with ZipFile(filename) as source, ZipFile(output, 'w', ZIP_DEFLATED) as target:
+        for zi in source.infolist():
+            data = source.read(zi)
+            if zi.filename in patches:
+                data = patches[zi.filename](data.decode('utf-8')).encode('utf-8')
+            target.writestr(zi, data)
+    output.seek(0)
+    return output